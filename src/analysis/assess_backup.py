@@ -2,6 +2,7 @@ import json
 import os
 import sys
 from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from colorama import Fore, Style, init
 
@@ -18,17 +19,9 @@ PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "../.."))
 # Append path for utilities
 sys.path.append(os.path.abspath(os.path.join(SCRIPT_DIR, '..')))
 from utilities import (
-    get_backup_root_directories, get_drive_name
+    get_volume_root, read_alexandria_config
 )
 
-# Attempt to import a primary directory fetcher; provide a fallback if it doesn't exist yet
-try:
-    from utilities import get_primary_root_directories
-except ImportError:
-    def get_primary_root_directories(categories):
-        print(f"{Fore.RED}Warning: 'get_primary_root_directories' not found in utilities.py. Sizes for primary-only items may report as 0.{Style.RESET_ALL}")
-        return []
-
 # Constants
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output")
 MOVIE_LIST_PATH = os.path.join(OUTPUT_DIR, "movies", "movie_list.txt")
@@ -37,6 +30,8 @@ ANIME_LIST_PATH = os.path.join(OUTPUT_DIR, "series", "anime_list.txt")
 ANIME_MOVIE_LIST_PATH = os.path.join(OUTPUT_DIR, "movies", "anime_movie_list.txt")
 WHITELIST_FOLDER = os.path.join(PROJECT_ROOT, "config", "series_whitelists", "active")
 ALEXANDRIA_CONFIG_PATH = os.path.join(PROJECT_ROOT, "config", "alexandria_drives.config")
+SERIES_CATEGORIES = ["Shows", "Anime"]
+MOVIE_CATEGORIES = ["Movies", "4K Movies", "Anime Movies"]
 
 
 def load_alexandria_config():
@@ -190,103 +185,151 @@ def get_series_configured_backup_status():
     print(f"Detailed {Fore.GREEN}{Style.BRIGHT}series configured backup summary saved{Style.RESET_ALL}: {output_path}")
 
 
-def get_series_live_backup_status():
-    """Generates summary for Series based on actual file system scan."""
-    # We now pull BOTH backup and primary roots to ensure size calculation for all shows
-    backup_roots = set(get_backup_root_directories(["Shows", "Anime"]))
-    primary_roots = set(get_primary_root_directories(["Shows", "Anime"]))
-    all_series_roots = backup_roots | primary_roots
-    
-    output_path = os.path.join(OUTPUT_DIR, "series", "series_live_backup_summary.json")
-    missing_path = os.path.join(OUTPUT_DIR, "series", "series_live_missing_backups.txt")
-    all_series = load_list(SHOWS_LIST_PATH) | load_list(ANIME_LIST_PATH)
-    
-    config = load_alexandria_config()
-    primary_drives = set()
-    valid_extensions = set()
-    for cat in ["Shows", "Anime"]:
-        cat_data = config.get(cat, {})
-        primary_drives.update(cat_data.get("primary_drives", []))
-        valid_extensions.update(cat_data.get("extensions", []))
-    valid_extensions = tuple(valid_extensions) if valid_extensions else ('.mp4', '.mkv')
-    
-    backup_locations = defaultdict(list)
-    sizes_dict = {}
-
-    for root in all_series_roots:
-        drive_name = get_drive_name(root[0]) 
-        is_primary = drive_name in primary_drives
+def _scan_files(directory):
+    """Yields (filepath, size) for every file under a directory using scandir's cached stat data."""
+    stack = [directory]
+    while stack:
+        current = stack.pop()
         try:
-            for item in os.listdir(root):
-                item_path = os.path.join(root, item)
-                if os.path.isdir(item_path):
-                    title = item.strip()
-                    if title in all_series:
-                        if not is_primary and backup_locations[title].count(drive_name) < 1:
-                            backup_locations[title].append(drive_name)
-                        
-                        current_size = get_directory_size(item_path, valid_extensions)
-                        sizes_dict[title] = max(sizes_dict.get(title, 0), current_size)
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry.path, entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
         except OSError:
             continue
 
-    detect_same_drive_duplicates(backup_locations)
-    buckets = organize_into_buckets(backup_locations, all_series, sizes_dict, bool_print_no_backup=False, no_backup_filepath=missing_path)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(buckets, f, indent=4, ensure_ascii=False)
+def _scan_drive(drive_name, volume_root, drive_categories, config):
+    """Walks every media category directory on a single drive exactly once."""
+    drive_copies = defaultdict(lambda: defaultdict(int))
+    for category in drive_categories:
+        category_root = os.path.join(volume_root, category)
+        if not os.path.isdir(category_root):
+            continue
+        valid_extensions = tuple(ext.lower() for ext in config.get(category, {}).get("extensions", []))
 
-    print(f"Detailed {Fore.GREEN}{Style.BRIGHT}series live backup summary saved{Style.RESET_ALL}: {output_path}")
+        if category in SERIES_CATEGORIES:
+            # One copy per show folder, sized by its episode files
+            try:
+                show_entries = [e for e in os.scandir(category_root) if e.is_dir()]
+            except OSError:
+                continue
+            for show_entry in show_entries:
+                title = show_entry.name.strip()
+                drive_copies[category][title] += 0
+                for filepath, size in _scan_files(show_entry.path):
+                    if not valid_extensions or filepath.lower().endswith(valid_extensions):
+                        drive_copies[category][title] += size
+        else:
+            # One copy per movie file, keyed by the filename without extension
+            for filepath, size in _scan_files(category_root):
+                if valid_extensions and not filepath.lower().endswith(valid_extensions):
+                    continue
+                title = os.path.splitext(os.path.basename(filepath))[0].strip()
+                drive_copies[category][(title, filepath)] = size
+    return drive_name, drive_copies
 
 
-def get_movie_live_backup_status():
-    """Generates summary for Movies based on actual file system scan."""
-    backup_roots = set(get_backup_root_directories(["Movies", "4K Movies", "Anime Movies"]))
-    primary_roots = set(get_primary_root_directories(["Movies", "4K Movies", "Anime Movies"]))
-    all_movie_roots = backup_roots | primary_roots
-    
-    output_path = os.path.join(OUTPUT_DIR, "movies", "movie_live_backup_summary.json")
-    missing_path = os.path.join(OUTPUT_DIR, "movies", "movie_live_missing_backups.txt")
-    all_movies = load_list(MOVIE_LIST_PATH) | load_list(ANIME_MOVIE_LIST_PATH)
-    
-    config = load_alexandria_config()
-    primary_drives = set()
-    valid_extensions = set()
-    for cat in ["Movies", "4K Movies", "Anime Movies"]:
-        cat_data = config.get(cat, {})
-        primary_drives.update(cat_data.get("primary_drives", []))
-        valid_extensions.update(cat_data.get("extensions", []))
-    valid_extensions = tuple(valid_extensions) if valid_extensions else ('.mp4', '.mkv', '.m4v')
+def scan_live_copies(categories):
+    """
+    Scans every primary and backup drive holding the given categories in one pass, one thread per drive.
 
+    Returns {category: {title: [(drive_name, is_primary, size_bytes), ...]}}, with one
+    entry per physical copy found.
+    """
+    config = load_alexandria_config()
+    primary_drives_dict, backup_drives_dict, _ = read_alexandria_config(config) if config else ({}, {}, {})
+
+    # Resolve each drive name to its mount once, rather than per category root
+    drive_categories = defaultdict(list)
+    for category in categories:
+        for drive_name in primary_drives_dict.get(category, []) + backup_drives_dict.get(category, []):
+            if category not in drive_categories[drive_name]:
+                drive_categories[drive_name].append(category)
+    drive_roots = {name: get_volume_root(name) for name in drive_categories}
+    drive_roots = {name: root for name, root in drive_roots.items() if root}
+
+    live_copies = {category: defaultdict(list) for category in categories}
+    if not drive_roots:
+        return live_copies
+
+    with ThreadPoolExecutor(max_workers=len(drive_roots)) as executor:
+        futures = [
+            executor.submit(_scan_drive, name, root, drive_categories[name], config)
+            for name, root in drive_roots.items()
+        ]
+        for future in as_completed(futures):
+            drive_name, drive_copies = future.result()
+            for category, copies in drive_copies.items():
+                is_primary = drive_name in primary_drives_dict.get(category, [])
+                for key, size in copies.items():
+                    title = key[0] if isinstance(key, tuple) else key
+                    live_copies[category][title].append((drive_name, is_primary, size))
+    return live_copies
+
+
+def _write_live_backup_status(live_copies, categories, all_titles, output_path, missing_path, label):
+    """Builds the bucketed summary and missing-backup list for one media family from a scan."""
     backup_locations = defaultdict(list)
     sizes_dict = {}
 
-    for root in all_movie_roots:
-        drive_name = get_drive_name(root[0]) 
-        is_primary = drive_name in primary_drives
-        for dirpath, _, files in os.walk(root):
-            for file in files:
-                if not file.endswith(valid_extensions):
-                    continue
-                title = os.path.splitext(file)[0].strip()
-                if title in all_movies:
-                    if not is_primary and backup_locations[title].count(drive_name) < 1:
-                        backup_locations[title].append(drive_name)
-                    
-                    try:
-                        file_path = os.path.join(dirpath, file)
-                        file_size = os.path.getsize(file_path)
-                        sizes_dict[title] = max(sizes_dict.get(title, 0), file_size)
-                    except OSError:
-                        pass
+    for category in categories:
+        for title, copies in live_copies.get(category, {}).items():
+            if title not in all_titles:
+                continue
+            for drive_name, is_primary, size in copies:
+                if not is_primary:
+                    backup_locations[title].append(drive_name)
+                sizes_dict[title] = max(sizes_dict.get(title, 0), size)
 
     detect_same_drive_duplicates(backup_locations)
-    buckets = organize_into_buckets(backup_locations, all_movies, sizes_dict, bool_print_no_backup=False, no_backup_filepath=missing_path)
+    backup_locations = {title: list(dict.fromkeys(drives)) for title, drives in backup_locations.items()}
+    buckets = organize_into_buckets(backup_locations, all_titles, sizes_dict, bool_print_no_backup=False, no_backup_filepath=missing_path)
 
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(buckets, f, indent=4, ensure_ascii=False)
 
-    print(f"Detailed {Fore.GREEN}{Style.BRIGHT}movie live backup summary saved{Style.RESET_ALL}: {output_path}")
+    print(f"Detailed {Fore.GREEN}{Style.BRIGHT}{label} live backup summary saved{Style.RESET_ALL}: {output_path}")
+
+
+def get_series_live_backup_status(live_copies=None):
+    """Generates summary for Series based on actual file system scan."""
+    if live_copies is None:
+        live_copies = scan_live_copies(SERIES_CATEGORIES)
+    _write_live_backup_status(
+        live_copies,
+        SERIES_CATEGORIES,
+        load_list(SHOWS_LIST_PATH) | load_list(ANIME_LIST_PATH),
+        os.path.join(OUTPUT_DIR, "series", "series_live_backup_summary.json"),
+        os.path.join(OUTPUT_DIR, "series", "series_live_missing_backups.txt"),
+        "series"
+    )
+
+
+def get_movie_live_backup_status(live_copies=None):
+    """Generates summary for Movies based on actual file system scan."""
+    if live_copies is None:
+        live_copies = scan_live_copies(MOVIE_CATEGORIES)
+    _write_live_backup_status(
+        live_copies,
+        MOVIE_CATEGORIES,
+        load_list(MOVIE_LIST_PATH) | load_list(ANIME_MOVIE_LIST_PATH),
+        os.path.join(OUTPUT_DIR, "movies", "movie_live_backup_summary.json"),
+        os.path.join(OUTPUT_DIR, "movies", "movie_live_missing_backups.txt"),
+        "movie"
+    )
+
+
+def get_live_backup_status():
+    """Scans all drives once and writes both the series and movie live backup summaries."""
+    live_copies = scan_live_copies(SERIES_CATEGORIES + MOVIE_CATEGORIES)
+    get_series_live_backup_status(live_copies)
+    get_movie_live_backup_status(live_copies)
 
 
 def main():
@@ -298,8 +341,7 @@ def main():
     
     print(divider)
     get_series_configured_backup_status()
-    get_series_live_backup_status()
-    get_movie_live_backup_status()
+    get_live_backup_status()
     print(divider)
 
 
@@ -1,68 +1,111 @@
 #!/usr/bin/env python3
 
+import datetime
 import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from api import API
 from utilities import (
-    get_drive_letter, 
-    read_alexandria_config, 
-    read_json
+    get_volume_root,
+    read_alexandria_config,
+    read_json,
+    write_json
 )
 
 from colorama import Fore, Back, Style
 import re
+from typing import Dict, Iterable, List, Set, Tuple
 
 RED = Fore.RED + Style.BRIGHT
 YELLOW = Fore.YELLOW + Style.BRIGHT
 GREEN = Fore.GREEN + Style.BRIGHT
 RESET = Style.RESET_ALL
 
-def check_if_file_exists(
-        series_drives: list,
-        series_title: str, 
-        year: str, 
-        season: str, 
-        episode: str
-    ) -> bool:
+SERIES_ROOT_PATHS = ["Shows", "Anime"]
+EPISODE_EXTENSIONS = (".mkv", ".mp4")
+# Matches S01E05, S01E05E06, S01E05-E07 and S01E05-07
+EPISODE_PATTERN = re.compile(r"S(\d{1,2})E(\d{1,3})(?:-?E?(\d{1,3}))?", re.IGNORECASE)
+SERIES_DIRECTORY_PATTERN = re.compile(r"^(.*) \((\d{4})\)$")
+
+
+def normalize_series_key(series_title: str, year: str) -> str:
+    """Key a series by title and year, matching folder names ("A - B (2001)") to TVDB titles ("A: B")."""
+    return f"{series_title.replace(': ', ' - ').strip()} ({year})".lower()
+
+
+def parse_episode_numbers(filename: str) -> List[Tuple[int, int]]:
+    """Returns every (season, episode) a filename covers, expanding multi-episode ranges."""
+    match = EPISODE_PATTERN.search(filename)
+    if not match:
+        return []
+    season = int(match.group(1))
+    first_episode = int(match.group(2))
+    last_episode = int(match.group(3)) if match.group(3) else first_episode
+    if last_episode < first_episode:
+        last_episode = first_episode
+    return [(season, episode) for episode in range(first_episode, last_episode + 1)]
+
+
+def build_episode_index(series_roots: Iterable[str]) -> Set[Tuple[str, int, int]]:
+    """Walk every series folder once and return the set of (series key, season, episode) on disk."""
+    episode_index = set()
+    for series_root in series_roots:
+        if not os.path.isdir(series_root):
+            continue
+        for series_entry in os.scandir(series_root):
+            match = SERIES_DIRECTORY_PATTERN.match(series_entry.name)
+            if not series_entry.is_dir() or not match:
+                continue
+            series_key = normalize_series_key(match.group(1), match.group(2))
+            for _, _, filenames in os.walk(series_entry.path):
+                for filename in filenames:
+                    if not filename.lower().endswith(EPISODE_EXTENSIONS):
+                        continue
+                    for season, episode in parse_episode_numbers(filename):
+                        episode_index.add((series_key, season, episode))
+    return episode_index
+
+
+def find_missing_episodes(
+        series_data: Dict[str, Dict],
+        episode_index: Set[Tuple[str, int, int]],
+        check_special_episodes: bool = False
+    ) -> Dict[str, List[str]]:
     """
-    Check if a file exists at the given filepath.
-    
-    Args:
-        filepath (str): Path to the file.
-    
+    Compare every aired TVDB episode against the on-disk episode index.
+
     Returns:
-        bool: True if file exists, False otherwise.
+        Dict[str, List[str]]: Series "Title (Year)" mapped to its missing SxxEyy episodes.
     """
-    root_paths = ["Shows", "Anime"]
-    extensions = [".mkv", ".mp4"]
-    candidate_filepaths = []
-    if (len(season) > 1 and season[0] == '0'): 
-        season_num_dir = season[1:]
-    else:
-        season_num_dir = season
-    for drive in series_drives:
-        for root_path in root_paths:
-            for extension in extensions:
-
-                filepath_01 = os.path.join(f"{drive}:", root_path, f"{series_title} ({year})", f"Season {season_num_dir}", f"{series_title} S{season}E{episode}{extension}")
-                filepath_02 = os.path.join(f"{drive}:", root_path, f"{series_title} ({year})", f"Season {season_num_dir}", f"{series_title} ({series_year}) S{season}E{episode}{extension}")
-                filepath_03 = os.path.join(f"{drive}:", root_path, f"{series_title} ({year})", f"Season {season_num_dir}", f"{series_title} S{season}E{episode}-E{int(episode)+1:02}{extension}")
-                filepath_04 = os.path.join(f"{drive}:", root_path, f"{series_title} ({year})", f"Season {season_num_dir}", f"{series_title} S{season}E{int(episode)-1:02}-E{episode}{extension}")
-
-                candidate_filepaths.append(filepath_01)
-                candidate_filepaths.append(filepath_02)
-                candidate_filepaths.append(filepath_03)
-                candidate_filepaths.append(filepath_04)
-
-    for filepath in candidate_filepaths:
-        if os.path.exists(filepath):
-            print(f"{GREEN}File found: {filepath}{RESET}")
-            return True
-        else:
-            print(f"{RED}File not found: {filepath}{RESET}")
-    return False
+    today = datetime.date.today().isoformat()
+    indexed_series = {key for key, _, _ in episode_index}
+    missing_content = {}
+    for series_id, series_info in series_data.items():
+        series_title = series_info.get("Series Title", "Unknown Series")
+        series_year = (series_info.get("Series First Aired") or "Unknown Year")[:4]
+        series_key = normalize_series_key(series_title, series_year)
+        if series_key not in indexed_series:
+            print(f"{YELLOW}No folder found for{RESET} {series_title} ({series_year}) [{series_id}]")
+            continue
+
+        expected = set()
+        for series_episode_info in series_info.get("Series Episodes", {}).values():
+            season_number = series_episode_info.get("Season Number")
+            episode_number = series_episode_info.get("Episode Number")
+            air_date = series_episode_info.get("Episode Air Date")
+            if season_number is None or episode_number is None:
+                continue
+            if season_number == 0 and not check_special_episodes:
+                continue
+            if not air_date or air_date > today:
+                continue  # Not aired yet
+            expected.add((series_key, season_number, episode_number))
+
+        missing = sorted(expected - episode_index)
+        if missing:
+            missing_content[f"{series_title} ({series_year})"] = [f"S{season:02d}E{episode:02d}" for _, season, episode in missing]
+    return missing_content
 
 
 if __name__ == "__main__":
@@ -70,35 +113,25 @@ if __name__ == "__main__":
     bool_check_special_episodes = False
 
     api_handler = API()
+    filepath_missing_content = os.path.join(api_handler.output_directory, "alexandria_missing_episodes.json")
     drive_config = read_json(api_handler.drive_hieracrchy_filepath)
     primary_drives_dict, backup_drives_dict, extensions_dict = read_alexandria_config(drive_config)
-    primary_drive_letter_dict = {}
-    for key,value in primary_drives_dict.items(): primary_drive_letter_dict[key] = [get_drive_letter(x) for x in value]
-    # series_drives = primary_drive_letter_dict["Shows"] + primary_drive_letter_dict["Anime"]
-    series_drives = primary_drive_letter_dict["Shows"]
-    if bool_update_series_data: 
+    series_roots = []
+    for root_path in SERIES_ROOT_PATHS:
+        for drive_name in primary_drives_dict.get(root_path, []):
+            volume_root = get_volume_root(drive_name)
+            if volume_root:
+                series_roots.append(os.path.join(volume_root, root_path))
+    if bool_update_series_data:
         series_data = api_handler.update_series_data()
     else:
         series_data = read_json(api_handler.filepath_series_data)
-    for series_id, series_info in series_data.items():
-        series_title = series_info.get("Series Title", "Unknown Series")
-        series_year = series_info.get("Series First Aired", "Unknown Year")[:4]
-        series_episodes = series_info.get("Series Episodes", {})
-        for series_episode, series_episode_info in series_episodes.items():
-            
-            match = re.match(r"S(\d{2})E(\d{2})", series_episode.split()[-1])
-            if match:
-                season_number = match.group(1)
-                episode_number = match.group(2)
-            else:
-                season_number = None
-                episode_number = None
-            if int(season_number) == 0 and not bool_check_special_episodes: 
-                continue
-            if check_if_file_exists(series_drives, series_title, series_year, season_number, episode_number):
-                pass
-            else:
-                print(f"{YELLOW}Missing content for {series_title} S{season_number}E{episode_number}{RESET}")
-                pass
-                # Here you can add logic to handle missing content, e.g., logging or notifying the user
 
+    episode_index = build_episode_index(series_roots)
+    print(f"{GREEN}Indexed{RESET} {len(episode_index):,} episodes across {len(series_roots)} series folders")
+    missing_content = find_missing_episodes(series_data, episode_index, bool_check_special_episodes)
+    for series_title_with_year, missing_episodes in missing_content.items():
+        print(f"{YELLOW}Missing content for {series_title_with_year}{RESET}: {', '.join(missing_episodes)}")
+    write_json(filepath_missing_content, missing_content)
+    print(f"{GREEN}{sum(len(x) for x in missing_content.values()):,} missing episodes across "
+          f"{len(missing_content):,} series{RESET}: {filepath_missing_content}")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from read_server_statistics import FILEPATH_STATISTICS_HISTORY
+
+SECONDS_PER_DAY = 24 * 3600
+
+
+def read_statistics_history(filepath: str = FILEPATH_STATISTICS_HISTORY) -> List[dict]:
+    """Reads the append-only statistics history, skipping any truncated lines."""
+    snapshots = []
+    if not os.path.exists(filepath):
+        return snapshots
+    with open(filepath, 'r', encoding='utf-8') as history_file:
+        for line in history_file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                snapshots.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return snapshots
+
+
+def fit_growth_rate(points: List[Tuple[float, float]]) -> Optional[float]:
+    """Least-squares slope (units per second) through (timestamp, value) points."""
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    variance = sum((t - mean_t) ** 2 for t, _ in points)
+    if variance == 0:
+        return None
+    covariance = sum((t - mean_t) * (v - mean_v) for t, v in points)
+    return covariance / variance
+
+
+def forecast_drive_fill_dates(snapshots: List[dict], window_days: int = 180) -> Dict[str, dict]:
+    """
+    Projects when each drive fills up from the trend in its used space.
+
+    Only snapshots from the trailing window are fitted so old reorganizations
+    do not dominate the growth rate.
+    """
+    if not snapshots:
+        return {}
+
+    latest_time = datetime.fromisoformat(snapshots[-1]["Timestamp"])
+    window_start = latest_time - timedelta(days=window_days)
+
+    drive_points = {}
+    drive_latest = {}
+    for snapshot in snapshots:
+        timestamp = datetime.fromisoformat(snapshot["Timestamp"])
+        if timestamp < window_start:
+            continue
+        for drive_name, usage in snapshot.get("Drives", {}).items():
+            used_bytes = usage["Total (Bytes)"] - usage["Free (Bytes)"]
+            drive_points.setdefault(drive_name, []).append((timestamp.timestamp(), used_bytes))
+            drive_latest[drive_name] = (timestamp, usage)
+
+    forecasts = {}
+    for drive_name, points in drive_points.items():
+        timestamp, usage = drive_latest[drive_name]
+        slope = fit_growth_rate(points)
+        growth_per_day = slope * SECONDS_PER_DAY if slope is not None else None
+
+        fill_date = None
+        if growth_per_day and growth_per_day > 0:
+            days_remaining = usage["Free (Bytes)"] / growth_per_day
+            fill_date = timestamp + timedelta(days=days_remaining)
+
+        forecasts[drive_name] = {
+            "Role": usage.get("Role", "backup"),
+            "Free (Bytes)": usage["Free (Bytes)"],
+            "Total (Bytes)": usage["Total (Bytes)"],
+            "Growth (Bytes/Day)": growth_per_day,
+            "Projected Full": fill_date.strftime("%Y-%m-%d") if fill_date else None,
+            "Snapshots": len(points)
+        }
+    return forecasts
+
+
+def print_drive_forecasts(window_days: int = 180) -> Dict[str, dict]:
+    """Prints projected fill dates for every primary and backup drive."""
+    forecasts = forecast_drive_fill_dates(read_statistics_history(), window_days=window_days)
+    if not forecasts:
+        print(f"{Fore.YELLOW}No statistics history found. Run update_server_statistics to start recording.{Style.RESET_ALL}")
+        return forecasts
+
+    print(f'\n{"#" * 10}\n\n{Style.BRIGHT}Projected Drive Fill Dates{Style.RESET_ALL}\n')
+    for role in ("primary", "backup"):
+        for drive_name, forecast in sorted(forecasts.items(), key=lambda item: item[0].lower()):
+            if forecast["Role"] != role:
+                continue
+            free_tb = forecast["Free (Bytes)"] / 10**12
+            growth = forecast["Growth (Bytes/Day)"]
+            if forecast["Projected Full"]:
+                outlook = f'{Fore.RED}{Style.BRIGHT}full by {forecast["Projected Full"]}{Style.RESET_ALL} (+{growth / 10**9:,.2f} GB/day)'
+            elif growth is None:
+                outlook = f'{Fore.YELLOW}not enough history ({forecast["Snapshots"]} snapshot){Style.RESET_ALL}'
+            else:
+                outlook = f'{Fore.GREEN}not growing{Style.RESET_ALL}'
+            print(f'{Fore.GREEN}{Style.BRIGHT}{drive_name}{Style.RESET_ALL} [{role}]: {free_tb:,.2f} TB free, {outlook}')
+    print(f'\n{"#" * 10}\n')
+    return forecasts
+
+
+if __name__ == "__main__":
+    print_drive_forecasts()
@@ -3,21 +3,26 @@ import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 import ast
 import os
+import sys
 import numpy as np
 from adjustText import adjust_text
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from tmdb_store import TMDbStore
+
 def run_movie_analytics(directory):
     csv_path = os.path.join(directory, "tmdb.csv")
+    db_path = os.path.join(directory, "tmdb.db")
     output_subdir = os.path.join(directory, "graphics")
     if not os.path.exists(output_subdir):
         os.makedirs(output_subdir)
     
-    if not os.path.exists(csv_path):
-        print(f"Error: Could not find 'tmdb.csv' in {directory}")
+    if not os.path.exists(db_path) and not os.path.exists(csv_path):
+        print(f"Error: Could not find 'tmdb.db' or 'tmdb.csv' in {directory}")
         return
 
-    # 1. Load Data & Global Style
-    df = pd.read_csv(csv_path)
+    # 1. Load Data & Global Style (typed columns straight from the metadata store)
+    df = pd.DataFrame(TMDbStore(db_path, csv_path).rows())
     plt.style.use('ggplot')
 
     # 2. Cleaning & Required Columns
@@ -48,6 +53,7 @@ def run_movie_analytics(directory):
 
     # Parsing lists
     def parse_list(val):
+        if isinstance(val, list): return val
         try: return ast.literal_eval(val) if isinstance(val, str) else []
         except: return []
     df['Genres_List'] = df['Genres'].apply(parse_list)
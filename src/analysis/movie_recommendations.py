@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+
+import ast
+import os
+import sys
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from utilities import write_to_csv
+
+# Feature weights: genres dominate, studios and era refine
+GENRE_WEIGHT = 1.0
+COMPANY_WEIGHT = 0.5
+DECADE_WEIGHT = 0.5
+MAX_COMPANIES = 200
+NEIGHBORS = 5
+AFFINITY_WEIGHT = 0.6
+CHUNK_SIZE = 2048
+
+
+def _parse_list(value) -> list:
+    if isinstance(value, list):
+        return value
+    try:
+        parsed = ast.literal_eval(value) if isinstance(value, str) and value else []
+    except (ValueError, SyntaxError):
+        return []
+    return list(parsed) if isinstance(parsed, (list, tuple)) else []
+
+
+def _to_float(value, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _one_hot(values: List[list], vocabulary: Dict[str, int]) -> np.ndarray:
+    """Rows of label lists to a dense float32 indicator matrix over a fixed vocabulary."""
+    matrix = np.zeros((len(values), len(vocabulary)), dtype=np.float32)
+    rows, cols = [], []
+    for row, labels in enumerate(values):
+        for label in labels:
+            col = vocabulary.get(label)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    matrix[rows, cols] = 1.0
+    return matrix
+
+
+def load_movie_arrays(rows: List[dict], genres: List[str], companies: List[str], decades: List[int]) -> dict:
+    """Loads TMDb rows (store rows or tmdb.csv rows) into aligned NumPy arrays."""
+    genre_lists = [_parse_list(row.get('Genres')) for row in rows]
+    company_lists = [_parse_list(row.get('Production_Companies')) for row in rows]
+    years = np.array([_to_float(row.get('Release_Year')) for row in rows], dtype=np.float32)
+    decade_lists = [[int(year // 10 * 10)] if year else [] for year in years]
+    return {
+        'titles': [f"{row.get('Title_TMDb')} ({row.get('Release_Year')})" for row in rows],
+        'tmdb_ids': [row.get('TMDb_ID') for row in rows],
+        'ratings': np.array([_to_float(row.get('Rating')) for row in rows], dtype=np.float32),
+        'years': years,
+        'genres': _one_hot(genre_lists, {genre: i for i, genre in enumerate(genres)}),
+        'companies': _one_hot(company_lists, {company: i for i, company in enumerate(companies)}),
+        'decades': _one_hot(decade_lists, {decade: i for i, decade in enumerate(decades)}),
+    }
+
+
+def build_vocabularies(library_rows: List[dict], catalog_rows: List[dict]):
+    """Genres and decades seen anywhere, plus the studios most common in the library."""
+    genres, decades, company_counts = set(), set(), Counter()
+    for row in library_rows + catalog_rows:
+        genres.update(_parse_list(row.get('Genres')))
+        year = _to_float(row.get('Release_Year'))
+        if year:
+            decades.add(int(year // 10 * 10))
+    for row in library_rows:
+        company_counts.update(_parse_list(row.get('Production_Companies')))
+    companies = [company for company, _ in company_counts.most_common(MAX_COMPANIES)]
+    return sorted(genres), companies, sorted(decades)
+
+
+def genre_cooccurrence(genre_matrix: np.ndarray) -> np.ndarray:
+    """Counts how often each pair of genres is tagged on the same movie (diagonal = genre totals)."""
+    return (genre_matrix.T @ genre_matrix).astype(np.int64)
+
+
+def _feature_matrix(arrays: dict) -> np.ndarray:
+    """Weighted, L2-normalized feature rows so a dot product is a cosine similarity."""
+    features = np.hstack([
+        GENRE_WEIGHT * arrays['genres'],
+        COMPANY_WEIGHT * arrays['companies'],
+        DECADE_WEIGHT * arrays['decades'],
+    ])
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return features / np.where(norms == 0, 1, norms)
+
+
+def recommend_movies(library: dict, catalog: dict, neighbors: int = NEIGHBORS) -> List[dict]:
+    """
+    Scores every catalog movie by its mean cosine similarity to its nearest library
+    movies, blended with its TMDb rating. Similarities are computed in row chunks of
+    one matrix product each, so the full catalog is ranked in a single pass.
+    """
+    library_features = _feature_matrix(library)
+    catalog_features = _feature_matrix(catalog)
+    num_catalog, num_library = len(catalog['titles']), len(library['titles'])
+    if not num_catalog or not num_library:
+        return []
+    k = min(neighbors, num_library)
+
+    affinity = np.zeros(num_catalog, dtype=np.float32)
+    nearest = np.zeros(num_catalog, dtype=np.int64)
+    for start in range(0, num_catalog, CHUNK_SIZE):
+        similarity = catalog_features[start:start + CHUNK_SIZE] @ library_features.T
+        top = np.partition(similarity, num_library - k, axis=1)[:, num_library - k:]
+        affinity[start:start + CHUNK_SIZE] = top.mean(axis=1)
+        nearest[start:start + CHUNK_SIZE] = similarity.argmax(axis=1)
+
+    scores = AFFINITY_WEIGHT * affinity + (1 - AFFINITY_WEIGHT) * np.clip(catalog['ratings'], 0, 10) / 10
+    order = np.argsort(-scores)
+    return [
+        {
+            'Title': catalog['titles'][i],
+            'TMDb_ID': catalog['tmdb_ids'][i],
+            'Score': round(float(scores[i]), 4),
+            'Affinity': round(float(affinity[i]), 4),
+            'Rating': float(catalog['ratings'][i]),
+            'Most_Similar_Owned': library['titles'][nearest[i]]
+        }
+        for i in order.tolist()
+    ]
+
+
+def generate_movie_recommendations(library_rows: List[dict], catalog_rows: List[dict], output_directory: Optional[str] = None) -> List[dict]:
+    """Builds the genre co-occurrence matrix and ranked recommendations, optionally writing both as CSVs."""
+    genres, companies, decades = build_vocabularies(library_rows, catalog_rows)
+    library = load_movie_arrays(library_rows, genres, companies, decades)
+    catalog = load_movie_arrays(catalog_rows, genres, companies, decades)
+    cooccurrence = genre_cooccurrence(library['genres'])
+    recommendations = recommend_movies(library, catalog)
+
+    if output_directory:
+        write_to_csv(
+            os.path.join(output_directory, 'genre_cooccurrence.csv'),
+            [[genre] + cooccurrence[i].tolist() for i, genre in enumerate(genres)],
+            ['Genre'] + genres
+        )
+        headers = ['Title', 'TMDb_ID', 'Score', 'Affinity', 'Rating', 'Most_Similar_Owned']
+        write_to_csv(
+            os.path.join(output_directory, 'movies_recommended.csv'),
+            [[r[h] for h in headers] for r in recommendations],
+            headers
+        )
+        print(f"{Fore.GREEN}{Style.BRIGHT}Ranked {len(recommendations):,} missing movies{Style.RESET_ALL} "
+              f"against {len(library_rows):,} owned: {os.path.join(output_directory, 'movies_recommended.csv')}")
+    return recommendations
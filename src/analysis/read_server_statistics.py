@@ -12,16 +12,46 @@ sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from utilities import read_json
 
+SRC_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIRECTORY = os.path.join(SRC_DIRECTORY, "..", "..", "output")
+FILEPATH_STATISTICS = os.path.join(OUTPUT_DIRECTORY, "alexandria_media_statistics.json")
+STATISTICS_MANIFEST_DIRECTORY = os.path.join(OUTPUT_DIRECTORY, "statistics")
+FILEPATH_STATISTICS_HISTORY = os.path.join(STATISTICS_MANIFEST_DIRECTORY, "alexandria_statistics_history.jsonl")
+
+
+def get_manifest_filepath(media_name: str, manifest_type: str) -> str:
+    """Returns the path of a per-category manifest ('titles' or 'primary_filepaths')."""
+    assert manifest_type in ("titles", "primary_filepaths"), f"Invalid manifest type: {manifest_type}"
+    media_slug = media_name.lower().replace(" ", "_")
+    return os.path.join(STATISTICS_MANIFEST_DIRECTORY, f"{media_slug}_{manifest_type}.json")
+
+
+def _read_manifest(media_name: str, manifest_type: str, legacy_key: str) -> list:
+    """Loads a single manifest, falling back to the pre-split statistics file if needed."""
+    filepath = get_manifest_filepath(media_name, manifest_type)
+    if os.path.exists(filepath):
+        return read_json(filepath, default=[])
+    # Older statistics files embedded the lists directly in the summary
+    return read_json(FILEPATH_STATISTICS).get(media_name, {}).get(legacy_key, [])
+
+
+def read_media_titles(media_name: str) -> list:
+    """Reads only the title list for a media category (e.g. 'TV Shows', 'Anime')."""
+    legacy_key = "Show Titles" if media_name == "TV Shows" else f"{media_name} Titles"
+    return _read_manifest(media_name, "titles", legacy_key)
+
+
+def read_primary_filepaths(media_name: str) -> list:
+    """Reads only the primary filepath list for a media category."""
+    return _read_manifest(media_name, "primary_filepaths", "Primary Filepaths")
+
 
 def read_media_statistics(bool_update=False,
                           bool_print=True
                           ) -> dict:
     """Read and optionally update the media statistics for Alexandria Media Server."""
  
-    src_directory = os.path.dirname(os.path.abspath(__file__))
-
-    directory_output = os.path.join(src_directory, "..", "..", "output")
-    filepath_statistics = os.path.join(directory_output, "alexandria_media_statistics.json")
+    filepath_statistics = FILEPATH_STATISTICS
     
     data = read_json(filepath_statistics)
 
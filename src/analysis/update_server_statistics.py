@@ -4,6 +4,7 @@ import json
 import os
 import shutil
 import sys
+from datetime import datetime
 from pathlib import Path
 
 from colorama import Fore, Style
@@ -12,15 +13,18 @@ from tqdm import tqdm
 # Append parent directory to sys.path for local imports
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
-from assess_media_duration import main as assess_media_total_duration
-from assess_media_duration import sum_durations
-from read_server_statistics import read_media_statistics
+from assess_media_duration import format_duration, get_video_duration, parse_duration
+from read_server_statistics import (
+    get_manifest_filepath,
+    FILEPATH_STATISTICS_HISTORY,
+    STATISTICS_MANIFEST_DIRECTORY
+)
 from utilities import (
     get_volume_root,
-    get_file_size,
     read_alexandria,
     read_alexandria_config,
-    read_json
+    read_json,
+    write_json
 )
 
 # Constants mapping config keys to display names and size units
@@ -42,6 +46,8 @@ IGNORED_EXTENSIONS = (
     '.srt', '.sub', '.idx', ".lrc"                             # Subtitles
 )
 
+UNIT_BYTES = {'B': 1, 'KB': 10**3, 'MB': 10**6, 'GB': 10**9, 'TB': 10**12}
+
 
 def get_media_title(filepath: str, config_key: str, media_name: str) -> str:
     """Extracts the title of the media based on its category dynamically."""
@@ -61,14 +67,96 @@ def get_media_title(filepath: str, config_key: str, media_name: str) -> str:
         return os.path.basename(filepath)
 
 
+def scan_file_entries(
+    filepaths: list,
+    config_key: str,
+    media_name: str,
+    category_index: dict,
+    update_duration: bool
+) -> tuple[dict, set]:
+    """Stats each file once and reuses cached entries whose size and mtime are unchanged.
+
+    Returns the refreshed file entries and the set of titles whose files were
+    added, removed or changed since the previous run.
+    """
+    previous_files = category_index.get("Files", {})
+    file_entries = {}
+    dirty_titles = set()
+    probe_duration = update_duration and media_name not in ["Books"]
+
+    for f in tqdm(filepaths, desc=f"Processing {media_name}", unit="file", dynamic_ncols=True, leave=False):
+        try:
+            file_stat = os.stat(f)
+        except OSError:
+            continue
+
+        previous = previous_files.get(f)
+        if previous and previous["size"] == file_stat.st_size and previous["mtime"] == file_stat.st_mtime:
+            entry = dict(previous)
+        else:
+            entry = {
+                "title": get_media_title(f, config_key, media_name),
+                "size": file_stat.st_size,
+                "mtime": file_stat.st_mtime,
+                "duration": None
+            }
+            dirty_titles.add(entry["title"])
+            if previous:
+                dirty_titles.add(previous["title"])
+                # Keep the old duration until the changed file is probed again
+                if previous.get("duration") is not None:
+                    entry["duration"] = previous["duration"]
+                    entry["duration_stale"] = True
+
+        # Only probe files that have never been measured (new, changed or skipped on a prior run)
+        if probe_duration and (entry["duration"] is None or entry.get("duration_stale")):
+            entry["duration"] = int(get_video_duration(f))
+            entry.pop("duration_stale", None)
+            dirty_titles.add(entry["title"])
+
+        file_entries[f] = entry
+
+    # Files that disappeared since the last run invalidate their titles too
+    for f, previous in previous_files.items():
+        if f not in file_entries:
+            dirty_titles.add(previous["title"])
+
+    return file_entries, dirty_titles
+
+
+def aggregate_titles(file_entries: dict, previous_titles: dict, dirty_titles: set) -> dict:
+    """Rebuilds per-title aggregates for dirty titles only, keeping the rest as cached."""
+    titles = {title: agg for title, agg in previous_titles.items() if title not in dirty_titles}
+
+    for entry in file_entries.values():
+        title = entry["title"]
+        if title not in dirty_titles:
+            continue
+        agg = titles.setdefault(title, {"Size (Bytes)": 0, "Number of Files": 0, "Duration (Seconds)": 0})
+        agg["Size (Bytes)"] += entry["size"]
+        agg["Number of Files"] += 1
+        agg["Duration (Seconds)"] += entry["duration"] or 0
+
+    return titles
+
+
 def process_media_category(
     filepaths: list, 
     media_info: dict, 
     config_key: str,
     update_duration: bool, 
-    current_stats: dict
-) -> dict:
-    """Calculates statistics (size, duration, counts) for a specific media category."""
+    category_index: dict,
+    previous_duration_seconds: int = 0
+) -> tuple[dict, dict]:
+    """Calculates statistics (size, duration, counts) for a specific media category.
+
+    Only titles whose files were added, removed or changed since the last run are
+    re-aggregated; everything else is carried over from the statistics index.
+    The duration total sums every file with a stored duration; files never probed
+    are reported as a count instead. Only before any file of the category has been
+    probed (the first runs after the index was introduced) does the total fall
+    back to the previous statistics snapshot.
+    """
     media_name = media_info["name"]
     unit = media_info["unit"]
     
@@ -79,40 +167,35 @@ def process_media_category(
     ]
     
     num_files = len(valid_filepaths)
-    
-    total_size = 0.0
-    titles = []
-
-    # Combined loop for size calculation and title extraction with tqdm
-    if valid_filepaths:
-        for f in tqdm(valid_filepaths, desc=f"Processing {media_name}", unit="file", dynamic_ncols=True, leave=False):
-            total_size += get_file_size(f, unit)
-            titles.append(get_media_title(f, config_key, media_name))
-            
-    total_size = round(total_size, 2)
-    titles = sorted({title for title in titles if title}, key=str.lower)
-    
-    # Calculate duration
-    if update_duration and media_name not in ["Books"]:
-        # If assess_media_total_duration prints output, tqdm.write might be needed inside it to prevent display bugs
-        total_duration = assess_media_total_duration(valid_filepaths, print_bool=True)
-    elif media_name not in ["Books"]:
-        total_duration = current_stats.get(media_name, {}).get("Total Duration", 0)
-    else:
-        total_duration = 0
+
+    file_entries, dirty_titles = scan_file_entries(
+        valid_filepaths, config_key, media_name, category_index, update_duration
+    )
+    title_aggregates = aggregate_titles(file_entries, category_index.get("Titles", {}), dirty_titles)
+
+    total_size_bytes = sum(agg["Size (Bytes)"] for agg in title_aggregates.values())
+    total_size = round(total_size_bytes / UNIT_BYTES[unit], 2)
+    total_duration_seconds = sum(agg["Duration (Seconds)"] for agg in title_aggregates.values())
+    num_unprobed = sum(1 for entry in file_entries.values() if entry["duration"] is None)
+    if num_unprobed and num_unprobed == len(file_entries):
+        total_duration_seconds = previous_duration_seconds
+    titles = sorted((title for title in title_aggregates if title), key=str.lower)
+
+    if dirty_titles:
+        print(f"{Fore.CYAN}{media_name}{Style.RESET_ALL}: {len(dirty_titles):,} title(s) updated")
+
+    # Bulky path and title lists live in separate manifests so summary reads stay small
+    write_json(get_manifest_filepath(media_name, "primary_filepaths"), valid_filepaths)
+    if media_name not in ["Music", "YouTube"]:
+        write_json(get_manifest_filepath(media_name, "titles"), titles)
 
     # Build the category dictionary
     stats = {
-            "Total Size": f"{total_size:,.2f} {unit}",
-            "Primary Filepaths": valid_filepaths
+            "Total Size": f"{total_size:,.2f} {unit}"
     }
     
     # Override specific keys to match the original JSON schema exactly
-    title_key = "Show Titles" if media_name == "TV Shows" else f"{media_name} Titles"
     count_key = "Number of Shows" if media_name == "TV Shows" else f"Number of {media_name}"
-    
-    if media_name not in ["Music", "YouTube"]:
-        stats[title_key] = titles
         
     if media_info["has_episodes"]:
         stats[count_key] = len(titles)
@@ -124,10 +207,44 @@ def process_media_category(
     else:
         stats[count_key] = len(titles) if titles else num_files
 
-    if media_name not in ["Books"]:
-        stats["Total Duration"] = total_duration
+    stats["Total Size (Bytes)"] = total_size_bytes
+    stats["Number of Files"] = num_files
 
-    return stats
+    if media_name not in ["Books"]:
+        stats["Total Duration"] = format_duration(total_duration_seconds)
+        stats["Total Duration (Seconds)"] = total_duration_seconds
+        stats["Unprobed Files"] = num_unprobed
+
+    category_index = {"Files": file_entries, "Titles": title_aggregates, "Total Duration (Seconds)": total_duration_seconds}
+    return stats, category_index
+
+
+def get_previous_duration_seconds(category_index: dict, previous_stats: dict) -> int:
+    """Last known duration total of a category, from the index or the previous statistics file."""
+    if category_index.get("Total Duration (Seconds)") is not None:
+        return category_index["Total Duration (Seconds)"]
+    if previous_stats.get("Total Duration (Seconds)") is not None:
+        return previous_stats["Total Duration (Seconds)"]
+    total_duration = previous_stats.get("Total Duration")
+    return parse_duration(total_duration) if isinstance(total_duration, str) else 0
+
+
+def append_statistics_snapshot(statistics_dict: dict, drive_usage: dict) -> None:
+    """Appends a compact snapshot of this run to the append-only statistics history."""
+    snapshot = {
+        "Timestamp": datetime.now().isoformat(timespec="seconds"),
+        "Media": {
+            media_name: {
+                "Size (Bytes)": stats.get("Total Size (Bytes)", 0),
+                "Number of Files": stats.get("Number of Files", 0),
+                "Duration (Seconds)": stats.get("Total Duration (Seconds)", 0)
+            }
+            for media_name, stats in statistics_dict.items()
+        },
+        "Drives": drive_usage
+    }
+    with open(FILEPATH_STATISTICS_HISTORY, 'a', encoding='utf-8') as history_file:
+        history_file.write(json.dumps(snapshot, ensure_ascii=False) + "\n")
 
 
 def update_server_statistics(update_duration: bool = False, print_stats: bool = False) -> None:
@@ -135,38 +252,46 @@ def update_server_statistics(update_duration: bool = False, print_stats: bool =
     src_directory = os.path.dirname(os.path.abspath(__file__))
     directory_output = os.path.join(src_directory, "..", "..", "output")
     filepath_statistics = os.path.join(directory_output, "alexandria_media_statistics.json")
+    filepath_statistics_index = os.path.join(directory_output, "alexandria_media_statistics_index.json")
     filepath_drive_config = os.path.join(src_directory, "..", "..", "config", "alexandria_drives.config")
 
     os.makedirs(directory_output, exist_ok=True)
+    os.makedirs(STATISTICS_MANIFEST_DIRECTORY, exist_ok=True)
     drive_config = read_json(filepath_drive_config)
 
-    try:
-        current_stats = read_media_statistics(bool_update=False, bool_print=False)
-    except (KeyError, FileNotFoundError) as e:
-        print(f"{Fore.RED}{Style.BRIGHT}Error: Media statistics file incomplete or not found "
-              f"({e}). Please run the update first.{Style.RESET_ALL}")
-        current_stats = {}
+    # Per-file and per-title aggregates from the previous run (empty on the first run)
+    statistics_index = read_json(filepath_statistics_index) if os.path.exists(filepath_statistics_index) else {}
+    previous_statistics = read_json(filepath_statistics) if os.path.exists(filepath_statistics) else {}
 
     # Extract all drives dynamically
     drive_names = set()
+    primary_drive_names = set()
     for category in drive_config.values():
         drive_names.update(category.get('primary_drives', []))
+        primary_drive_names.update(category.get('primary_drives', []))
         backup = category.get('backup_drives', [])
         drive_names.update(backup.keys() if isinstance(backup, dict) else backup)
 
-    volume_roots = {get_volume_root(d) for d in drive_names if get_volume_root(d)}
+    drive_roots = {d: get_volume_root(d) for d in drive_names}
+    drive_roots = {d: root for d, root in drive_roots.items() if root}
 
     # Calculate storage space
     space_tb_available = 0
     space_tb_used = 0
     space_tb_unused = 0
+    drive_usage = {}
 
-    for root in volume_roots:
+    for drive_name, root in sorted(drive_roots.items()):
         try:
             disk_obj = shutil.disk_usage(root)
             space_tb_available += int(disk_obj.total / 10**12)
             space_tb_used += int(disk_obj.used / 10**12)
             space_tb_unused += int(disk_obj.free / 10**12)
+            drive_usage[drive_name] = {
+                "Role": "primary" if drive_name in primary_drive_names else "backup",
+                "Total (Bytes)": disk_obj.total,
+                "Free (Bytes)": disk_obj.free
+            }
         except OSError as e:
             print(f"{Fore.YELLOW}Warning: Could not read disk usage for {root} - {e}{Style.RESET_ALL}")
 
@@ -174,7 +299,7 @@ def update_server_statistics(update_duration: bool = False, print_stats: bool =
 
     # Process all media types independently
     statistics_dict = {}
-    durations = []
+    total_duration_seconds = 0
     total_files = 0
     total_size_tb = 0.0
 
@@ -193,21 +318,27 @@ def update_server_statistics(update_duration: bool = False, print_stats: bool =
         filepaths = read_alexandria(parent_paths, extensions)
         total_files += len(filepaths)
         
-        stats = process_media_category(filepaths, media_info, config_key, update_duration, current_stats)
+        category_index = statistics_index.get(media_name, {})
+        previous_duration_seconds = get_previous_duration_seconds(
+            category_index, previous_statistics.get(media_name, {})
+        )
+        stats, statistics_index[media_name] = process_media_category(
+            filepaths, media_info, config_key, update_duration, category_index, previous_duration_seconds
+        )
         statistics_dict[media_name] = stats
-        
-        if "Total Duration" in stats:
-            durations.append(stats["Total Duration"])
+        total_duration_seconds += stats.get("Total Duration (Seconds)", 0)
             
         # Add to total size, converting GB to TB where necessary
         size_val = float(stats["Total Size"].split()[0].replace(',', ''))
         total_size_tb += size_val if media_info["unit"] == "TB" else size_val / 1000
 
-    total_duration = sum_durations(durations)
+    total_duration = format_duration(total_duration_seconds)
 
     # Save to JSON
     with open(filepath_statistics, 'w', encoding='utf-8') as json_file:
         json.dump(statistics_dict, json_file, indent=4)
+    write_json(filepath_statistics_index, statistics_index)
+    append_statistics_snapshot(statistics_dict, drive_usage)
 
     # Terminal Output
     if print_stats:
@@ -25,30 +25,31 @@ RED = Fore.RED
 YELLOW = Fore.YELLOW
 GREEN = Fore.GREEN
 
-def suggest_movie_downloads():
+def suggest_movie_downloads(num_suggestions=100):
     # import utility methods
-    import os
-    from utilities import read_csv, read_file_as_list, write_list_to_txt_file
+    import os, sys
+    from utilities import read_csv, write_list_to_txt_file
     # import API (handler) class
     from api import API
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "analysis"))
+    from movie_recommendations import generate_movie_recommendations
     # instantiate API class
     api_handler = API()
-    # define paths
-    src_directory = os.path.dirname(os.path.abspath(__file__))
-    filepath_movie_list = ("\\".join(src_directory.split('\\')[:-1])+"/output/").replace('\\','/')+'movie_list.txt'
-    # read current movie list
-    list_movies = read_file_as_list(filepath_movie_list)
-    list_movies = [x.lower() for x in list_movies]
-    # get top rated movies from TMDb
-    data_top_rated = read_csv(api_handler.filepath_tmdb_top_rated_csv)
-    list_top_rated_movies = [f"{movie['Title_TMDb'].replace(': ',' - ')} ({movie['Release_Year']})" for movie in data_top_rated]
+    # current library from the TMDb store, candidates from the top rated catalog not yet owned
+    library_rows = api_handler.tmdb_store.rows()
+    list_movies = {x['Title_Alexandria'].lower() for x in library_rows}
+    data_top_rated = read_csv(api_handler.filepath_tmdb_top_rated_missing_csv)
+    # rank candidates by similarity to the current library and by rating
+    recommendations = generate_movie_recommendations(library_rows, data_top_rated, os.path.join(api_handler.output_directory, 'movies'))
     # determine what movies are not currently downloaded
     movies_suggested = []
-    for movie in list_top_rated_movies:
+    for recommendation in recommendations:
+        movie = recommendation['Title'].replace(': ',' - ')
         if movie.lower() not in list_movies:
             movies_suggested.append(movie)
+    movies_suggested = movies_suggested[:num_suggestions]
     # write suggested movie downloads to file
-    output_filepath = ("\\".join(src_directory.split('\\')[:-1])+"/output/").replace('\\','/')+'movies_suggested.txt'
+    output_filepath = os.path.join(api_handler.output_directory, 'movies_suggested.txt')
     write_list_to_txt_file(output_filepath,movies_suggested)
     return movies_suggested
 
@@ -1,17 +1,23 @@
 #!/usr/bin/env python
 
+import datetime
 import json
 import os
 import requests
 import sys
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List
 
-import tvdb_v4_official
-
 from colorama import Fore, Back, Style
 
 from utilities import read_json, write_json
+from http_cache import ResponseCache
+from http_client import RateLimitedClient
+from tvdb_client import TVDBClient, TVDB_MAX_WORKERS
+from tmdb_client import TMDbClient, TMDB_MAX_WORKERS, TMDB_REQUESTS_PER_SECOND
+from tmdb_store import TMDbStore, TMDB_CSV_HEADERS
+from title_index import build_title_index, find_tmdb_id_export
 
 from utilities import (
     get_drive_letter,
@@ -26,6 +32,10 @@ YELLOW = Fore.YELLOW + Style.BRIGHT
 GREEN = Fore.GREEN + Style.BRIGHT
 RESET = Style.RESET_ALL
 
+# TMDb /discover rejects page numbers above 500, so larger crawls are split by release year
+TMDB_DISCOVER_MAX_PAGE = 500
+TMDB_CATALOG_FIRST_YEAR = 1870
+
 class API(object):
     def __init__(self):
         self.src_directory = os.path.dirname(os.path.abspath(__file__))
@@ -33,16 +43,21 @@ class API(object):
         self.output_directory = os.path.join(self.root_directory,"output")
         self.filepath_movie_list = os.path.join(self.output_directory,'movies','movie_list.txt')
         self.filepath_tmdb_csv = os.path.join(self.output_directory,'movies','tmdb.csv')
+        self.filepath_tmdb_db = os.path.join(self.output_directory,'movies','tmdb.db')
         self.filepath_tmdb_top_rated_current_csv = os.path.join(self.output_directory,'movies','tmdb_top_rated_existing.csv')
         self.filepath_tmdb_top_rated_missing_csv = os.path.join(self.output_directory,'movies','tmdb_top_rated_missing.csv')
         self.filepath_tmdb_recent_current_csv = os.path.join(self.output_directory,'movies','tmdb_recent_existing.csv')
         self.filepath_tmdb_recent_missing_csv = os.path.join(self.output_directory,'movies','tmdb_recent_missing.csv')
+        self.filepath_tmdb_catalog_checkpoint = os.path.join(self.output_directory,'movies','tmdb_catalog_checkpoint.json')
+        self.filepath_tmdb_catalog_rows = os.path.join(self.output_directory,'movies','tmdb_catalog_rows.jsonl')
         self.filepath_movie_list_tmdb_not_found = os.path.join(self.output_directory,'movie_list_tdmb_not_found.txt')
         self.filepath_api_config = os.path.join(self.src_directory,"..", "config","api.config")
         self.filepath_movie_tmdb_ids = os.path.join(self.output_directory,'movies',"movie_tmdb_ids.json")
         self.filepath_series_ids = os.path.join(self.output_directory,"alexandria_series_ids.json")
         self.filepath_series_data = os.path.join(self.output_directory,"alexandria_series_data.json")
+        self.filepath_series_data_journal = os.path.join(self.output_directory,"alexandria_series_data_journal.jsonl")
         self.filepath_statistics = os.path.join(self.output_directory,"alexandria_media_statistics.json")
+        self.filepath_emby_library = os.path.join(self.output_directory,"emby","emby_library.json")
         self.drive_hieracrchy_filepath = os.path.join(self.src_directory,"..", "config","alexandria_drives.config")
         self.drive_config = read_json(self.drive_hieracrchy_filepath)
         self.api_config = read_json(self.filepath_api_config)
@@ -58,10 +73,87 @@ class API(object):
             "Authorization": f"Bearer {self.tmdb_api_key}"
             }
         self.tvdb_api_key = self.api_config['tvdb']['api_key']
+        self.http_cache = ResponseCache(os.path.join(self.output_directory, "cache", "http"))
+        self.tmdb_client = TMDbClient(
+            self.tmdb_api_key,
+            self.tmdb_api_url_base_search,
+            self.tmdb_api_url_base_query,
+            self.tmdb_api_url_base_discover,
+            requests_per_second=self.api_config['tmdb'].get('requests_per_second', TMDB_REQUESTS_PER_SECOND),
+            max_workers=self.api_config['tmdb'].get('max_workers', TMDB_MAX_WORKERS),
+            cache=self.http_cache
+        )
+        self.tmdb_store = TMDbStore(self.filepath_tmdb_db, self.filepath_tmdb_csv)
+        # One pooled session per provider, shared by every method
+        self.tvdb_client = TVDBClient(self.tvdb_api_key)
+        self.open_library_client = RateLimitedClient(
+            headers={"accept": "application/json"},
+            requests_per_second=5,
+            cache=self.http_cache
+        )
+        self.emby_client = RateLimitedClient(
+            headers={"accept": "application/json", "X-Emby-Token": self.emby_api_key},
+            requests_per_second=20
+        )
+
+    def _fetch_tmdb_movie_row(self, movie_with_year: str, tmdb_id=None):
+        """Fetch one movie's TMDb metadata as a tmdb.csv row. Safe to call from worker threads.
+
+        Returns:
+            tuple: (movie_with_year, csv_row), where csv_row is None if the movie was not found.
+        """
+        print(f"{Fore.GREEN}{Style.BRIGHT}Downloading data{Style.RESET_ALL} for "
+            f"{Fore.BLUE}{Style.BRIGHT}{movie_with_year}{Style.RESET_ALL}")
+
+        if tmdb_id is None:
+            movie = '('.join(movie_with_year.split('(')[:-1])
+            year = movie_with_year.split('(')[-1].split(')')[0]
+            response_search = self.tmdb_client.search_movie(movie, year)
+            if response_search.status_code != 200:
+                return movie_with_year, None
+            try:
+                tmdb_id = response_search.json()['results'][0]['id']
+            except (IndexError, KeyError):
+                print(f"{Fore.RED}{Style.BRIGHT}Error{Style.RESET_ALL} with "
+                    f"{Fore.BLUE}{Style.BRIGHT}{movie_with_year}{Style.RESET_ALL}")
+                return movie_with_year, None
+
+        response_query = self.tmdb_client.movie_details(tmdb_id, append_to_response='release_dates')
+        if response_query.status_code != 200:
+            return movie_with_year, None
+
+        data_query = response_query.json()
+        movie_data = {
+            'title_alexandria': movie_with_year,
+            'title_tmdb': data_query['title'],
+            'release_date': data_query['release_date'],  # YYYY-MM-DD
+            'release_year': data_query['release_date'].split('-')[0],
+            'rating_certification': self._parental_rating_from_details(data_query, tmdb_id),
+            'runtime_min': data_query['runtime'],
+            'runtime_hrs': f'{data_query["runtime"]/60:.2f}',
+            'rating': data_query['vote_average'],
+            'tmdb_id': tmdb_id,
+            'imdb_id': data_query['imdb_id'],
+            'budget': data_query['budget'],
+            'revenue': data_query['revenue'],
+            'genres': [x['name'] for x in data_query['genres']],
+            'production_companies': [x['name'] for x in data_query['production_companies']],
+            'overview': data_query['overview']
+        }
+        csv_row = [
+            movie_data['title_alexandria'], movie_data['title_tmdb'], movie_data['release_date'],
+            movie_data['release_year'], movie_data['rating_certification'], movie_data['runtime_min'],
+            movie_data['runtime_hrs'], movie_data['rating'], movie_data['budget'],
+            movie_data['revenue'], movie_data['genres'], movie_data['production_companies'],
+            movie_data['overview'], movie_data['tmdb_id'], movie_data['imdb_id']
+        ]
+        return movie_with_year, csv_row
 
     def tmdb_movies_fetch(self, auto_delete=False):
         """Fetch and update TMDB movie data, with optional auto-deletion.
 
+        New movies are fetched concurrently through the rate-limited TMDb client.
+
         Args:
             auto_delete (bool): If True, bypasses user confirmation for deleting movies.
         """
@@ -72,101 +164,36 @@ class API(object):
         movie_list += update_media_list('anime_movies')
 
         # Read current movies in local TMDB database
-        tmdb_current_movies = [x['Title_Alexandria'] for x in read_csv(self.filepath_tmdb_csv)]
+        tmdb_current_movies = self.tmdb_store.titles()
+        movie_set = set(movie_list)
 
         # Generate list of movies to query
-        movie_list_adjusted = [movie for movie in movie_list if movie not in tmdb_current_movies]
-
-        # Define CSV headers and load existing data
-        csv_headers = [
-            'Title_Alexandria', 'Title_TMDb', 'Release_Date', 'Release_Year', 'Parental Rating',
-            'Runtime_Min', 'Runtime_Hrs', 'Rating', 'Budget', 'Revenue', 'Genres',
-            'Production_Companies', 'Overview', 'TMDb_ID', 'IMDb_ID'
-        ]
-        csv_rows = [list(x.values()) for x in read_csv(self.filepath_tmdb_csv)]
+        movie_list_adjusted = [movie for movie in dict.fromkeys(movie_list) if movie not in tmdb_current_movies]
 
         # Load or initialize movie TMDB IDs
         movie_tmdb_ids = read_json(self.filepath_movie_tmdb_ids) if os.path.exists(
             self.filepath_movie_tmdb_ids) else {}
-        current_movie_id_titles = list(movie_tmdb_ids.keys())
 
-        movie_list_bypass_list = []
         movie_list_not_found = []
-
-        for movie_with_year in movie_list_adjusted:
-            if movie_with_year in movie_list_bypass_list:
-                continue
-
-            print(f"{Fore.GREEN}{Style.BRIGHT}Downloading data{Style.RESET_ALL} for "
-                f"{Fore.BLUE}{Style.BRIGHT}{movie_with_year}{Style.RESET_ALL}")
-
-            movie = '('.join(movie_with_year.split('(')[:-1])
-            year = movie_with_year.split('(')[-1].split(')')[0]
-
-            if movie_with_year not in current_movie_id_titles:
-                params_tmdb_movie_query = {
-                    'query': movie,
-                    'include_adult': 'false',
-                    'language': 'en-US',
-                    'page': '1',
-                    'primary_release_year': year
-                }
-                response_search = requests.get(
-                    self.tmdb_api_url_base_search,
-                    params=params_tmdb_movie_query,
-                    headers=self.headers_tmdb
-                )
-            else:
-                params_tmdb_movie_query = {'language': 'en-US'}
-                url = f"{self.tmdb_api_url_base_query}{movie_tmdb_ids[movie_with_year]}?"
-                response_search = requests.get(url, params=params_tmdb_movie_query, headers=self.headers_tmdb)
-
-            if response_search.status_code == 200:
-                data_search = response_search.json()
-                try:
-                    id_tmdb = data_search['results'][0]['id']
-                except IndexError:
-                    print(f"{Fore.RED}{Style.BRIGHT}Error{Style.RESET_ALL} with "
-                        f"{Fore.BLUE}{Style.BRIGHT}{movie_with_year}{Style.RESET_ALL}")
+        csv_rows = []
+
+        with ThreadPoolExecutor(max_workers=self.tmdb_client.max_workers) as executor:
+            futures = [
+                executor.submit(self._fetch_tmdb_movie_row, movie_with_year, movie_tmdb_ids.get(movie_with_year))
+                for movie_with_year in movie_list_adjusted
+            ]
+            for future in as_completed(futures):
+                movie_with_year, csv_row = future.result()
+                if csv_row is None:
                     movie_list_not_found.append(movie_with_year)
-                    continue
-                except KeyError:
-                    id_tmdb = data_search['id']
-
-                url_query = f"{self.tmdb_api_url_base_query}{id_tmdb}?language=en-US"
-                response_query = requests.get(url_query, headers=self.headers_tmdb)
-
-                if response_query.status_code == 200:
-                    data_query = response_query.json()
-                    movie_data = {
-                        'title_alexandria': movie_with_year,
-                        'title_tmdb': data_query['title'],
-                        'release_date': data_query['release_date'],  # YYYY-MM-DD
-                        'release_year': data_query['release_date'].split('-')[0],
-                        'rating_certification': self._fetch_parental_rating(id_tmdb),
-                        'runtime_min': data_query['runtime'],
-                        'runtime_hrs': f'{data_query["runtime"]/60:.2f}',
-                        'rating': data_query['vote_average'],
-                        'tmdb_id': id_tmdb,
-                        'imdb_id': data_query['imdb_id'],
-                        'budget': data_query['budget'],
-                        'revenue': data_query['revenue'],
-                        'genres': [x['name'] for x in data_query['genres']],
-                        'production_companies': [x['name'] for x in data_query['production_companies']],
-                        'overview': data_query['overview']
-                    }
-                    csv_row = [
-                        movie_data['title_alexandria'], movie_data['title_tmdb'], movie_data['release_date'],
-                        movie_data['release_year'], movie_data['rating_certification'], movie_data['runtime_min'],
-                        movie_data['runtime_hrs'], movie_data['rating'], movie_data['budget'],
-                        movie_data['revenue'], movie_data['genres'], movie_data['production_companies'],
-                        movie_data['overview'], movie_data['tmdb_id'], movie_data['imdb_id']
-                    ]
+                else:
                     csv_rows.append(csv_row)
+        num_changed = self.tmdb_store.upsert_rows(csv_rows)
+        if movie_list_not_found:
+            self._write_tmdb_not_found(sorted(movie_list_not_found))
 
         # Check for movies to delete
-        original_csv_movies = {x['Title_Alexandria'] for x in read_csv(self.filepath_tmdb_csv)}
-        movies_to_delete = original_csv_movies - set(movie_list)
+        movies_to_delete = tmdb_current_movies - movie_set
 
         perform_deletion = False
         if movies_to_delete:
@@ -183,125 +210,250 @@ class API(object):
                 else:
                     print(f"{Fore.RED}Deletion skipped, but CSV will still be updated.{Style.RESET_ALL}")
 
-        # Filter out rows for deleted movies only if confirmed or auto_delete is True
+        # Remove rows for deleted movies only if confirmed or auto_delete is True
         if perform_deletion:
-            csv_rows = [row for row in csv_rows if row[0] in movie_list]
-
-        # Sort and update CSV
-        csv_rows = sorted(csv_rows, key=lambda x: x[0], reverse=False)
+            num_changed += self.tmdb_store.delete(movies_to_delete)
 
-        # Update movie_tmdb_ids
-        for row in csv_rows:
-            if row[0] not in current_movie_id_titles and len(row) > 10:
-                movie_tmdb_ids[row[0]] = str(row[-2])
+        # Export the CSV for older readers only when something changed
+        if num_changed or not os.path.exists(self.filepath_tmdb_csv):
+            self.tmdb_store.export_csv()
 
-        # Write to CSV (always, regardless of deletion)
-        write_to_csv(self.filepath_tmdb_csv, csv_rows, csv_headers)
-
-        # Write updated movie_tmdb_ids to JSON
-        movie_tmdb_ids = dict(sorted(movie_tmdb_ids.items()))
-        with open(self.filepath_movie_tmdb_ids, 'w') as json_file:
-            json.dump(movie_tmdb_ids, json_file, indent=4)
+        # Add IDs for newly fetched movies, keeping any hand-corrected IDs
+        new_tmdb_ids = {title: tmdb_id for title, tmdb_id in self.tmdb_store.tmdb_ids().items() if title not in movie_tmdb_ids}
+        if new_tmdb_ids:
+            movie_tmdb_ids = dict(sorted({**movie_tmdb_ids, **new_tmdb_ids}.items()))
+            with open(self.filepath_movie_tmdb_ids, 'w') as json_file:
+                json.dump(movie_tmdb_ids, json_file, indent=4)
 
         print(f"{Fore.GREEN}{Style.BRIGHT}TMDB Movie data refreshed{Style.RESET_ALL}")
 
-    def tmdb_movies_pull_catalog(self, min_votes=200):
-        """
-        Pull top-rated TMDB movies and save full metadata.
-        Saves existing and missing movies separately.
-        """
-        import time
-
-        tmdb_csv = read_csv(self.filepath_tmdb_csv)
-        current_tmdb_titles_with_year = [f'{x["Title_TMDb"]} ({x["Release_Year"]})' for x in tmdb_csv]
-
-        # Use same headers as tmdb_movies_fetch
-        csv_headers = [
-            'Title_Alexandria', 'Title_TMDb', 'Release_Date', 'Release_Year', 'Parental Rating',
-            'Runtime_Min', 'Runtime_Hrs', 'Rating', 'Budget', 'Revenue', 'Genres',
-            'Production_Companies', 'Overview', 'TMDb_ID', 'IMDb_ID'
-        ]
+    def _write_tmdb_not_found(self, movie_list_not_found: List[str]) -> None:
+        """Write titles TMDb could not find, each with its closest indexed titles as suggested corrections."""
+        export_filepath = find_tmdb_id_export(os.path.dirname(self.filepath_tmdb_csv))
+        title_index = build_title_index(self.tmdb_store.rows(), export_filepath)
+        lines = []
+        for movie_with_year in movie_list_not_found:
+            year = movie_with_year.split('(')[-1].split(')')[0]
+            suggestions = title_index.search(movie_with_year, k=3, year=year)
+            suggestion_text = "; ".join(
+                f"{title}{f' ({candidate_year})' if candidate_year else ''} [{tmdb_id}] {score:.2f}"
+                for score, title, candidate_year, tmdb_id in suggestions
+            )
+            lines.append(f"{movie_with_year} -> {suggestion_text}" if suggestion_text else movie_with_year)
+            print(f"{Fore.RED}{Style.BRIGHT}Not found{Style.RESET_ALL}: {movie_with_year}"
+                  + (f" | {Fore.YELLOW}suggested{Style.RESET_ALL}: {suggestion_text}" if suggestion_text else ""))
+        with open(self.filepath_movie_list_tmdb_not_found, 'w', encoding='utf-8') as not_found_file:
+            not_found_file.write("\n".join(lines) + "\n")
+
+    def _fetch_tmdb_catalog_page(self, segment, num_page, min_votes, skip_ids):
+        """Fetch one discover page of a release-year segment plus details for each new English-language result.
+
+        Details are requested with append_to_response=release_dates so the parental
+        rating comes back in the same call.
 
-        csv_rows_all = []
-
-        pages_min, pages_max = 1, 628
-        for num_page in range(pages_min, pages_max + 1):
-            print(f'{Fore.GREEN}{Style.BRIGHT}Fetching discover page {num_page}/{pages_max}{Style.RESET_ALL}')
-            params = {
-                'include_adult': 'false',
-                'include_video': 'false',
-                'language': 'en-US',
-                'page': num_page,
-                'sort_by': 'vote_average.desc',
-                'without_genres': '99,10755',
-                'vote_count.gte': min_votes
-            }
+        Returns:
+            tuple: (segment, num_page, rows, total_pages), where rows is None if the page failed
+            and should be retried, or an empty list if TMDb rejected the page outright (4xx).
+        """
+        first_year, last_year = segment
+        params = {
+            'include_adult': 'false',
+            'include_video': 'false',
+            'language': 'en-US',
+            'page': num_page,
+            'primary_release_date.gte': f'{first_year}-01-01',
+            'primary_release_date.lte': f'{last_year}-12-31',
+            'sort_by': 'vote_average.desc',
+            'without_genres': '99,10755',
+            'vote_count.gte': min_votes
+        }
+        response = self.tmdb_client.discover_movies(params)
+        if response.status_code != 200:
+            print(f"{Fore.RED}Skipping page {num_page} of {first_year}-{last_year} (status {response.status_code}){Style.RESET_ALL}")
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                return segment, num_page, [], None  # Permanently invalid; retrying cannot help
+            return segment, num_page, None, None
+
+        data_page = response.json()
+        rows = []
+        for result in data_page.get('results', []):
+            if result.get('original_language') != 'en':
+                continue
 
-            response = requests.get(self.tmdb_api_url_base_discover, params=params, headers=self.headers_tmdb)
-            if response.status_code != 200:
-                print(f"{Fore.RED}Skipping page {num_page} (status {response.status_code}){Style.RESET_ALL}")
+            tmdb_id = result['id']
+            if str(tmdb_id) in skip_ids:
                 continue
+            print(f'{Fore.CYAN}Getting metadata for: {result["title"]} ({result.get("release_date", "")[:4]}){Style.RESET_ALL}')
 
-            for result in response.json().get('results', []):
-                if result.get('original_language') != 'en':
-                    continue
+            # Fetch full movie details and release dates in one request
+            response_query = self.tmdb_client.movie_details(tmdb_id, append_to_response='release_dates')
+            if response_query.status_code != 200:
+                print(f"{Fore.RED}Error retrieving details for ID {tmdb_id}{Style.RESET_ALL}")
+                continue
 
-                tmdb_id = result['id']
-                print(f'{Fore.CYAN}Getting metadata for: {result["title"]} ({result["release_date"][:4]}){Style.RESET_ALL}')
+            data_query = response_query.json()
+            rating_certification = self._parental_rating_from_details(data_query, tmdb_id)
+
+            # Build consistent metadata
+            movie_data = {
+                'Title_Alexandria': f"{data_query['title']} ({data_query['release_date'][:4]})",
+                'Title_TMDb': data_query['title'],
+                'Release_Date': data_query.get('release_date', ''),
+                'Release_Year': data_query.get('release_date', '0000')[:4],
+                'Parental Rating': rating_certification,
+                'Runtime_Min': data_query.get('runtime', 0),
+                'Runtime_Hrs': f"{(data_query.get('runtime', 0) / 60):.2f}",
+                'Rating': data_query.get('vote_average', 0),
+                'Budget': data_query.get('budget', 0),
+                'Revenue': data_query.get('revenue', 0),
+                'Genres': [g['name'] for g in data_query.get('genres', [])],
+                'Production_Companies': [p['name'] for p in data_query.get('production_companies', [])],
+                'Overview': data_query.get('overview', ''),
+                'TMDb_ID': tmdb_id,
+                'IMDb_ID': data_query.get('imdb_id', '')
+            }
+            rows.append(list(movie_data.values()))
 
-                # Fetch full movie details
-                url_query = f"{self.tmdb_api_url_base_query}{tmdb_id}?language=en-US"
-                response_query = requests.get(url_query, headers=self.headers_tmdb)
-                if response_query.status_code != 200:
-                    print(f"{Fore.RED}Error retrieving details for ID {tmdb_id}{Style.RESET_ALL}")
-                    continue
+        return segment, num_page, rows, data_page.get('total_pages')
 
-                data_query = response_query.json()
-
-                # Fetch parental rating
-                rating_certification = self._fetch_parental_rating(tmdb_id)
-
-                # Build consistent metadata
-                movie_data = {
-                    'Title_Alexandria': f"{data_query['title']} ({data_query['release_date'][:4]})",
-                    'Title_TMDb': data_query['title'],
-                    'Release_Date': data_query.get('release_date', ''),
-                    'Release_Year': data_query.get('release_date', '0000')[:4],
-                    'Parental Rating': rating_certification,
-                    'Runtime_Min': data_query.get('runtime', 0),
-                    'Runtime_Hrs': f"{(data_query.get('runtime', 0) / 60):.2f}",
-                    'Rating': data_query.get('vote_average', 0),
-                    'Budget': data_query.get('budget', 0),
-                    'Revenue': data_query.get('revenue', 0),
-                    'Genres': [g['name'] for g in data_query.get('genres', [])],
-                    'Production_Companies': [p['name'] for p in data_query.get('production_companies', [])],
-                    'Overview': data_query.get('overview', ''),
-                    'TMDb_ID': tmdb_id,
-                    'IMDb_ID': data_query.get('imdb_id', '')
-                }
-
-                csv_rows_all.append(list(movie_data.values()))
-
-                # Small pause to avoid hitting TMDb rate limits
-                time.sleep(0.3)
-
-        # Split into existing vs missing
-        pulled_tmdb_titles_with_year = [x[0] for x in csv_rows_all]  # Title_Alexandria format
+    def _write_tmdb_catalog_csvs(self, csv_rows_all, current_tmdb_titles_with_year, csv_headers):
+        """Split crawled rows into existing vs missing and write the four catalog CSVs."""
         existing_rows, missing_rows = [], []
-        for i, title_with_year in enumerate(pulled_tmdb_titles_with_year):
-            if title_with_year in current_tmdb_titles_with_year:
-                existing_rows.append(csv_rows_all[i])
+        for row in csv_rows_all:
+            if row[0] in current_tmdb_titles_with_year:  # Title_Alexandria format
+                existing_rows.append(row)
             else:
-                missing_rows.append(csv_rows_all[i])
+                missing_rows.append(row)
 
-        # Sort & write files
         write_to_csv(self.filepath_tmdb_top_rated_current_csv, sorted(existing_rows, key=lambda x: x[7], reverse=True), csv_headers)
         write_to_csv(self.filepath_tmdb_top_rated_missing_csv, sorted(missing_rows, key=lambda x: x[7], reverse=True), csv_headers)
         write_to_csv(self.filepath_tmdb_recent_current_csv, sorted(existing_rows, key=lambda x: x[2], reverse=True), csv_headers)
         write_to_csv(self.filepath_tmdb_recent_missing_csv, sorted(missing_rows, key=lambda x: x[2], reverse=True), csv_headers)
 
-        print(f"{Fore.GREEN}{Style.BRIGHT}TMDB catalog pull complete.{Style.RESET_ALL}")
-    
+    def tmdb_movies_pull_catalog(self, min_votes=200, pages_max=TMDB_DISCOVER_MAX_PAGE, checkpoint_every=10):
+        """
+        Pull top-rated TMDB movies and save full metadata.
+        Saves existing and missing movies separately.
+
+        TMDb only serves the first 500 discover pages of a query, so the catalog is
+        split into release-year segments (halved until each fits under the limit)
+        and every segment is crawled in full. Pages are crawled concurrently under
+        the TMDb rate limiter. Completed pages and fetched rows are checkpointed, so
+        an interrupted crawl resumes where it stopped, and the existing/missing CSVs
+        are refreshed as pages complete.
+        """
+        current_tmdb_titles_with_year = {f'{x["Title_TMDb"]} ({x["Release_Year"]})' for x in self.tmdb_store.rows()}
+        pages_max = min(pages_max, TMDB_DISCOVER_MAX_PAGE)
+
+        # Use same headers as tmdb_movies_fetch
+        csv_headers = TMDB_CSV_HEADERS
+
+        # Resume from a previous, interrupted crawl with the same parameters
+        checkpoint = read_json(self.filepath_tmdb_catalog_checkpoint, default={}) if os.path.exists(
+            self.filepath_tmdb_catalog_checkpoint) else {}
+        if checkpoint.get('min_votes') != min_votes or 'segments' not in checkpoint:
+            checkpoint = {'min_votes': min_votes, 'completed_pages': [], 'segments': None}
+            if os.path.exists(self.filepath_tmdb_catalog_rows):
+                os.remove(self.filepath_tmdb_catalog_rows)
+
+        rows_by_id = {}
+        if os.path.exists(self.filepath_tmdb_catalog_rows):
+            with open(self.filepath_tmdb_catalog_rows, 'r', encoding='utf-8') as rows_file:
+                for line in rows_file:
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Partially written line from a crash
+                    rows_by_id[str(row[13])] = row
+        completed_pages = set(checkpoint['completed_pages'])
+        if completed_pages:
+            print(f"{Fore.YELLOW}{Style.BRIGHT}Resuming catalog crawl{Style.RESET_ALL}: "
+                  f"{len(completed_pages):,} pages and {len(rows_by_id):,} movies already fetched")
+
+        # The first page of a segment tells us how many pages it has; split it while it exceeds the limit
+        if checkpoint['segments'] is None:
+            segments = {}
+            pending = [(TMDB_CATALOG_FIRST_YEAR, datetime.date.today().year)]
+            while pending:
+                segment = pending.pop()
+                _, _, rows, total_pages = self._fetch_tmdb_catalog_page(segment, 1, min_votes, set(rows_by_id))
+                if rows is None:
+                    print(f"{Fore.RED}Unable to fetch the first discover page; aborting catalog pull.{Style.RESET_ALL}")
+                    return
+                first_year, last_year = segment
+                if (total_pages or 1) > pages_max and first_year < last_year:
+                    middle = (first_year + last_year) // 2
+                    pending += [(first_year, middle), (middle + 1, last_year)]
+                    self._record_tmdb_catalog_page(checkpoint, completed_pages, rows_by_id, None, rows)
+                    continue
+                segment_key = f"{first_year}-{last_year}"
+                segments[segment_key] = min(total_pages or 1, pages_max)
+                self._record_tmdb_catalog_page(checkpoint, completed_pages, rows_by_id, f"{segment_key}:1", rows)
+            checkpoint['segments'] = segments
+            write_json(self.filepath_tmdb_catalog_checkpoint, checkpoint)
+
+        pages_all = [
+            (segment_key, num_page)
+            for segment_key, total_pages in sorted(checkpoint['segments'].items())
+            for num_page in range(1, total_pages + 1)
+        ]
+        pages_remaining = [(k, p) for k, p in pages_all if f"{k}:{p}" not in completed_pages]
+        pages_failed = 0
+
+        with ThreadPoolExecutor(max_workers=self.tmdb_client.max_workers) as executor:
+            skip_ids = set(rows_by_id)
+            futures = [
+                executor.submit(self._fetch_tmdb_catalog_page, tuple(map(int, segment_key.split('-'))),
+                                num_page, min_votes, skip_ids)
+                for segment_key, num_page in pages_remaining
+            ]
+            for idx, future in enumerate(as_completed(futures)):
+                (first_year, last_year), num_page, rows, _ = future.result()
+                if rows is None:
+                    pages_failed += 1
+                    continue
+                self._record_tmdb_catalog_page(checkpoint, completed_pages, rows_by_id,
+                                               f"{first_year}-{last_year}:{num_page}", rows)
+                print(f'{Fore.GREEN}{Style.BRIGHT}Fetched discover page {num_page} of {first_year}-{last_year}{Style.RESET_ALL} '
+                      f'({len(completed_pages):,}/{len(pages_all):,})')
+                if (idx + 1) % checkpoint_every == 0:
+                    self._write_tmdb_catalog_csvs(list(rows_by_id.values()), current_tmdb_titles_with_year, csv_headers)
+
+        self._write_tmdb_catalog_csvs(list(rows_by_id.values()), current_tmdb_titles_with_year, csv_headers)
+        self._refresh_movie_recommendations()
+
+        if not pages_failed:
+            # Finished cleanly; the next pull starts a fresh crawl
+            for filepath in (self.filepath_tmdb_catalog_checkpoint, self.filepath_tmdb_catalog_rows):
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+            print(f"{Fore.GREEN}{Style.BRIGHT}TMDB catalog pull complete.{Style.RESET_ALL}")
+        else:
+            print(f"{Fore.YELLOW}{Style.BRIGHT}TMDB catalog pull incomplete{Style.RESET_ALL}: "
+                  f"{pages_failed:,} pages failed and will be retried on the next run.")
+
+    def _refresh_movie_recommendations(self) -> None:
+        """Re-rank the missing catalog against the library (genre co-occurrence + recommendations)."""
+        sys.path.append(os.path.join(os.path.dirname(__file__), "analysis"))
+        from movie_recommendations import generate_movie_recommendations
+        generate_movie_recommendations(
+            self.tmdb_store.rows(),
+            read_csv(self.filepath_tmdb_top_rated_missing_csv),
+            os.path.dirname(self.filepath_tmdb_top_rated_missing_csv)
+        )
+
+    def _record_tmdb_catalog_page(self, checkpoint, completed_pages, rows_by_id, page_key, rows):
+        """Append a finished page's rows to the journal, then mark the page complete (unless page_key is None)."""
+        with open(self.filepath_tmdb_catalog_rows, 'a', encoding='utf-8') as rows_file:
+            for row in rows:
+                rows_by_id[str(row[13])] = row
+                rows_file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        if page_key is None:
+            return
+        completed_pages.add(page_key)
+        checkpoint['completed_pages'] = sorted(completed_pages)
+        write_json(self.filepath_tmdb_catalog_checkpoint, checkpoint)
+
     def fetch_tvdb_series_ids(self) -> Dict[str, str]:
         """
         Fetch TVDB series IDs for TV shows and anime titles, storing them in a JSON file.
@@ -309,18 +461,15 @@ class API(object):
         Returns:
             Dict[str, str]: Dictionary mapping series titles with years to their TVDB IDs.
         """
-        # Load media statistics
-        media_stats = read_json(self.filepath_statistics)
-        titles = (
-            media_stats["TV Shows"]["Show Titles"] +
-            media_stats["Anime"]["Anime Titles"]
-        )
+        sys.path.append(os.path.join(os.path.dirname(__file__), "analysis"))
+        from read_server_statistics import read_media_titles
+        # Load only the series title manifests, not the full statistics
+        titles = read_media_titles("TV Shows") + read_media_titles("Anime")
         omit_series = ["Das Boot - Die Komplette (1985)"]
 
         # Load or initialize series IDs
         series_ids = read_json(self.filepath_series_ids, default={})
         current_titles = set(series_ids.keys())
-        tvdb = tvdb_v4_official.TVDB(self.tvdb_api_key)
 
         for title_with_year in titles:
             # Extract title and year
@@ -336,7 +485,11 @@ class API(object):
             
             # Search TVDB
             try:
-                search_results = tvdb.search(formatted_title)
+                search_results = self.http_cache.memoize(
+                    f"tvdb://search?query={formatted_title.lower()}",
+                    lambda: self.tvdb_client.search(formatted_title),
+                    is_negative=lambda results: not results
+                )
             except Exception as e:
                 print(f"Error searching for {title_with_year}: {e}")
                 continue
@@ -369,12 +522,14 @@ class API(object):
 
         return series_ids
 
-    def fetch_tvdb_series_info(self,series_num):
-        import tvdb_v4_official
-        tvdb = tvdb_v4_official.TVDB(self.tvdb_api_key)
+    def fetch_tvdb_series_info(self,series_num,last_updated=None):
         # series = tvdb.get_series(series_num)
         # series_extended = tvdb.get_series_extended(series_num)
-        series_episodes_info = tvdb.get_series_episodes(series_num, page=0, lang='en')
+        # Keyed on lastUpdated so a changed series never comes back from a stale cache entry
+        series_episodes_info = self.http_cache.memoize(
+            f"tvdb://series/{series_num}/episodes?page=0&lang=en&updated={last_updated or ''}",
+            lambda: self.tvdb_client.get_series_episodes(series_num, page=0, lang='en')
+        )
         try:
             series_title = series_episodes_info['series']["name"]
             series_overview = series_episodes_info['series']["overview"]
@@ -424,37 +579,87 @@ class API(object):
             "Series Status" : series_status,
             "Series Overview" : series_overview,
             "Series Episodes" : series_episode_dict,
-            "Series ID" : series_num
+            "Series ID" : series_num,
+            "Series Last Updated" : last_updated
         })
         return series_dict
     
+    def _refresh_tvdb_series(self, series_name, series_id, series_data):
+        """Returns (status, series_data) for one series: 'unchanged', 'updated' or 'failed'."""
+        try:
+            last_updated = self.tvdb_client.get_series(series_id).get('lastUpdated')
+        except Exception as e:
+            print(f"{RED}Failed to fetch TVDB record{RESET}: {series_name} [{series_id}] | {e}")
+            return 'failed', None
+        if series_data and last_updated and series_data.get('Series Last Updated') == last_updated:
+            return 'unchanged', series_data
+        try:
+            return 'updated', self.fetch_tvdb_series_info(series_id, last_updated)
+        except Exception as e:
+            print(f"{RED}Failed to fetch data for series{RESET}: {series_name} [{series_id}] | {e}")
+            return 'failed', None
+
+    def _read_series_data(self) -> Dict[str, Dict]:
+        """Series data from the last compacted file, plus any journaled updates from an interrupted refresh."""
+        macro_series_data = read_json(self.filepath_series_data, default={}) if os.path.exists(
+            self.filepath_series_data) else {}
+        if os.path.exists(self.filepath_series_data_journal):
+            with open(self.filepath_series_data_journal, 'r', encoding='utf-8') as journal_file:
+                for line in journal_file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Partially written line from a crash
+                    macro_series_data[entry['Series ID']] = entry['Series Data']
+        return macro_series_data
+
     def update_series_data(self) -> Dict[str, Dict]:
+        """
+        Refresh TVDB data for every series that has not ended.
+
+        Series are checked concurrently; a series whose TVDB lastUpdated matches the
+        stored value is skipped. Each refreshed series is appended to a journal as it
+        completes, so an interrupted run loses nothing, and the journal is compacted
+        into alexandria_series_data.json once at the end.
+        """
         self.fetch_tvdb_series_ids()
         series_ids = read_json(self.filepath_series_ids)
-        macro_series_data = read_json(self.filepath_series_data)
+        macro_series_data = self._read_series_data()
 
-        for idx, series_name in enumerate(series_ids):
-            series_id = series_ids[series_name]
+        series_to_refresh = []
+        for series_name, series_id in series_ids.items():
             series_data = macro_series_data.get(series_id, {})
-
-            try:
-                if series_data['Series Status'] == "Ended":
-                    print(f"{YELLOW}Skipping{RESET} {series_name} [{series_id}] | {GREEN}Series ended & is already processed.{RESET}")
-                    continue
-            except KeyError:
-                pass
-
-            series_data = self.fetch_tvdb_series_info(series_id)
-            if series_data is None:
-                print(f"{RED}Failed to fetch data for series{RESET}: {series_name} [{series_id}]")
+            if series_data.get('Series Status') == "Ended":
+                print(f"{YELLOW}Skipping{RESET} {series_name} [{series_id}] | {GREEN}Series ended & is already processed.{RESET}")
                 continue
-            
-            macro_series_data[series_id] = series_data
-            print(f"{GREEN}Processed{RESET} {idx + 1}/{len(series_ids)}: {series_name} [{series_id}]")
-            if idx % 10 == 0:
-                # Write progress to file every 10 iterations
-                write_json(self.filepath_series_data, macro_series_data)
-            write_json(self.filepath_series_data, macro_series_data)
+            series_to_refresh.append((series_name, series_id))
+
+        num_unchanged = 0
+        with ThreadPoolExecutor(max_workers=TVDB_MAX_WORKERS) as executor, \
+                open(self.filepath_series_data_journal, 'a', encoding='utf-8') as journal_file:
+            futures = {
+                executor.submit(self._refresh_tvdb_series, series_name, series_id, macro_series_data.get(series_id)): (series_name, series_id)
+                for series_name, series_id in series_to_refresh
+            }
+            for idx, future in enumerate(as_completed(futures)):
+                series_name, series_id = futures[future]
+                status, series_data = future.result()
+                if status == 'unchanged':
+                    num_unchanged += 1
+                    continue
+                if status == 'failed':
+                    continue
+                macro_series_data[series_id] = series_data
+                journal_file.write(json.dumps({'Series ID': series_id, 'Series Data': series_data}, ensure_ascii=False) + "\n")
+                journal_file.flush()
+                print(f"{GREEN}Processed{RESET} {idx + 1}/{len(series_to_refresh)}: {series_name} [{series_id}]")
+
+        print(f"{YELLOW}{num_unchanged:,} series unchanged on TVDB since the last refresh.{RESET}")
+        # The journal is the only durable copy of this run's refreshes until the compaction lands
+        if write_json(self.filepath_series_data, macro_series_data):
+            os.remove(self.filepath_series_data_journal)
+        else:
+            print(f"{RED}Keeping {self.filepath_series_data_journal}; it will be replayed on the next run.{RESET}")
         return macro_series_data
 
     def open_library_search(self, 
@@ -471,7 +676,7 @@ class API(object):
             'limit': 10,  # Limit the number of results
             'lang': 'eng'
         }
-        response = requests.get(open_library_url, params=params)
+        response = self.open_library_client.get(open_library_url, params=params)
         # Check if the request was successful
         if response.status_code == 200:
             data = response.json()
@@ -500,111 +705,152 @@ class API(object):
         else:
             print(f"Error: {response.status_code} - {response.text}")
 
-    def emby_api(self):
-        # Set your Emby server information and API key
-        emby_url = self.emby_url
-        api_key = self.emby_api_key
-        # Example: Get all items from your Emby server
-        endpoint = f'{emby_url}/emby/Items'
-        headers = {
-            'X-Emby-Token': api_key
-        }
-        response = requests.get(endpoint, headers=headers)
-        # Check if the request was successful
-        if response.status_code == 200:
+    def _emby_user_id(self) -> str:
+        """User whose play statistics are synced: api.config emby.user_id, else the first administrator."""
+        user_id = self.api_config['emby'].get('user_id')
+        if user_id:
+            return user_id
+        response = self.emby_client.get(f'{self.emby_url}/emby/Users')
+        response.raise_for_status()
+        users = response.json()
+        admins = [user for user in users if user.get('Policy', {}).get('IsAdministrator')]
+        return (admins or users)[0]['Id']
+
+    def _fetch_emby_items(self, user_id: str, params: dict, page_size: int):
+        """Yields every item matching `params`, one page of `page_size` at a time."""
+        start_index = 0
+        while True:
+            page_params = {
+                'Recursive': 'true',
+                'IncludeItemTypes': 'Movie,Series,Episode,Audio',
+                'StartIndex': start_index,
+                'Limit': page_size,
+                'SortBy': 'SortName',
+                'EnableImages': 'false',
+                **params
+            }
+            response = self.emby_client.get(f'{self.emby_url}/emby/Users/{user_id}/Items', params=page_params)
+            response.raise_for_status()
             data = response.json()
-            for item in data['Items']:
-                print(f"Title: {item['Name']}, Type: {item['Type']}")
-        else:
-            print(f"Error: {response.status_code} - {response.text}")
-
-        ###
-
-        # Replace with the actual item ID of the actor and the path to the new image
-        actor_item_id = 'ACTOR-ITEM-ID'
-        image_path = 'path/to/actor-image.jpg'
-
-        # Endpoint for updating the actor image
-        endpoint = f'{emby_url}/emby/Items/{actor_item_id}/Images?Type=Primary'
-
-        # Read the image file
-        with open(image_path, 'rb') as image_file:
-            image_data = image_file.read()
-
-        # Headers with your API key
-        headers = {
-            'X-Emby-Token': api_key,
-            'Content-Type': 'image/jpeg'
+            items = data.get('Items', [])
+            yield from items
+            start_index += len(items)
+            if not items or start_index >= data.get('TotalRecordCount', 0):
+                break
+
+    @staticmethod
+    def _emby_item_record(item: dict) -> dict:
+        user_data = item.get('UserData', {})
+        run_time_ticks = item.get('RunTimeTicks')
+        return {
+            "Name": item.get('Name'),
+            "Type": item.get('Type'),
+            "Path": item.get('Path'),
+            "Production Year": item.get('ProductionYear'),
+            "Series Name": item.get('SeriesName'),
+            "Season Number": item.get('ParentIndexNumber'),
+            "Episode Number": item.get('IndexNumber'),
+            "Runtime (Seconds)": round(run_time_ticks / 10**7) if run_time_ticks else None,
+            "Date Created": item.get('DateCreated'),
+            "Play Count": user_data.get('PlayCount', 0),
+            "Played": user_data.get('Played', False),
+            "Last Played Date": user_data.get('LastPlayedDate')
         }
 
-        # Make the POST request to update the image
-        response = requests.post(endpoint, headers=headers, data=image_data)
-
-        if response.status_code == 204:
-            print(f"Actor image updated successfully!")
-        else:
-            print(f"Failed to update actor image: {response.status_code} - {response.text}")
-
-        ###
-
-        actor_name = 'ACTOR-NAME'
-        # Search for the actor by name
-        search_endpoint = f'{emby_url}/emby/Persons?searchTerm={actor_name}'
-        response = requests.get(search_endpoint, headers=headers)
+    def emby_sync(self, full_sync: bool = False, page_size: int = 500) -> Dict[str, dict]:
+        """
+        Sync the Emby library into a local snapshot (output/emby/emby_library.json) of
+        items, paths, runtimes and play counts.
 
-        if response.status_code == 200:
-            data = response.json()
-            if data['Items']:
-                actor_item_id = data['Items'][0]['Id']
-                print(f"Found actor {actor_name} with ItemId: {actor_item_id}")
-            else:
-                print(f"Actor {actor_name} not found.")
+        After the first full sync only deltas are requested: items saved since the last
+        sync (MinDateLastSaved) and items whose play state changed (MinDateLastSavedForUser).
+        A lightweight ID-only pass drops items that were removed from the server.
+        """
+        library = read_json(self.filepath_emby_library, default={}) if os.path.exists(
+            self.filepath_emby_library) else {}
+        user_id = self._emby_user_id()
+        if library.get('User ID') != user_id:
+            full_sync = True
+        items = {} if full_sync else library.get('Items', {})
+        last_sync = None if full_sync else library.get('Last Sync')
+
+        # Overlap the previous window slightly so clock skew never drops a change
+        sync_started = datetime.datetime.now(datetime.timezone.utc)
+        fields = {'Fields': 'Path,DateCreated,ProductionYear'}
+        if last_sync:
+            since = (datetime.datetime.fromisoformat(last_sync) - datetime.timedelta(minutes=5)).strftime('%Y-%m-%dT%H:%M:%SZ')
+            queries = [{**fields, 'MinDateLastSaved': since}, {**fields, 'MinDateLastSavedForUser': since}]
         else:
-            print(f"Error: {response.status_code} - {response.text}")
+            queries = [fields]
+
+        # An item can come back from both delta queries; count it once
+        updated_ids = set()
+        for params in queries:
+            for item in self._fetch_emby_items(user_id, params, page_size):
+                items[item['Id']] = self._emby_item_record(item)
+                updated_ids.add(item['Id'])
+        num_updated = len(updated_ids)
+
+        num_removed = 0
+        if last_sync:
+            server_ids = {item['Id'] for item in self._fetch_emby_items(
+                user_id, {'Fields': 'BasicSyncInfo', 'EnableUserData': 'false'}, page_size * 10)}
+            for item_id in set(items) - server_ids:
+                del items[item_id]
+                num_removed += 1
+
+        os.makedirs(os.path.dirname(self.filepath_emby_library), exist_ok=True)
+        write_json(self.filepath_emby_library, {
+            "Last Sync": sync_started.isoformat(timespec='seconds'),
+            "User ID": user_id,
+            "Items": items
+        })
+        print(f"{GREEN}Emby {'full' if not last_sync else 'incremental'} sync complete{RESET}: "
+              f"{num_updated:,} items updated, {num_removed:,} removed, {len(items):,} total")
+        return items
 
     def _fetch_parental_rating(self,tmdb_id):
-        tmdb_api_key = self.tmdb_api_key
-        # url = f"https://api.themoviedb.org/3/tv/{tmdb_id}/content_ratings"
-        url = f'https://api.themoviedb.org/3/movie/{tmdb_id}/release_dates'
-        headers = {
-            "accept": "application/json",
-            "Authorization": f"Bearer {tmdb_api_key}"
-        }
-        preferred_countries = ['US', 'CA', 'GB', 'FR', 'GR', 'ES', 'DE', 'CH', 'JP']
         try:
-            response = requests.get(url, headers=headers)
+            response = self.tmdb_client.movie_release_dates(tmdb_id)
             response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
             data = response.json()
-
-            ratings = data.get('results', [])
-            if not ratings:
-                print("No parental ratings found.")
-                return None
-
-            # Try preferred countries first
-            for country in preferred_countries:
-                for rating in ratings:
-                    if rating.get('iso_3166_1') == country:
-                        rating_certification = rating.get('release_dates')[0]['certification']
-                        if rating_certification != '' and rating_certification != 'NR':
-                            # print(f"Parental rating for TMDb ID {tmdb_id}: {rating_certification} ({country})")
-                            return rating_certification
-
-            # Fallback to any available rating if preferred countries not found
-            first_certification = ratings[0].get('release_dates')[0]['certification']
-            if first_certification != '':
-                print(f"FALLBACK: Parental rating for TMDb ID {tmdb_id}: {first_certification} ({ratings[0].get('iso_3166_1')})")
-                return first_certification.strip()
-            else:
-                print(f"Parental rating for TMDb ID {tmdb_id}: NR (No certification available)")
-                return 'NR'
-
+            return self._parse_parental_rating(data.get('results', []), tmdb_id)
         except requests.RequestException as e:
             print(f"Request failed: {e}")
         except ValueError:
             print("Failed to decode JSON from response.")
         return None
 
+    def _parental_rating_from_details(self, data_query, tmdb_id):
+        """Use release dates appended to a details response, falling back to a separate request."""
+        if 'release_dates' in data_query:
+            return self._parse_parental_rating(data_query['release_dates'].get('results', []), tmdb_id)
+        return self._fetch_parental_rating(tmdb_id)
+
+    def _parse_parental_rating(self, ratings, tmdb_id):
+        preferred_countries = ['US', 'CA', 'GB', 'FR', 'GR', 'ES', 'DE', 'CH', 'JP']
+        if not ratings:
+            print("No parental ratings found.")
+            return None
+
+        # Try preferred countries first
+        for country in preferred_countries:
+            for rating in ratings:
+                if rating.get('iso_3166_1') == country:
+                    rating_certification = rating.get('release_dates')[0]['certification']
+                    if rating_certification != '' and rating_certification != 'NR':
+                        # print(f"Parental rating for TMDb ID {tmdb_id}: {rating_certification} ({country})")
+                        return rating_certification
+
+        # Fallback to any available rating if preferred countries not found
+        first_certification = ratings[0].get('release_dates')[0]['certification']
+        if first_certification != '':
+            print(f"FALLBACK: Parental rating for TMDb ID {tmdb_id}: {first_certification} ({ratings[0].get('iso_3166_1')})")
+            return first_certification.strip()
+        else:
+            print(f"Parental rating for TMDb ID {tmdb_id}: NR (No certification available)")
+            return 'NR'
+
 import os
 if __name__ == '__main__':
     # instantiate API handler
@@ -621,6 +867,7 @@ if __name__ == '__main__':
     # api_handler.tvdb_fetch_all_series_info(series_ids)
     # api_handler.tvdb_show_fetch_info(series_ids[0])
     # api_handler._fetch_parental_rating(4951)
+    # api_handler.emby_sync()
     # data = api_handler.open_library_search("The Great Gatsby","1920")
     # with open(os.path.join(api_handler.output_directory, "temp", "open_library_search_results.json"), "w", encoding="utf-8") as f:
     #     json.dump(data, f, indent=4, ensure_ascii=False)
\ No newline at end of file
@@ -18,9 +18,11 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "utils"))
 
 
 from read_server_statistics import read_media_statistics
+from forecast_storage_growth import print_drive_forecasts
 from assess_backup import get_movie_live_backup_status, get_series_configured_backup_status, update_all_media_lists
 from generate_audio_file_print_string import generate_audio_file_print_string
 from api import API
+from tmdb_store import TMDbStore
 
 # Import from updated cross-platform utilities
 from utilities import (
@@ -30,7 +32,6 @@ from utilities import (
     get_space_remaining,
     read_alexandria,
     read_alexandria_config,
-    read_csv,
     read_json,
     read_file_as_list,
     order_file_contents,
@@ -209,8 +210,8 @@ class Backup:
         exclude_strings = config_node["backup_exclusion_strings"]
         exclude_strings_exceptions = config_node["backup_exclusion_override_strings"]
 
-        tmdb_filepath = os.path.join(self.output_directory, 'movies', 'tmdb.csv')
-        tmdb_data = read_csv(tmdb_filepath)
+        tmdb_store = TMDbStore(os.path.join(self.output_directory, 'movies', 'tmdb.db'),
+                               os.path.join(self.output_directory, 'movies', 'tmdb.csv'))
 
         backup_tuple_accepted = []
         backup_filepaths_blocked = []
@@ -225,9 +226,9 @@ class Backup:
                 continue
 
             # Find movie in TMDb data
-            tmdb_entry = next((item for item in tmdb_data if item.get('Title_Alexandria') == movie_with_year), None)
+            tmdb_entry = tmdb_store.get(movie_with_year)
 
-            if not tmdb_entry or not 0 < float(tmdb_entry['Rating']) <= 10:
+            if not tmdb_entry or not 0 < float(tmdb_entry['Rating'] or 0) <= 10:
                 if not backup_unknown_ratings:
                     if os.path.isfile(filepath_backup_candidate):
                         backup_filepaths_revoked.append(filepath_backup_candidate)
@@ -648,6 +649,7 @@ class Backup:
             get_movie_live_backup_status()
             get_series_configured_backup_status()
             read_media_statistics(bool_update=False, bool_print=True)
+            print_drive_forecasts()
 
             print(f'\n{"#" * 10}\n\n{GREEN}{BRIGHT}Alexandria Backup Complete{RESET}\n\n{"#" * 10}\n')
             
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+DAY = 24 * 3600
+
+# (pattern matched against the normalized URL/key, TTL in seconds), first match wins
+DEFAULT_TTL_RULES: List[Tuple[str, int]] = [
+    (r"/3/search/", 7 * DAY),
+    (r"/3/discover/", 1 * DAY),
+    (r"/3/movie/", 30 * DAY),
+    (r"lrclib\.net/api/", 90 * DAY),
+    (r"openlibrary\.org/", 30 * DAY),
+    (r"^tvdb://search", 30 * DAY),
+    (r"^tvdb://", 1 * DAY),
+    (r"^genius://", 90 * DAY),
+]
+DEFAULT_TTL = 7 * DAY
+DEFAULT_NEGATIVE_TTL = 14 * DAY
+
+
+def normalize_url(url: str, params: Optional[dict] = None) -> str:
+    """Lowercases scheme/host, merges params into the query string and sorts it."""
+    parts = urlsplit(url.strip())
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query += [(str(k), str(v).strip()) for k, v in params.items() if v is not None]
+    query = sorted(query)
+    path = parts.path.rstrip("?") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+class ResponseCache(object):
+    """
+    On-disk HTTP response cache keyed by normalized URL + params.
+
+    Entries are sharded JSON files, so concurrent workers never rewrite a shared
+    index. Fresh entries are served without touching the network, stale entries
+    are revalidated with ETag/Last-Modified, and 404s are cached as negative
+    results for a shorter TTL.
+    """
+
+    def __init__(self,
+                 cache_directory: str,
+                 ttl_rules: Optional[List[Tuple[str, int]]] = None,
+                 default_ttl: int = DEFAULT_TTL,
+                 negative_ttl: int = DEFAULT_NEGATIVE_TTL
+                 ):
+        self.cache_directory = cache_directory
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in (ttl_rules or DEFAULT_TTL_RULES)]
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_directory, exist_ok=True)
+
+    def ttl_for(self, key: str) -> int:
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(key):
+                return ttl
+        return self.default_ttl
+
+    def _entry_path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_directory, digest[:2], f"{digest}.json")
+
+    def _read_entry(self, key: str) -> Optional[dict]:
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return entry if entry.get("key") == key else None
+
+    def _write_entry(self, key: str, entry: dict) -> None:
+        entry["key"] = key
+        filepath = self._entry_path(key)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        tmp_filepath = f"{filepath}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_filepath, "w", encoding="utf-8") as file:
+                json.dump(entry, file, ensure_ascii=False)
+            os.replace(tmp_filepath, filepath)
+        except OSError as e:
+            print(f"Error writing cache entry {filepath}: {e}")
+
+    def _count(self, hit: bool) -> None:
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @staticmethod
+    def _to_response(entry: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response.reason = entry.get("reason")
+        response.url = entry.get("url")
+        response.headers.update(entry.get("headers", {}))
+        response._content = entry["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        return response
+
+    def fetch(self, get: Callable[..., requests.Response], url: str, params: Optional[dict] = None,
+              headers: Optional[dict] = None, **kwargs) -> requests.Response:
+        """
+        Serves a GET through the cache. `get` is any requests-style callable
+        (requests.get, Session.get, RateLimitedClient.get) used on a miss.
+        """
+        key = normalize_url(url, params)
+        entry = self._read_entry(key)
+        now = time.time()
+
+        if entry and entry["expires_at"] > now:
+            self._count(hit=True)
+            return self._to_response(entry)
+
+        request_headers = dict(headers or {})
+        if entry and entry["status_code"] == 200:
+            if entry["headers"].get("ETag"):
+                request_headers["If-None-Match"] = entry["headers"]["ETag"]
+            if entry["headers"].get("Last-Modified"):
+                request_headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        response = get(url, params=params, headers=request_headers or None, **kwargs)
+
+        if response.status_code == 304 and entry:
+            entry["expires_at"] = now + self.ttl_for(key)
+            self._write_entry(key, entry)
+            self._count(hit=True)
+            return self._to_response(entry)
+
+        self._count(hit=False)
+        if response.status_code in (200, 404):
+            ttl = self.ttl_for(key) if response.status_code == 200 else self.negative_ttl
+            self._write_entry(key, {
+                "url": response.url or key,
+                "status_code": response.status_code,
+                "reason": response.reason,
+                "headers": {
+                    name: response.headers[name]
+                    for name in ("ETag", "Last-Modified", "Content-Type")
+                    if name in response.headers
+                },
+                "body": response.text,
+                "stored_at": now,
+                "expires_at": now + ttl
+            })
+        return response
+
+    def memoize(self, key: str, compute: Callable[[], object], is_negative: Callable[[object], bool] = None):
+        """
+        Caches the JSON-serializable result of a non-HTTP client call (e.g. the TVDB
+        library) under a synthetic key such as 'tvdb://series/123/episodes'.
+        A result of None is treated as an error and never cached.
+        """
+        entry = self._read_entry(key)
+        now = time.time()
+        if entry and entry["expires_at"] > now:
+            self._count(hit=True)
+            return entry["value"]
+
+        self._count(hit=False)
+        value = compute()
+        if value is not None:
+            negative = is_negative(value) if is_negative else False
+            ttl = self.negative_ttl if negative else self.ttl_for(key)
+            self._write_entry(key, {"value": value, "stored_at": now, "expires_at": now + ttl})
+        return value
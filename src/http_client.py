@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+import random
+import threading
+import time
+from typing import Optional
+
+import requests
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket: allows `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blocks until a token is available, then consumes it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimitedClient(object):
+    """Pooled requests session with a shared token bucket and retry with backoff on 429/5xx."""
+
+    def __init__(self,
+                 headers: Optional[dict] = None,
+                 requests_per_second: float = 40,
+                 max_retries: int = 5,
+                 backoff_base: float = 0.5,
+                 timeout: float = 30,
+                 pool_size: int = 16,
+                 cache=None
+                 ):
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+        self.limiter = TokenBucket(requests_per_second)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.timeout = timeout
+        self.cache = cache
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> None:
+        """Sleeps for Retry-After if the server sent one, otherwise exponential backoff with jitter."""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        try:
+            delay = float(retry_after) if retry_after is not None else None
+        except ValueError:
+            delay = None
+        if delay is None:
+            delay = self.backoff_base * (2 ** attempt) * (0.5 + random.random())
+        time.sleep(delay)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends a request under the rate limit, retrying transient failures."""
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                self._backoff(attempt)
+                continue
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                return response
+            self._backoff(attempt, response)
+        return response
+
+    def _get(self, url: str, params: Optional[dict] = None, **kwargs) -> requests.Response:
+        return self.request("GET", url, params=params, **kwargs)
+
+    def get(self, url: str, params: Optional[dict] = None, **kwargs) -> requests.Response:
+        """GET through the response cache when one is attached, otherwise straight to the network."""
+        if self.cache is not None:
+            return self.cache.fetch(self._get, url, params=params, **kwargs)
+        return self._get(url, params=params, **kwargs)
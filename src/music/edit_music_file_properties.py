@@ -4,6 +4,7 @@ import io
 import json
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 from PIL import Image
 from alive_progress import alive_bar
@@ -13,15 +14,8 @@ from mutagen.flac import FLAC, Picture
 from mutagen.id3 import (
     ID3, TIT2, TPE1, TPE2, TALB, TRCK, TYER, TDRC, TCON, COMM, APIC, TPOS, error
 )
-import mutagen
-from mutagen.flac import FLAC
-from mutagen.easyid3 import EasyID3
-from mutagen.id3 import ID3NoHeaderError
 from mutagen.mp3 import MP3
 from mutagen.mp4 import MP4, MP4Cover
-from mutagen.easymp4 import EasyMP4
-
-from utilities_music import generate_audio_file_print_string
 
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -40,13 +34,220 @@ BRIGHT = Style.BRIGHT
 # Supported file extensions
 IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
 AUDIO_EXTENSIONS = ('.mp3', '.flac', '.m4a')
+# Tag writes are small file rewrites, bound by I/O
+TAG_EDIT_MAX_WORKERS = 8
+
+
+# ---------------------------------------------------------------------------
+# Tag transactions
+# ---------------------------------------------------------------------------
+
+# Canonical field -> MP3 frame / FLAC Vorbis key / M4A atom
+ID3_FRAMES = {
+    'title': TIT2, 'artist': TPE1, 'albumartist': TPE2, 'album': TALB,
+    'date': TDRC, 'tracknumber': TRCK, 'discnumber': TPOS,
+}
+VORBIS_KEYS = {
+    'title': 'title', 'artist': 'artist', 'albumartist': 'albumartist', 'album': 'album',
+    'date': 'date', 'tracknumber': 'tracknumber', 'discnumber': 'discnumber', 'comment': 'comment',
+}
+MP4_KEYS = {
+    'title': '\xa9nam', 'artist': '\xa9ART', 'albumartist': 'aART', 'album': '\xa9alb',
+    'date': '\xa9day', 'tracknumber': 'trkn', 'discnumber': 'disk', 'comment': '\xa9cmt',
+}
+# Extra keys cleared alongside a field so stale duplicates do not survive an edit
+VORBIS_ALIASES = {
+    'date': ('year', 'originaldate', 'originalyear'),
+    'discnumber': ('disc', 'disctotal', 'totaldiscs'),
+    'comment': ('COMMENT',),
+}
+
+
+def _open_tags(filepath):
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext == '.mp3':
+        audio = MP3(filepath, ID3=ID3)
+    elif ext == '.flac':
+        audio = FLAC(filepath)
+    elif ext == '.m4a':
+        audio = MP4(filepath)
+    else:
+        raise ValueError(f"unsupported file type: {ext}")
+    if audio.tags is None:
+        audio.add_tags()
+    return ext, audio
+
+
+def _read_field(ext, audio, field):
+    """Current value of a canonical field as a string, or None."""
+    if ext == '.mp3':
+        if field == 'comment':
+            frames = audio.tags.getall('COMM')
+        else:
+            frames = audio.tags.getall(ID3_FRAMES[field].__name__)
+            if not frames and field == 'date':
+                frames = audio.tags.getall('TYER')
+        return str(frames[0].text[0]) if frames and frames[0].text else None
+    if ext == '.flac':
+        values = audio.get(VORBIS_KEYS[field])
+        return values[0] if values else None
+    values = audio.tags.get(MP4_KEYS[field])
+    if not values:
+        return None
+    value = values[0]
+    if isinstance(value, tuple):
+        number, total = value
+        return f"{number}/{total}" if total else str(number)
+    return str(value)
+
+
+def _read_field_aliases(ext, audio, field):
+    """
+    Other values a field may be stored under, for keep predicates: the FLAC date
+    and year keys. (mutagen already merges an MP3's TYER into TDRC on load.)
+    """
+    if ext == '.flac' and field == 'date':
+        return audio.get('date', [])[1:] + audio.get('year', [])
+    return []
+
+
+def _write_field(ext, audio, field, value):
+    """Replaces a canonical field (None removes it) in an opened file, without saving."""
+    if ext == '.mp3':
+        if field == 'comment':
+            audio.tags.delall('COMM')
+            if value:
+                audio.tags.add(COMM(encoding=3, lang='eng', desc='', text=value))
+            return
+        frame = ID3_FRAMES[field]
+        audio.tags.delall(frame.__name__)
+        if field == 'date':
+            audio.tags.delall('TYER')
+            audio.tags.delall('TDAT')
+        if value:
+            audio.tags.add(frame(encoding=3, text=value))
+            if field == 'date':
+                audio.tags.add(TYER(encoding=3, text=value))
+    elif ext == '.flac':
+        key = VORBIS_KEYS[field]
+        for stale_key in (key,) + VORBIS_ALIASES.get(field, ()):
+            if stale_key in audio:
+                del audio[stale_key]
+        if value:
+            audio[key] = [value]
+            if field == 'date':
+                audio['year'] = [value]
+            elif field == 'discnumber' and '/' in value:
+                audio['disctotal'] = [value.split('/')[1]]
+    else:
+        key = MP4_KEYS[field]
+        if key in audio.tags:
+            del audio.tags[key]
+        if value:
+            if field in ('tracknumber', 'discnumber'):
+                number, _, total = value.partition('/')
+                audio.tags[key] = [(int(number), int(total) if total else 0)]
+            else:
+                audio.tags[key] = [value]
+
+
+def _apply_tag_edits(filepath, edits, dry_run):
+    """
+    Worker: opens a file once, replays its staged edits against the current tags,
+    and saves once if anything actually changed. Returns (filepath, changes, error)
+    where changes is a list of (field, old, new).
+    """
+    try:
+        ext, audio = _open_tags(filepath)
+        original = {field: _read_field(ext, audio, field) for field, _, _ in edits}
+        aliases = {field: _read_field_aliases(ext, audio, field) for field in original}
+        working = dict(original)
+        for field, value, keep in edits:
+            # keep sees the stored value and its aliases until an earlier edit replaces them
+            candidates = [working[field]] + aliases[field]
+            if keep is not None and any(keep(candidate) for candidate in candidates):
+                continue
+            working[field] = str(value) if value not in (None, '') else None
+            aliases[field] = []
+        changes = [(field, original[field], working[field]) for field in original if working[field] != original[field]]
+        if changes and not dry_run:
+            for field, _, new in changes:
+                _write_field(ext, audio, field, new)
+            audio.save()
+        return filepath, changes, None
+    except Exception as e:
+        return filepath, [], e
+
+
+class TagTransaction:
+    """
+    Collects tag edits from any number of operations and applies them together:
+    each file is opened once, edits are replayed in staging order against its
+    current tags, no-op edits are dropped, and the remaining changes are saved in
+    a single write per file on a thread pool. commit(dry_run=True) reports the
+    per-file diff without writing anything.
+    """
+
+    def __init__(self):
+        self.edits = {}
+
+    def set(self, filepath, field, value, keep=None):
+        """Stages field=value (None or '' removes the field). keep(current) -> True leaves the field as is."""
+        if field not in VORBIS_KEYS:
+            raise ValueError(f"unknown tag field: {field}")
+        self.edits.setdefault(filepath, []).append((field, value, keep))
+
+    def commit(self, dry_run=False, max_workers=TAG_EDIT_MAX_WORKERS, report_filepath=None):
+        """Applies (or, with dry_run, only diffs) every staged edit; returns {'changed', 'unchanged', 'failed'}."""
+        results = {'changed': {}, 'unchanged': [], 'failed': {}}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_apply_tag_edits, filepath, edits, dry_run) for filepath, edits in self.edits.items()]
+            for future in futures:
+                filepath, changes, failure = future.result()
+                if failure:
+                    results['failed'][filepath] = failure
+                    print(f"{RED}{BRIGHT}Failed to update{RESET} {os.path.basename(filepath)}: {failure}")
+                elif changes:
+                    results['changed'][filepath] = changes
+                    summary = ", ".join(f"{field}: {old!r} -> {new!r}" for field, old, new in changes)
+                    verb = "Would update" if dry_run else "Updated"
+                    print(f"{GREEN}{BRIGHT}{verb}{RESET} {os.path.basename(filepath)}: {summary}")
+                else:
+                    results['unchanged'].append(filepath)
+
+        print(f"{BLUE}{BRIGHT}{'Dry run' if dry_run else 'Tag edits'}:{RESET} {len(results['changed']):,} changed, "
+              f"{len(results['unchanged']):,} unchanged, {len(results['failed']):,} failed")
+        if report_filepath:
+            with open(report_filepath, 'w', encoding='utf-8') as f:
+                for filepath, changes in results['changed'].items():
+                    f.write(f"{filepath}\n")
+                    for field, old, new in changes:
+                        f.write(f"    {field}: {old!r} -> {new!r}\n")
+        if not dry_run:
+            self.edits = {}
+        return results
+
+
+def _stage_or_commit(transaction, stage):
+    """Runs stage(tx) on the caller's transaction, or on a new one that is committed immediately."""
+    if transaction is not None:
+        stage(transaction)
+        return None
+    transaction = TagTransaction()
+    stage(transaction)
+    return transaction.commit()
+
+
+def _audio_files(directory):
+    return [os.path.join(directory, filename) for filename in os.listdir(directory)
+            if filename.lower().endswith(AUDIO_EXTENSIONS)]
 
 
 # ---------------------------------------------------------------------------
 # Disc / Part-of-Set
 # ---------------------------------------------------------------------------
 
-def set_part_of_set(directory: str, disc_number: int, total_discs: int = None) -> None:
+def set_part_of_set(directory: str, disc_number: int, total_discs: int = None, transaction=None):
     """
     Write the "Part of a Set" (disc number) tag to every supported audio file
     in *directory*.
@@ -63,6 +264,8 @@ def set_part_of_set(directory: str, disc_number: int, total_discs: int = None) -
         total_discs:  Total number of discs in the set (optional).
                       When supplied the tag is written as "disc/total" for
                       MP3 and FLAC, and as a proper tuple for M4A.
+        transaction:  Stage the edits into this TagTransaction instead of
+                      writing them immediately.
     """
     if not os.path.isdir(directory):
         print(f"{RED}{BRIGHT}Directory does not exist{RESET}: {directory}")
@@ -72,46 +275,10 @@ def set_part_of_set(directory: str, disc_number: int, total_discs: int = None) -
     if total_discs is not None:
         disc_str = f"{disc_number}/{total_discs}"
 
-    for filename in os.listdir(directory):
-        if not filename.lower().endswith(AUDIO_EXTENSIONS):
-            continue
-
-        filepath = os.path.join(directory, filename)
-        ext = os.path.splitext(filename)[1].lower()
-
-        try:
-            if ext == '.mp3':
-                audio = MP3(filepath, ID3=ID3)
-                if audio.tags is None:
-                    audio.add_tags()
-                audio.tags.delall('TPOS')
-                audio.tags.add(TPOS(encoding=3, text=disc_str))
-                audio.save()
-
-            elif ext == '.flac':
-                audio = FLAC(filepath)
-                # Clear both common spellings before writing
-                for key in ('discnumber', 'disc', 'disctotal', 'totaldiscs'):
-                    if key in audio:
-                        del audio[key]
-                audio['discnumber'] = [disc_str]
-                if total_discs is not None:
-                    audio['disctotal'] = [str(total_discs)]
-                audio.save()
-
-            elif ext == '.m4a':
-                audio = MP4(filepath)
-                if audio.tags is None:
-                    audio.add_tags()
-                total = total_discs if total_discs is not None else 0
-                audio['disk'] = [(disc_number, total)]
-                audio.save()
-
-            label = f"disc {disc_str}"
-            print(f"{GREEN}{BRIGHT}Updated part-of-set{RESET} to {YELLOW}{label}{RESET} for: {filename}")
-
-        except Exception as e:
-            print(f"{RED}{BRIGHT}Failed to update part-of-set{RESET} for {filename}: {e}")
+    def stage(tx):
+        for filepath in _audio_files(directory):
+            tx.set(filepath, 'discnumber', disc_str)
+    return _stage_or_commit(transaction, stage)
 
 
 # ---------------------------------------------------------------------------
@@ -170,139 +337,41 @@ def rename_playlist_albums(music_playlist_dir):
 # Single-field setters (whole-directory)
 # ---------------------------------------------------------------------------
 
-def rename_album(directory, name):
-    for filename in os.listdir(directory):
-        if filename.lower().endswith(AUDIO_EXTENSIONS):
-            filepath = os.path.join(directory, filename)
-            try:
-                if filename.lower().endswith('.mp3'):
-                    audio = MP3(filepath, ID3=ID3)
-                    audio['TALB'] = TALB(encoding=3, text=name)
-                    audio.save()
-                elif filename.lower().endswith('.flac'):
-                    audio = FLAC(filepath)
-                    audio['album'] = name
-                    audio.save()
-                elif filename.lower().endswith('.m4a'):
-                    audio = EasyMP4(filepath)
-                    audio['album'] = name
-                    audio.save()
-                print(f"{GREEN}{BRIGHT}Updated album{RESET} for: {filename}")
-            except Exception as e:
-                print(f"{RED}{BRIGHT}Failed to update{RESET} {filename}: {e}")
+def rename_album(directory, name, transaction=None):
+    def stage(tx):
+        for filepath in _audio_files(directory):
+            tx.set(filepath, 'album', name)
+    return _stage_or_commit(transaction, stage)
 
 
-def rename_artist(directory, artist_name):
-    for filename in os.listdir(directory):
-        if filename.lower().endswith(AUDIO_EXTENSIONS):
-            filepath = os.path.join(directory, filename)
-            try:
-                if filename.lower().endswith('.mp3'):
-                    audio = MP3(filepath, ID3=ID3)
-                    audio['TPE1'] = TPE1(encoding=3, text=artist_name)
-                    audio['TPE2'] = TPE2(encoding=3, text=artist_name)
-                    audio.save()
-                elif filename.lower().endswith('.flac'):
-                    audio = FLAC(filepath)
-                    audio['artist'] = artist_name
-                    audio['albumartist'] = artist_name
-                    audio.save()
-                elif filename.lower().endswith('.m4a'):
-                    audio = EasyMP4(filepath)
-                    audio['artist'] = artist_name
-                    audio['albumartist'] = artist_name
-                    audio.save()
-                print(f"{GREEN}{BRIGHT}Updated artist and album artist{RESET} for: {filename}")
-            except Exception as e:
-                print(f"{RED}{BRIGHT}Failed to update{RESET} {filename}: {e}")
+def rename_artist(directory, artist_name, transaction=None):
+    def stage(tx):
+        for filepath in _audio_files(directory):
+            tx.set(filepath, 'artist', artist_name)
+            tx.set(filepath, 'albumartist', artist_name)
+    return _stage_or_commit(transaction, stage)
 
 
-def rename_comment(directory, comment_text):
+def rename_comment(directory, comment_text, transaction=None):
     """
     Update (or remove) the comment metadata for MP3, FLAC, and M4A files.
     Pass None or an empty string to remove the comment.
     """
-    for filename in os.listdir(directory):
-        if not filename.lower().endswith(AUDIO_EXTENSIONS):
-            continue
+    def stage(tx):
+        for filepath in _audio_files(directory):
+            tx.set(filepath, 'comment', comment_text)
+    return _stage_or_commit(transaction, stage)
 
-        filepath = os.path.join(directory, filename)
-        try:
-            if filename.lower().endswith('.mp3'):
-                audio = MP3(filepath, ID3=ID3)
-                audio.tags.delall('COMM')
-                if comment_text:
-                    audio['COMM'] = COMM(encoding=3, lang='eng', desc='', text=comment_text)
-                audio.save()
-
-            elif filename.lower().endswith('.flac'):
-                audio = FLAC(filepath)
-                for key in ('comment', 'COMMENT'):
-                    if key in audio:
-                        del audio[key]
-                if comment_text:
-                    audio['comment'] = [comment_text]
-                audio.save()
-
-            elif filename.lower().endswith('.m4a'):
-                audio = EasyMP4(filepath)
-                if '\xa9cmt' in audio:
-                    del audio['\xa9cmt']
-                if comment_text:
-                    audio['\xa9cmt'] = [comment_text]
-                audio.save()
 
-            action = "Removed" if not comment_text else "Updated"
-            print(f"{action} comment for: {filename}")
-
-        except Exception as e:
-            print(f"{RED}{BRIGHT}Failed to update comment{RESET} for {filename}: {e}")
-
-
-def rename_year_and_date(directory, year_text):
+def rename_year_and_date(directory, year_text, transaction=None):
     """
     Update or remove the year/release-date tags for all supported audio files.
     Pass None or an empty string to remove the tags.
     """
-    for filename in os.listdir(directory):
-        if filename.lower().endswith(AUDIO_EXTENSIONS):
-            filepath = os.path.join(directory, filename)
-            try:
-                if filename.lower().endswith('.mp3'):
-                    audio = MP3(filepath, ID3=ID3)
-                    audio.tags.delall('TYER')
-                    audio.tags.delall('TDRC')
-                    audio.tags.delall('TDAT')
-                    if year_text:
-                        audio['TDRC'] = TDRC(encoding=3, text=year_text)
-                        audio['TYER'] = TYER(encoding=3, text=year_text)
-                    audio.save()
-
-                elif filename.lower().endswith('.flac'):
-                    audio = FLAC(filepath)
-                    for tag in ('date', 'year', 'originaldate', 'originalyear'):
-                        if tag in audio:
-                            del audio[tag]
-                    if year_text:
-                        audio['date'] = [year_text]
-                        audio['year'] = [year_text]
-                    audio.save()
-
-                elif filename.lower().endswith('.m4a'):
-                    audio = EasyMP4(filepath)
-                    for tag in ('date', 'year'):
-                        if tag in audio:
-                            del audio[tag]
-                    if year_text:
-                        audio['date'] = [year_text]
-                        audio['year'] = [year_text]
-                    audio.save()
-
-                action = "Removed" if not year_text else "Updated"
-                print(f"{action} year/date for: {filename}")
-
-            except Exception as e:
-                print(f"{RED}{BRIGHT}Failed to update year/date{RESET} for {filename}: {e}")
+    def stage(tx):
+        for filepath in _audio_files(directory):
+            tx.set(filepath, 'date', year_text)
+    return _stage_or_commit(transaction, stage)
 
 
 # ---------------------------------------------------------------------------
@@ -330,7 +399,14 @@ def rename_OTSs(ost_soundtrack):
             bar()
 
 
-def set_track_numbers(album_directory: str) -> None:
+def _parse_track_number(value):
+    if value is None:
+        return None
+    m = re.search(r'(\d+)', str(value))
+    return int(m.group(1)) if m else None
+
+
+def set_track_numbers(album_directory: str, transaction=None):
     """
     Set track numbers in metadata for audio files in an album folder.
     Files are sorted by filename and tagged sequentially.
@@ -352,94 +428,26 @@ def set_track_numbers(album_directory: str) -> None:
         print(f"{YELLOW}No audio files found{RESET} in: {album_directory}")
         return
 
-    def _parse_track_number(value):
-        if value is None:
-            return None
-        if isinstance(value, (list, tuple)):
-            candidate = value[0]
-            if isinstance(candidate, (list, tuple)):
-                candidate = candidate[0]
-            try:
-                return int(candidate)
-            except (ValueError, TypeError):
-                pass
-        s = str(value)
-        m = re.search(r'(\d+)', s)
-        if not m:
-            return None
-        try:
-            return int(m.group(1))
-        except ValueError:
-            return None
-
     total_tracks = len(audio_files)
 
-    with alive_bar(len(audio_files), title="Tagging track numbers") as bar:
+    def stage(tx):
         for index, filename in enumerate(audio_files, start=1):
-            filepath = os.path.join(album_directory, filename)
-            ext = os.path.splitext(filename)[1].lower()
-
-            try:
-                track_num = None
-                changed = False
-
-                if ext == '.mp3':
-                    audio = MP3(filepath, ID3=ID3)
-                    if audio.tags is not None and 'TRCK' in audio.tags:
-                        existing = (
-                            audio.tags['TRCK'].text[0]
-                            if hasattr(audio.tags['TRCK'], 'text') and audio.tags['TRCK'].text
-                            else str(audio.tags['TRCK'])
-                        )
-                        track_num = _parse_track_number(existing)
-                    if track_num is None:
-                        if audio.tags is None:
-                            audio.add_tags()
-                        audio.tags.add(TRCK(encoding=3, text=str(index)))
-                        audio.save()
-                        track_num = index
-                        changed = True
-
-                elif ext == '.flac':
-                    audio = FLAC(filepath)
-                    existing = None
-                    if 'tracknumber' in audio:
-                        val = audio.get('tracknumber')
-                        existing = val[0] if isinstance(val, (list, tuple)) and val else val
-                    track_num = _parse_track_number(existing)
-                    if track_num is None:
-                        audio['tracknumber'] = str(index)
-                        audio.save()
-                        track_num = index
-                        changed = True
-
-                elif ext == '.m4a':
-                    audio = MP4(filepath)
-                    existing = audio.tags.get('trkn') if audio.tags is not None else None
-                    track_num = _parse_track_number(existing)
-                    if track_num is None:
-                        audio['trkn'] = [(index, total_tracks)]
-                        audio.save()
-                        track_num = index
-                        changed = True
-
-                verb = "Tagged" if changed else "Kept"
-                print(f"{GREEN}{BRIGHT}{verb}:{RESET} {filename} -> Track {track_num}")
-
-            except Exception as e:
-                print(f"{RED}{BRIGHT}Error tagging{RESET} {filename}: {e}")
-
-            bar()
+            # M4A stores (track, total); MP3 and FLAC get the bare number
+            value = f"{index}/{total_tracks}" if filename.lower().endswith('.m4a') else str(index)
+            tx.set(os.path.join(album_directory, filename), 'tracknumber', value,
+                   keep=lambda current: _parse_track_number(current) is not None)
+    return _stage_or_commit(transaction, stage)
 
 
 # ---------------------------------------------------------------------------
 # Folder-driven setters (walk the tree)
 # ---------------------------------------------------------------------------
 
-def set_year_from_folder(directory, bypass_dirs=None):
+def set_year_from_folder(directory, bypass_dirs=None, transaction=None):
     """
     Walk through a music directory and set year/release-date tags based on
-    the (YYYY) pattern in the parent folder name.
+    the (YYYY) pattern in the parent folder name. Only MP3 and FLAC files are
+    tagged; a year already present in any year/date tag is left alone.
     """
     if bypass_dirs is None:
         bypass_dirs = [r"W:\Music\MP3s_320\_Playlists"]
@@ -447,132 +455,62 @@ def set_year_from_folder(directory, bypass_dirs=None):
     bypass_dirs = [os.path.abspath(d).lower() for d in bypass_dirs]
 
     year_pattern = re.compile(r'\((\d{4})\)')
-    updated = skipped = failed = bypassed = 0
-
-    for root, _, files in os.walk(directory):
-        abs_root = os.path.abspath(root).lower()
-
-        if any(abs_root.startswith(b) for b in bypass_dirs):
-            print(f"{YELLOW}Bypassed directory:{RESET} {root}")
-            bypassed += 1
-            continue
+    bypassed = 0
 
-        match = year_pattern.search(os.path.basename(root))
-        if not match:
-            continue
+    def stage(tx):
+        nonlocal bypassed
+        for root, _, files in os.walk(directory):
+            abs_root = os.path.abspath(root).lower()
 
-        year = match.group(1)
-
-        for filename in files:
-            if not filename.lower().endswith(AUDIO_EXTENSIONS):
+            if any(abs_root.startswith(b) for b in bypass_dirs):
+                print(f"{YELLOW}Bypassed directory:{RESET} {root}")
+                bypassed += 1
                 continue
 
-            filepath = os.path.join(root, filename)
-            try:
-                already_correct = False
-
-                if filename.lower().endswith('.mp3'):
-                    audio = MP3(filepath, ID3=ID3)
-                    existing_years = []
-                    if 'TDRC' in audio.tags:
-                        existing_years.append(str(audio['TDRC']))
-                    if 'TYER' in audio.tags:
-                        existing_years.append(str(audio['TYER']))
-                    if any(year in y for y in existing_years):
-                        already_correct = True
-                    else:
-                        audio.tags.delall('TYER')
-                        audio.tags.delall('TDRC')
-                        audio['TYER'] = TYER(encoding=3, text=year)
-                        audio['TDRC'] = TDRC(encoding=3, text=year)
-                        audio.save()
-
-                elif filename.lower().endswith('.flac'):
-                    audio = FLAC(filepath)
-                    existing_years = []
-                    for tag in ('date', 'year'):
-                        if tag in audio:
-                            existing_years += audio[tag]
-                    if any(year in y for y in existing_years):
-                        already_correct = True
-                    else:
-                        for tag in ('date', 'year', 'originaldate', 'originalyear'):
-                            if tag in audio:
-                                del audio[tag]
-                        audio['date'] = [year]
-                        audio['year'] = [year]
-                        audio.save()
+            match = year_pattern.search(os.path.basename(root))
+            if not match:
+                continue
 
-                if already_correct:
-                    print(f"{YELLOW}Skipped{RESET} (already {year}): {generate_audio_file_print_string(filepath)}")
-                    skipped += 1
-                else:
-                    print(f"{GREEN}Updated{RESET} year/date to {YELLOW}{year}{RESET} for: {generate_audio_file_print_string(filepath)}")
-                    updated += 1
+            year = match.group(1)
+            for filename in files:
+                if filename.lower().endswith(('.mp3', '.flac')):
+                    tx.set(os.path.join(root, filename), 'date', year,
+                           keep=lambda current, year=year: bool(current) and year in current)
 
-            except Exception as e:
-                print(f"{RED}{BRIGHT}Failed{RESET} to update year/date for {filepath}: {e}")
-                failed += 1
+    results = _stage_or_commit(transaction, stage)
 
     print("\n" + "-" * 60)
-    print(f"{GREEN}Updated:{RESET} {updated}")
-    print(f"{YELLOW}Skipped (already correct):{RESET} {skipped}")
+    if results is not None:
+        print(f"{GREEN}Updated:{RESET} {len(results['changed'])}")
+        print(f"{YELLOW}Skipped (already correct):{RESET} {len(results['unchanged'])}")
     print(f"{YELLOW}Bypassed directories:{RESET} {bypassed}")
-    print(f"{RED}Failed:{RESET} {failed}")
+    if results is not None:
+        print(f"{RED}Failed:{RESET} {len(results['failed'])}")
     print("-" * 60)
+    return results
 
 
-def set_artist_from_folder(directory):
-    for filename in os.listdir(directory):
-        if filename.lower().endswith(AUDIO_EXTENSIONS):
-            filepath = os.path.join(directory, filename)
-            grandparent = os.path.basename(os.path.dirname(os.path.abspath(directory)))
-            if not grandparent:
-                grandparent = os.path.basename(os.path.abspath(directory))
-            artist_from_path = grandparent.strip()
-            try:
-                if filename.lower().endswith('.mp3'):
-                    audio = MP3(filepath, ID3=ID3)
-                    audio['TPE1'] = TPE1(encoding=3, text=artist_from_path)
-                    audio['TPE2'] = TPE2(encoding=3, text=artist_from_path)
-                    audio.save()
-                elif filename.lower().endswith('.flac'):
-                    audio = FLAC(filepath)
-                    audio['artist'] = artist_from_path
-                    audio['albumartist'] = artist_from_path
-                    audio.save()
-                elif filename.lower().endswith('.m4a'):
-                    audio = EasyMP4(filepath)
-                    audio['artist'] = artist_from_path
-                    audio['albumartist'] = artist_from_path
-                    audio.save()
-                print(f"{GREEN}{BRIGHT}Updated artist and album artist{RESET} to {YELLOW}{artist_from_path}{RESET} for: {filename}")
-            except Exception as e:
-                print(f"{RED}{BRIGHT}Failed to update{RESET} {filename}: {e}")
+def set_artist_from_folder(directory, transaction=None):
+    grandparent = os.path.basename(os.path.dirname(os.path.abspath(directory)))
+    if not grandparent:
+        grandparent = os.path.basename(os.path.abspath(directory))
+    artist_from_path = grandparent.strip()
 
+    def stage(tx):
+        for filepath in _audio_files(directory):
+            tx.set(filepath, 'artist', artist_from_path)
+            tx.set(filepath, 'albumartist', artist_from_path)
+    return _stage_or_commit(transaction, stage)
 
-def set_album_from_folder(directory):
-    for filename in os.listdir(directory):
-        if filename.lower().endswith(AUDIO_EXTENSIONS):
-            filepath = os.path.join(directory, filename)
-            parent = os.path.basename(os.path.abspath(directory))
-            album_from_path = ')'.join(parent.split(')')[1:]).strip() if ')' in parent else parent.strip()
-            try:
-                if filename.lower().endswith('.mp3'):
-                    audio = MP3(filepath, ID3=ID3)
-                    audio['TALB'] = TALB(encoding=3, text=album_from_path)
-                    audio.save()
-                elif filename.lower().endswith('.flac'):
-                    audio = FLAC(filepath)
-                    audio['album'] = album_from_path
-                    audio.save()
-                elif filename.lower().endswith('.m4a'):
-                    audio = EasyMP4(filepath)
-                    audio['album'] = album_from_path
-                    audio.save()
-                print(f"{GREEN}{BRIGHT}Updated album{RESET} to {YELLOW}{album_from_path}{RESET} for: {filename}")
-            except Exception as e:
-                print(f"{RED}{BRIGHT}Failed to update{RESET} {filename}: {e}")
+
+def set_album_from_folder(directory, transaction=None):
+    parent = os.path.basename(os.path.abspath(directory))
+    album_from_path = ')'.join(parent.split(')')[1:]).strip() if ')' in parent else parent.strip()
+
+    def stage(tx):
+        for filepath in _audio_files(directory):
+            tx.set(filepath, 'album', album_from_path)
+    return _stage_or_commit(transaction, stage)
 
 
 # ---------------------------------------------------------------------------
@@ -600,7 +538,7 @@ def clean_flac_titles(directory):
                 print(f"{RED}{BRIGHT}Error processing{RESET} {filename}: {e}")
 
 
-def update_titles_from_filename(directory):
+def update_titles_from_filename(directory, transaction=None):
     """
     Update tags in FLAC and MP3 files from their filenames.
 
@@ -623,56 +561,33 @@ def update_titles_from_filename(directory):
         r"\d{1,2}-\d{1,2}\s+(.*)\.(?:flac|mp3)$", re.IGNORECASE
     )
 
-    # canonical key -> (FLAC/Vorbis key, EasyID3 key)
-    KEYMAP = {
-        "title":       ("TITLE", "title"),
-        "artist":      ("ARTIST", "artist"),
-        "album":       ("ALBUM", "album"),
-        "date":        ("DATE", "date"),
-        "tracknumber": ("TRACKNUMBER", "tracknumber"),
-    }
-
-    for root, _, files in os.walk(directory):
-        for file in files:
-            ext = os.path.splitext(file)[1].lower()
-            if ext not in (".flac", ".mp3"):
-                continue
-
-            tags = {}
-            m = rich_pattern.search(file)
-            if m:
-                track, artist, year, album, title = (g.strip() for g in m.groups())
-                tags = {"tracknumber": track, "artist": artist, "date": year,
-                        "album": album, "title": title}
-            elif (m := aat_pattern.search(file)):
-                artist, album, track, title = (g.strip() for g in m.groups())
-                tags = {"artist": artist, "album": album,
-                        "tracknumber": track, "title": title}
-            elif (m := simple_pattern.search(file)):
-                tags = {"title": m.group(1).strip()}
-
-            if not tags:
-                print(f"{YELLOW}{BRIGHT}Skipping{RESET} {file}, does not match expected pattern")
-                continue
-
-            filepath = os.path.join(root, file)
-            is_flac = ext == ".flac"
-            if is_flac:
-                audio = FLAC(filepath)
-            else:
-                try:
-                    audio = EasyID3(filepath)
-                except ID3NoHeaderError:
-                    audio = mutagen.File(filepath, easy=True)
-                    audio.add_tags()
-
-            for canon, value in tags.items():
-                flac_key, id3_key = KEYMAP[canon]
-                audio[flac_key if is_flac else id3_key] = value
-            audio.save()
-
-            summary = ", ".join(f"{k}={v}" for k, v in tags.items())
-            print(f"{GREEN}{BRIGHT}Updated{RESET}: {file} -> {summary}")
+    def stage(tx):
+        for root, _, files in os.walk(directory):
+            for file in files:
+                ext = os.path.splitext(file)[1].lower()
+                if ext not in (".flac", ".mp3"):
+                    continue
+
+                tags = {}
+                m = rich_pattern.search(file)
+                if m:
+                    track, artist, year, album, title = (g.strip() for g in m.groups())
+                    tags = {"tracknumber": track, "artist": artist, "date": year,
+                            "album": album, "title": title}
+                elif (m := aat_pattern.search(file)):
+                    artist, album, track, title = (g.strip() for g in m.groups())
+                    tags = {"artist": artist, "album": album,
+                            "tracknumber": track, "title": title}
+                elif (m := simple_pattern.search(file)):
+                    tags = {"title": m.group(1).strip()}
+
+                if not tags:
+                    print(f"{YELLOW}{BRIGHT}Skipping{RESET} {file}, does not match expected pattern")
+                    continue
+
+                for field, value in tags.items():
+                    tx.set(os.path.join(root, file), field, value)
+    return _stage_or_commit(transaction, stage)
 
 
 def update_audiobook_mp3_titles(directory):
@@ -723,6 +638,13 @@ def search_for_missing_properties(root_dir):
 if __name__ == "__main__":
     dir_custom = r"G:\Music\MP3s_320\Ice Cube\(1992) THE PREDATOR"
 
+    # Batch several edits into one write per file (dry_run=True only reports the diff):
+    # tx = TagTransaction()
+    # set_album_from_folder(dir_custom, transaction=tx)
+    # set_year_from_folder(dir_custom, transaction=tx)
+    # set_track_numbers(dir_custom, transaction=tx)
+    # tx.commit(dry_run=True)
+
     # rename_album(dir_custom, "The Wall")
     # rename_comment(dir_custom, '')
 
@@ -2,8 +2,13 @@
 
 import os
 import io
+import json
+import hashlib
 import subprocess
 import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
 from PIL import Image
@@ -12,9 +17,10 @@ from colorama import Fore, Style
 from mutagen import File
 from mutagen.flac import FLAC, Picture
 from mutagen.id3 import (
-    ID3, TIT2, TPE1, TPE2, TALB, TRCK, TCON, COMM, APIC, error
+    TIT2, TPE1, TPE2, TALB, TRCK, TCON, COMM, APIC
 )
 from mutagen.mp3 import MP3
+from mutagen.easyid3 import EasyID3
 from mutagen.mp4 import MP4, MP4Cover
 
 import sys
@@ -43,10 +49,228 @@ IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
 # **.m4a is already correctly included here.**
 AUDIO_EXTENSIONS = ('.mp3', '.flac', '.m4a')
 
-def embed_album_covers(base_directory, override_cover=False):
-    def find_image_in_dir(directory):
+# More orphans than this share of the manifest means the source is probably unavailable, not deleted
+ORPHAN_REMOVAL_MAX_FRACTION = 0.5
+ENCODE_MANIFEST_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'output', 'music', 'encode_manifest.json'))
+# Each worker drives one single-threaded LAME encode
+ENCODE_MAX_WORKERS = os.cpu_count() or 4
+COVER_CACHE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'output', 'cache', 'covers'))
+# Normalized covers kept in memory; the on-disk cache handles reuse across runs
+COVER_CACHE_MAX_ENTRIES = 8
+# Cover writes are tag rewrites, bound by file I/O
+COVER_MAX_WORKERS = 8
+
+
+class EncodeManifest:
+    """
+    The MP3 mirror's source of truth, per source library: {source root: {relative
+    source path: {"size", "mtime", "audio", "tags", "outputs": {bitrate: output
+    path}}}}. "audio" and "tags" fingerprint the audio stream and the text tags
+    separately, so a sync can tell re-encodes from retags. Saves are atomic so an
+    interrupted run loses nothing.
+    """
+
+    def __init__(self, filepath: str = ENCODE_MANIFEST_PATH, save_every: int = 50):
+        self.filepath = filepath
+        self.save_every = save_every
+        self.pending = 0
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                self.sources = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.sources = {}
+
+    def entries(self, source_root: str) -> dict:
+        return self.sources.setdefault(os.path.normcase(os.path.abspath(source_root)), {})
+
+    def _touch(self) -> None:
+        self.pending += 1
+        if self.pending >= self.save_every:
+            self.save()
+
+    def record(self, source_root: str, rel_path: str, bitrate: int, file_out: str) -> None:
+        entry = self.entries(source_root).setdefault(rel_path, {'outputs': {}})
+        entry['outputs'][str(bitrate)] = file_out
+        self._touch()
+
+    def record_source(self, source_root: str, rel_path: str, signature: dict) -> None:
+        """Stores the source's size, mtime, audio and tag fingerprints once its outputs match it."""
+        self.entries(source_root).setdefault(rel_path, {'outputs': {}}).update(signature)
+        self._touch()
+
+    def remove(self, source_root: str, rel_path: str) -> None:
+        self.entries(source_root).pop(rel_path, None)
+        self._touch()
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        tmp_filepath = f"{self.filepath}.tmp"
+        with open(tmp_filepath, 'w', encoding='utf-8') as f:
+            json.dump(self.sources, f, ensure_ascii=False)
+        os.replace(tmp_filepath, self.filepath)
+        self.pending = 0
+
+
+def _text_tags(filepath: str) -> dict:
+    """The source's text tags in mutagen's format-neutral 'easy' form."""
+    audio = File(filepath, easy=True)
+    if audio is None or not audio.tags:
+        return {}
+    return {key.lower(): [str(value) for value in values] for key, values in audio.tags.items()}
+
+
+def _audio_fingerprint(filepath: str) -> str:
+    """
+    Identifies the audio stream independently of its tags: the FLAC STREAMINFO MD5
+    when present, otherwise a hash of the file without its ID3 tags (MP3) or of its
+    stream parameters (other formats).
+    """
+    audio = File(filepath)
+    if audio is None:
+        raise ValueError("unsupported audio file")
+    if isinstance(audio, FLAC) and audio.info.md5_signature:
+        return f"flac:{audio.info.md5_signature:032x}"
+    if isinstance(audio, MP3):
+        start = audio.tags.size if audio.tags else 0
+        digest = hashlib.sha1()
+        with open(filepath, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            f.seek(max(end - 128, 0))
+            if f.read(3) == b'TAG':
+                end -= 128
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = f.read(min(1 << 20, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+        return f"mp3:{digest.hexdigest()}"
+    info = audio.info
+    return "stream:" + ":".join(str(getattr(info, name, '')) for name in ('length', 'bitrate', 'sample_rate', 'channels'))
+
+
+def _source_signature(file_in: str, size: int, mtime: float) -> tuple:
+    """Worker: (file_in, signature, error) where signature fingerprints audio and tags separately."""
+    try:
+        tags = _text_tags(file_in)
+        tags_hash = hashlib.sha1(json.dumps(tags, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+        return file_in, {'size': size, 'mtime': mtime, 'audio': _audio_fingerprint(file_in), 'tags': tags_hash}, None
+    except Exception as e:
+        return file_in, None, str(e)
+
+
+def _retag_outputs(file_in: str, outputs: list) -> tuple:
+    """Worker: rewrites the outputs' text tags from the source in place, without re-encoding."""
+    try:
+        tags = _text_tags(file_in)
+    except Exception as e:
+        return file_in, [], str(e)
+    done, error = [], None
+    for bitrate, file_out in outputs:
+        try:
+            try:
+                output_tags = EasyID3(file_out)
+            except Exception:
+                output_tags = EasyID3()
+            for key in list(output_tags.keys()):
+                if key not in tags:
+                    del output_tags[key]
+            for key, values in tags.items():
+                if key in EasyID3.valid_keys:
+                    output_tags[key] = values
+            output_tags.save(file_out, v2_version=3)
+            done.append((bitrate, file_out))
+        except Exception as e:
+            error = f"{file_out}: {e}"
+    return file_in, done, error
+
+
+def _encode_source(file_in: str, outputs: list) -> tuple:
+    """
+    Worker: one ffmpeg run decodes the source once and fans out to every requested
+    (bitrate, output path). Outputs are written as .part files and renamed only on
+    success, so a killed run never leaves a truncated MP3 behind.
+    """
+    cmd = ['ffmpeg', '-nostdin', '-y', '-i', file_in]
+    for bitrate, file_out in outputs:
+        os.makedirs(os.path.dirname(file_out), exist_ok=True)
+        cmd += ['-ab', f'{bitrate}k', '-map_metadata', '0', '-id3v2_version', '3', '-f', 'mp3', file_out + '.part']
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except OSError as e:
+        return file_in, [], str(e)
+    done = []
+    for bitrate, file_out in outputs:
+        if result.returncode == 0 and os.path.isfile(file_out + '.part'):
+            os.replace(file_out + '.part', file_out)
+            done.append((bitrate, file_out))
+        elif os.path.exists(file_out + '.part'):
+            os.remove(file_out + '.part')
+    error = None
+    if result.returncode != 0:
+        stderr_lines = result.stderr.decode('utf-8', 'replace').strip().splitlines()
+        error = stderr_lines[-1] if stderr_lines else f"ffmpeg exited with code {result.returncode}"
+    return file_in, done, error
+
+class AlbumCoverCache:
+    """
+    Normalized (RGB JPEG) cover bytes keyed by the SHA-1 of the source image, on
+    disk and in a small in-memory LRU, so each distinct cover goes through PIL
+    once, not once per track, per disc or per run.
+    """
+
+    def __init__(self, cache_dir: str = COVER_CACHE_DIR, max_entries: int = COVER_CACHE_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.covers = OrderedDict()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _normalize(image_bytes: bytes) -> bytes:
+        with Image.open(BytesIO(image_bytes)) as img:
+            # Baseline RGB JPEGs are embedded as-is instead of being re-compressed
+            if img.format == 'JPEG' and img.mode == 'RGB':
+                return image_bytes
+            img_buffer = io.BytesIO()
+            img.convert('RGB').save(img_buffer, format='JPEG')
+            return img_buffer.getvalue()
+
+    def get(self, image_path: str) -> bytes:
+        with open(image_path, 'rb') as f:
+            image_bytes = f.read()
+        key = hashlib.sha1(image_bytes).hexdigest()
+        if key in self.covers:
+            self.covers.move_to_end(key)
+            return self.covers[key]
+        cache_path = os.path.join(self.cache_dir, f"{key}.jpg")
+        if os.path.isfile(cache_path):
+            with open(cache_path, 'rb') as f:
+                cover = f.read()
+        else:
+            cover = self._normalize(image_bytes)
+            with open(cache_path, 'wb') as f:
+                f.write(cover)
+        self.covers[key] = cover
+        if len(self.covers) > self.max_entries:
+            self.covers.popitem(last=False)
+        return cover
+
+
+def embed_album_covers(base_directory, override_cover=False, max_workers=COVER_MAX_WORKERS, cover_cache=None):
+    """
+    Embeds each album directory's cover into its tracks. The cover is located and
+    normalized once per album (via the cover cache), then written to every track
+    by parallel writers that each open their file only once. Pending writes are
+    bounded, so only a few albums' covers are held in memory at a time.
+    """
+    cover_cache = cover_cache or AlbumCoverCache()
+
+    def find_image_in_dir(directory, filenames):
         candidate = None
-        for filename in os.listdir(directory):
+        for filename in filenames:
             if filename.lower().endswith(IMAGE_EXTENSIONS):
                 if "back" in filename and candidate is not None:
                     continue
@@ -55,15 +279,9 @@ def embed_album_covers(base_directory, override_cover=False):
                     return os.path.join(directory, filename)
         return candidate
 
-    def convert_image_to_jpeg(image_path):
-        img = Image.open(image_path).convert('RGB')
-        img_buffer = io.BytesIO()
-        img.save(img_buffer, format='JPEG')
-        return img_buffer.getvalue(), 'image/jpeg'
-
     def has_embedded_image(audio):
         if isinstance(audio, MP3):
-            return any(key.startswith("APIC") for key in audio.tags.keys())
+            return audio.tags is not None and any(key.startswith("APIC") for key in audio.tags.keys())
         elif isinstance(audio, FLAC):
             return len(audio.pictures) > 0
         # This handles both .mp4 and .m4a
@@ -109,51 +327,55 @@ def embed_album_covers(base_directory, override_cover=False):
             return None
         return None
 
-    def embed_image(audio_path, image_path):
-        try:
-            audio = File(audio_path, easy=False)
-            if audio is None:
-                print(f"❌ Unsupported file: {audio_path}")
-                return
+    def embed_image(audio_path, image_data, mime_type='image/jpeg'):
+        """Writer: one open per track; skips tracks that already have a cover unless overriding."""
+        audio = File(audio_path, easy=False)
+        if audio is None:
+            print(f"❌ Unsupported file: {audio_path}")
+            return
 
-            if has_embedded_image(audio) and not override_cover:
-                return
+        if has_embedded_image(audio) and not override_cover:
+            return
 
-            image_data, mime_type = convert_image_to_jpeg(image_path)
+        if isinstance(audio, MP3):
+            if audio.tags is None:
+                audio.add_tags()
+            audio.tags.delall("APIC")
+            audio.tags.add(APIC(
+                encoding=3,
+                mime=mime_type,
+                type=3,
+                desc='Cover',
+                data=image_data
+            ))
+            audio.save(v2_version=3)
 
-            if isinstance(audio, MP3):
-                audio = MP3(audio_path, ID3=ID3)
-                try:
-                    audio.add_tags()
-                except error:
-                    pass
-                audio.tags.delall("APIC")
-                audio.tags.add(APIC(
-                    encoding=3,
-                    mime=mime_type,
-                    type=3,
-                    desc='Cover',
-                    data=image_data
-                ))
-                audio.save(v2_version=3)
-
-            elif isinstance(audio, FLAC):
-                picture = Picture()
-                picture.data = image_data
-                picture.type = 3
-                picture.mime = mime_type
-                picture.desc = "Cover"
-                audio.clear_pictures()
-                audio.add_picture(picture)
-                audio.save()
+        elif isinstance(audio, FLAC):
+            picture = Picture()
+            picture.data = image_data
+            picture.type = 3
+            picture.mime = mime_type
+            picture.desc = "Cover"
+            audio.clear_pictures()
+            audio.add_picture(picture)
+            audio.save()
 
-            # This handles both .mp4 and .m4a
-            elif isinstance(audio, MP4):
-                audio['covr'] = [MP4Cover(image_data, imageformat=MP4Cover.FORMAT_JPEG)]
-                audio.save()
-            print(f"✅ Embedded cover into: {audio_path}")
+        # This handles both .mp4 and .m4a
+        elif isinstance(audio, MP4):
+            audio['covr'] = [MP4Cover(image_data, imageformat=MP4Cover.FORMAT_JPEG)]
+            audio.save()
+        print(f"✅ Embedded cover into: {audio_path}")
+
+    # Bound queued writes: each pending write pins its album's cover bytes
+    in_flight = threading.BoundedSemaphore(max_workers * 4)
+    failed = []
 
+    def on_written(audio_path, future):
+        in_flight.release()
+        try:
+            future.result()
         except Exception as e:
+            failed.append(audio_path)
             print(f"❌ Failed to embed cover into: {audio_path} ({e})")
 
     # === MAIN LOGIC ===
@@ -161,101 +383,223 @@ def embed_album_covers(base_directory, override_cover=False):
         print("Invalid base directory.")
         return
 
-    # for dirpath, _, filenames in tqdm(os.walk(base_directory), desc="Processing Files", unit=""):
-    
-    for dirpath, _, filenames in os.walk(base_directory):
-        audio_files = [f for f in filenames if f.lower().endswith(AUDIO_EXTENSIONS)]
-        if not audio_files:
-            continue
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for dirpath, _, filenames in os.walk(base_directory):
+            audio_files = [f for f in filenames if f.lower().endswith(AUDIO_EXTENSIONS)]
+            if not audio_files:
+                continue
 
-        cover_path = os.path.join(dirpath, "cover.jpg")
-        image_path = find_image_in_dir(dirpath)
+            cover_path = os.path.join(dirpath, "cover.jpg")
+            image_path = find_image_in_dir(dirpath, filenames)
+
+            # Step 1: Try to find or create a cover.jpg
+            if not image_path:
+                embedded_image = None
+                for audio_file in audio_files:
+                    file_path = os.path.join(dirpath, audio_file)
+                    try:
+                        audio = File(file_path, easy=False)
+                    except Exception:
+                        continue
+                    if audio and has_embedded_image(audio):
+                        embedded_image = extract_image_from_audio(audio)
+                        if embedded_image:
+                            try:
+                                square_img = make_square_image(embedded_image)
+                                with open(cover_path, 'wb') as f:
+                                    f.write(square_img)
+                                image_path = cover_path
+                            except Exception as e:
+                                print(f"❌ Failed to write cover.jpg: {e}")
+                            break
+
+            if not image_path and os.path.exists(cover_path):
+                image_path = cover_path
+
+            if not image_path:
+                continue
 
-        # Step 1: Try to find or create a cover.jpg
-        if not image_path:
-            embedded_image = None
-            for audio_file in audio_files:
-                file_path = os.path.join(dirpath, audio_file)
-                try:
-                    audio = File(file_path, easy=False)
-                except Exception:
-                    continue
-                if audio and has_embedded_image(audio):
-                    embedded_image = extract_image_from_audio(audio)
-                    if embedded_image:
-                        try:
-                            square_img = make_square_image(embedded_image)
-                            with open(cover_path, 'wb') as f:
-                                f.write(square_img)
-                            image_path = cover_path
-                        except Exception as e:
-                            print(f"❌ Failed to write cover.jpg: {e}")
-                        break
-
-        if not image_path and os.path.exists(cover_path):
-            image_path = cover_path
-
-        if not image_path:
-            continue
-
-        for audio_file in audio_files:
-            file_path = os.path.join(dirpath, audio_file)
+            # Step 2: Normalize the album's cover once, then fan out to the tracks
             try:
-                audio = File(file_path, easy=False)
-                if not audio:
-                    continue
-            except Exception:
+                image_data = cover_cache.get(image_path)
+            except Exception as e:
+                print(f"❌ Failed to load cover {image_path}: {e}")
                 continue
-            if not has_embedded_image(audio) or override_cover:
-                embed_image(file_path, image_path)
+            for audio_file in audio_files:
+                audio_path = os.path.join(dirpath, audio_file)
+                in_flight.acquire()
+                future = executor.submit(embed_image, audio_path, image_data)
+                future.add_done_callback(lambda future, audio_path=audio_path: on_written(audio_path, future))
+
+    if failed:
+        print(f"❌ Failed to embed covers into {len(failed):,} tracks under {base_directory}")
+
+
+def _output_present(file_out):
+    """
+    A recorded output is trusted while it exists and is not empty. Its size and
+    mtime are not compared: cover embedding legitimately rewrites the mirror.
+    """
+    try:
+        return os.path.getsize(file_out) > 0
+    except OSError:
+        return False
 
 
-def encode_multiple_bitrates(parent_dir='V:\\Music\\FLAC', bitrates_desired=[320]):
-    """Encodes audio files in the specified parent directory to multiple bitrates."""
+def _safe_output_path(parent_dir, bitrate_desired):
+    drive = os.path.splitdrive(parent_dir)[0]
+    path_parts = parent_dir.split(os.sep)
+    safe_tail = path_parts[3:] if len(path_parts) > 3 else []
+    output_base = os.path.join(drive + os.sep, "Music", f'MP3s_{bitrate_desired}', *safe_tail)
+    return output_base
+
+
+def encode_multiple_bitrates(parent_dir='V:\\Music\\FLAC', bitrates_desired=[320], max_workers=ENCODE_MAX_WORKERS,
+                             manifest_filepath=ENCODE_MANIFEST_PATH, delete_orphans=True, force_orphan_removal=False,
+                             verify_outputs=False):
+    """
+    Syncs the MP3 mirrors of the specified parent directory, one per bitrate.
+
+    The encode manifest maps every source (size, mtime, audio and tag fingerprints)
+    to its outputs. Sources whose size and mtime are unchanged are skipped without
+    being opened; changed sources are fingerprinted and then re-encoded if their
+    audio changed, or retagged in place if only their tags did. Outputs of sources
+    that were deleted or renamed are removed. Encodes run in parallel on a process
+    pool, one ffmpeg invocation per source covering every needed bitrate.
+
+    Recorded outputs of unchanged sources are trusted without a stat; pass
+    verify_outputs=True to check every one and regenerate any deleted or emptied.
+
+    Orphans are only removed after a complete scan, and not at all when most of
+    the manifest would go at once (an unmounted or flaky drive looks exactly like
+    a deleted library) unless force_orphan_removal is set.
+    """
+    if not os.path.isdir(parent_dir):
+        print(f'{RED}{BRIGHT}Source directory is not available{RESET}: {parent_dir}')
+        return
     os.chdir(os.path.join(os.path.realpath(os.path.dirname(__file__)), "..", "bin"))
-
-    def check_directory(file_out):
-        path = os.path.dirname(file_out)
-        if not os.path.exists(path):
-            os.makedirs(path)
-
-    def safe_output_path(parent_dir, bitrate_desired):
-        drive = os.path.splitdrive(parent_dir)[0]
-        path_parts = parent_dir.split(os.sep)
-        safe_tail = path_parts[3:] if len(path_parts) > 3 else []
-        output_base = os.path.join(drive + os.sep, "Music", f'MP3s_{bitrate_desired}', *safe_tail)
-        return output_base
-
-    def re_encode_tracks(parent_dir, bitrate_desired=128, desired_extension='.mp3'):
-        # **MODIFICATION HERE**: Added '.m4a' to the list of file extensions to process.
-        filepaths = read_alexandria([parent_dir], ['.mp3', '.flac', '.m4a'])
-        output_base = safe_output_path(parent_dir, bitrate_desired)
-
-        for file_in in filepaths:
-            rel_path = os.path.relpath(file_in, start=parent_dir)
+    manifest = EncodeManifest(manifest_filepath)
+    entries = manifest.entries(parent_dir)
+    output_bases = {bd: _safe_output_path(parent_dir, bd) for bd in bitrates_desired}
+
+    def scan_sources():
+        """Returns (sources, complete); complete is False if any part of the tree could not be read."""
+        scan_errors = []
+        sources = {}
+        for root, _, files in os.walk(parent_dir, onerror=scan_errors.append):
+            for filename in files:
+                # **MODIFICATION HERE**: Added '.m4a' to the list of file extensions to process.
+                if not filename.lower().endswith(('.mp3', '.flac', '.m4a')):
+                    continue
+                file_in = os.path.join(root, filename)
+                try:
+                    file_stat = os.stat(file_in)
+                except OSError as e:
+                    scan_errors.append(e)
+                    continue
+                sources[os.path.relpath(file_in, start=parent_dir)] = (file_in, file_stat.st_size, file_stat.st_mtime)
+        for e in scan_errors[:5]:
+            print(f'{RED}{BRIGHT}Scan error{RESET}: {e}')
+        return sources, not scan_errors
+
+    def remove_orphans(sources, complete):
+        orphans = [rel_path for rel_path in entries if rel_path not in sources]
+        if orphans and not complete:
+            print(f'{YELLOW}{BRIGHT}Source scan was incomplete; keeping {len(orphans):,} possibly orphaned outputs{RESET}')
+            return 0
+        if orphans and not force_orphan_removal and (
+                not sources or len(orphans) > len(entries) * ORPHAN_REMOVAL_MAX_FRACTION):
+            print(f'{YELLOW}{BRIGHT}Refusing to remove outputs of {len(orphans):,} of {len(entries):,} sources{RESET} '
+                  f'(source drive missing files?); pass force_orphan_removal=True if they were really deleted')
+            return 0
+        for rel_path in orphans:
+            for file_out in entries[rel_path].get('outputs', {}).values():
+                if os.path.isfile(file_out):
+                    os.remove(file_out)
+                    print(f'{RED}{BRIGHT}Removed orphan{RESET} {file_out}')
+            manifest.remove(parent_dir, rel_path)
+        return len(orphans)
+
+    def fingerprint(sources):
+        """Signatures for sources that are new or whose size/mtime changed since the last sync."""
+        changed = [(rel_path, *source) for rel_path, source in sources.items()
+                   if (entries.get(rel_path, {}).get('size'), entries.get(rel_path, {}).get('mtime')) != source[1:]]
+        signatures = {}
+        if not changed:
+            return signatures
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_source_signature, file_in, size, mtime): rel_path
+                       for rel_path, file_in, size, mtime in changed}
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Fingerprinting", unit="track"):
+                file_in, signature, error = future.result()
+                if error:
+                    print(f'{RED}{BRIGHT}Failed to read{RESET} {file_in}: {error}')
+                    continue
+                signatures[futures[future]] = signature
+        return signatures
+
+    def plan_jobs(sources, signatures):
+        jobs = []
+        for rel_path, (file_in, _, _) in sources.items():
+            entry = entries.get(rel_path, {})
+            recorded = entry.get('outputs', {})
+            signature = signatures.get(rel_path)
+            check_recorded = verify_outputs or signature is not None
             rel_path_no_ext = os.path.splitext(rel_path)[0]
-            file_out = os.path.join(output_base, rel_path_no_ext + desired_extension)
+            targets = {int(bd): file_out for bd, file_out in recorded.items()}
+            targets.update({bd: os.path.join(base, rel_path_no_ext + '.mp3') for bd, base in output_bases.items()})
 
-            if os.path.isfile(file_out):
+            if signature and entry.get('audio') and signature['audio'] != entry['audio']:
+                # Audio changed: every derived output is stale
+                jobs.append(('encode', file_in, rel_path, sorted(targets.items()), signature))
                 continue
 
-            check_directory(file_out)
-
-            print(f'{GREEN}{BRIGHT}Re-encoding{RESET} {generate_audio_file_print_string(file_in)} '
-                  f'in {YELLOW}{BRIGHT}{bitrate_desired}kbps{RESET} to: {os.path.dirname(file_out)}')
-            cmd = [
-                'ffmpeg',
-                '-i', file_in,
-                '-ab', f'{bitrate_desired}k',
-                '-map_metadata', '0',
-                '-id3v2_version', '3',
-                file_out
-            ]
-            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            outputs = []
+            for bd, file_out in targets.items():
+                if str(bd) in recorded:
+                    # Recorded outputs are only checked for changed sources (or when verifying)
+                    if not check_recorded or _output_present(file_out):
+                        continue
+                # Outputs from before the manifest existed are adopted, not re-encoded
+                elif _output_present(file_out):
+                    manifest.record(parent_dir, rel_path, bd, file_out)
+                    continue
+                outputs.append((bd, file_out))
+            if outputs:
+                jobs.append(('encode', file_in, rel_path, outputs, signature))
+            retag_outputs = sorted((int(bd), file_out) for bd, file_out in recorded.items()
+                                   if (int(bd), file_out) not in outputs)
+            if signature and entry.get('tags') and signature['tags'] != entry['tags'] and retag_outputs:
+                jobs.append(('retag', file_in, rel_path, retag_outputs, signature))
+            elif signature and not outputs:
+                manifest.record_source(parent_dir, rel_path, signature)
+        return jobs
+
+    def run_jobs(jobs):
+        if not jobs:
+            return
+        num_encodes = sum(1 for job in jobs if job[0] == 'encode')
+        print(f'{GREEN}{BRIGHT}Re-encoding{RESET} {num_encodes:,} tracks and {GREEN}{BRIGHT}retagging{RESET} '
+              f'{len(jobs) - num_encodes:,} in {YELLOW}{BRIGHT}{", ".join(f"{bd}kbps" for bd in bitrates_desired)}{RESET} '
+              f'with {max_workers} workers')
+        workers = {'encode': _encode_source, 'retag': _retag_outputs}
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(workers[kind], file_in, outputs): (kind, rel_path, outputs, signature)
+                       for kind, file_in, rel_path, outputs, signature in jobs}
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Syncing", unit="track"):
+                kind, rel_path, outputs, signature = futures[future]
+                file_in, done, error = future.result()
+                for bd, file_out in done:
+                    manifest.record(parent_dir, rel_path, bd, file_out)
+                if error:
+                    print(f'{RED}{BRIGHT}Failed to {kind}{RESET} {generate_audio_file_print_string(file_in)}: {error}')
+                elif signature:
+                    # Only a fully synced source gets its new signature, so failures are retried
+                    manifest.record_source(parent_dir, rel_path, signature)
 
     def copy_images(parent_dir, bitrate_desired):
         filepaths = read_alexandria([parent_dir], ['.jpeg', '.png', '.jpg'])
-        output_base = safe_output_path(parent_dir, bitrate_desired)
+        output_base = output_bases[bitrate_desired]
 
         for file_in in filepaths:
             rel_path = os.path.relpath(file_in, start=parent_dir)
@@ -264,19 +608,27 @@ def encode_multiple_bitrates(parent_dir='V:\\Music\\FLAC', bitrates_desired=[320
             if os.path.isfile(file_out):
                 continue
 
-            check_directory(file_out)
+            os.makedirs(os.path.dirname(file_out), exist_ok=True)
             shutil.copy2(file_in, file_out)
 
+    try:
+        sources, complete = scan_sources()
+        num_orphans = remove_orphans(sources, complete) if delete_orphans else 0
+        run_jobs(plan_jobs(sources, fingerprint(sources)))
+    finally:
+        manifest.save()
+    if num_orphans:
+        print(f'{YELLOW}{BRIGHT}Removed outputs of {num_orphans:,} deleted or renamed sources{RESET}')
     for bd in bitrates_desired:
-        re_encode_tracks(parent_dir, bitrate_desired=bd, desired_extension='.mp3')
         copy_images(parent_dir, bd)
-    remove_empty_folders([parent_dir])
+    remove_empty_folders([parent_dir] + [base for base in output_bases.values() if os.path.isdir(base)])
 
 
 if __name__ == "__main__":
 
     OVERWRITE_COVERS = False
     SKIP_REENCODE = False
+    VERIFY_OUTPUTS = False
 
     dirs_to_reencode = []
     if dirs_to_reencode == [] or SKIP_REENCODE:
@@ -286,7 +638,7 @@ if __name__ == "__main__":
     if not SKIP_REENCODE:
         for directory in dirs_to_reencode:
             embed_album_covers(directory, override_cover=OVERWRITE_COVERS)
-            encode_multiple_bitrates(directory, bitrates_desired=[320])
+            encode_multiple_bitrates(directory, bitrates_desired=[320], verify_outputs=VERIFY_OUTPUTS)
 
     dirs_embed_covers = []
     if dirs_embed_covers == []:
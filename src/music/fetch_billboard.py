@@ -9,6 +9,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utilities import (
     read_file_as_list
 )
+from music_tag_index import MusicTagIndex, MUSIC_TAG_INDEX_PATH
 
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'output', 'music')
@@ -92,6 +93,7 @@ def compare_artists(chart_artists: list[billboard.ArtistChart],
                     bool_print=True
                     ) -> None:
     chart_artist_names = [entry.artist for entry in chart_artists]
+    curr_artists = set(curr_artists)
     new_artists = [artist for artist in chart_artist_names if artist not in curr_artists]
     if new_artists:
         if bool_print: print(f"\n{MAGENTA}{BRIGHT}=== New Artists on Billboard Top 100 Artist Chart ==={RESET}")
@@ -107,7 +109,11 @@ if __name__ == "__main__":
     chart_tracks, artist_track_counts = fetch_billboard_top_100_tracks()
     chart_albums, artist_album_counts = fetch_billboard_albums_top_200_albums()
     chart_artists = fetch_billboard_top_100_artists_chart(bool_print=False)
-    curr_artists = read_file_as_list(os.path.join(OUTPUT_DIR, 'album_artists.txt'))
+    # Album artists straight from the tag index; the text export is the fallback
+    if os.path.exists(MUSIC_TAG_INDEX_PATH):
+        curr_artists = MusicTagIndex().album_artists()
+    else:
+        curr_artists = read_file_as_list(os.path.join(OUTPUT_DIR, 'album_artists.txt'))
     compare_artists(chart_artists, curr_artists)
 
 
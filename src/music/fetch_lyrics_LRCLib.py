@@ -1,22 +1,21 @@
+import json
 import os
-import pathlib
+import queue
 import random
 import requests
-import re
 import sys
-import time
-from mutagen import File
-from mutagen.mp3 import MP3
-from mutagen.id3 import ID3, ID3NoHeaderError
-from mutagen.flac import FLAC
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore, Style, init
 
 from utilities_music import (
     embed_lyrics,
     is_excluded_title,
     clear_comments,
-    has_embedded_plain_lyrics
+    LyricStatusIndex,
+    TagSnapshot
 )
+from lyrics_store import LyricsStore, LyricsProviderChain
 
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -24,6 +23,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utilities import (
     get_primary_root_directories
 )
+from http_cache import ResponseCache
+from http_client import RateLimitedClient
 
 # Initialize Colorama
 init(autoreset=True)
@@ -36,16 +37,28 @@ RESET = Style.RESET_ALL
 BRIGHT = Style.BRIGHT
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-MISSING_LOG_PATH = os.path.join(SCRIPT_DIR, "..", "..", "output", "music", "missing_LRCLib_lyrics.txt")
-if not os.path.exists(os.path.dirname(MISSING_LOG_PATH)):
-    os.makedirs(os.path.dirname(MISSING_LOG_PATH))
+STATUS_INDEX_PATH = os.path.join(SCRIPT_DIR, "..", "..", "output", "music", "lyric_status_index.json")
+PROGRESS_PATH = os.path.join(SCRIPT_DIR, "..", "..", "output", "music", "lyrics_LRCLib_progress.jsonl")
+os.makedirs(os.path.dirname(PROGRESS_PATH), exist_ok=True)
+HTTP_CACHE = ResponseCache(os.path.join(SCRIPT_DIR, "..", "..", "output", "cache", "http"))
+
+# LRCLib publishes no hard limit; stay polite with a shared limiter across workers
+LRCLIB_API_URL = "https://lrclib.net/api/get"
+LRCLIB_REQUESTS_PER_SECOND = 4
+LRCLIB_MAX_WORKERS = 4
+LRCLIB_CLIENT = RateLimitedClient(
+    headers={"User-Agent": "Alexandria Media Manager"},
+    requests_per_second=LRCLIB_REQUESTS_PER_SECOND,
+    pool_size=LRCLIB_MAX_WORKERS,
+    cache=HTTP_CACHE
+)
 
-def get_lyrics_LRCLib(track_name, artist_name, album_name, duration):
+def get_lyrics_LRCLib(track_name, artist_name, album_name, duration, base_url=LRCLIB_API_URL):
     """
     Fetches lyrics from LRCLib based on track signature.
     Duration must be in seconds and within ±2 seconds of the database record.
+    Thread-safe: all calls share one pooled, rate-limited client.
     """
-    base_url = "https://lrclib.net/api/get"
 
     params = {
         "track_name": track_name,
@@ -55,7 +68,7 @@ def get_lyrics_LRCLib(track_name, artist_name, album_name, duration):
     }
 
     try:
-        response = requests.get(base_url, params=params, timeout=10)
+        response = LRCLIB_CLIENT.get(base_url, params=params, timeout=10)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.HTTPError as err:
@@ -67,14 +80,80 @@ def get_lyrics_LRCLib(track_name, artist_name, album_name, duration):
         return f"An error occurred: {e}"
 
 
+def lrclib_provider(api_url: str = LRCLIB_API_URL):
+    """LRCLib as a lyrics store provider: a hit dict, None for a 404, or raises on errors."""
+    def fetch(title, artist, album, duration):
+        results = get_lyrics_LRCLib(title, artist, album, duration, base_url=api_url)
+        if isinstance(results, str):
+            raise RuntimeError(results)
+        if results is None:
+            return None
+        return {"synced": results.get("syncedLyrics"), "plain": results.get("plainLyrics")}
+    return fetch
+
+
+def genius_provider():
+    """
+    Genius as a fallback provider (plain lyrics only), or None when it is not
+    configured. Calls are serialized: the Genius client has its own backoff.
+    """
+    try:
+        from fetch_lyrics_genius import genius_provider as fetch_genius
+    except Exception as e:
+        print(f"{YELLOW}{BRIGHT}Genius unavailable, using LRCLib only:{RESET} {e}")
+        return None
+    genius_lock = threading.Lock()
+
+    def fetch(title, artist, album, duration):
+        with genius_lock:
+            return fetch_genius(title, artist, album, duration)
+    return fetch
+
+
+def build_provider_chain(store: LyricsStore, api_url: str = LRCLIB_API_URL, use_genius: bool = True) -> LyricsProviderChain:
+    """LRCLib first (synced lyrics), then Genius for plain lyrics."""
+    providers = [("lrclib", lrclib_provider(api_url))]
+    fetch_genius = genius_provider() if use_genius else None
+    if fetch_genius:
+        providers.append(("genius", fetch_genius))
+    return LyricsProviderChain(store, providers)
+
+
+def _fetch_worker(filepath, title, artist, album, duration, chain, results_queue):
+    """Fetch stage: the provider chain (store first, then network), handed to the writer stage."""
+    results = None
+    try:
+        hit, all_missed = chain.get(title, artist, album, duration)
+        results = hit if hit else (None if all_missed else "Lookup failed; will retry next run")
+    except Exception as e:
+        results = f"An error occurred: {e}"
+    finally:
+        results_queue.put(("lyrics", (filepath, title, artist, album, results)))
+
+
 def process_directory(input_dir: str,
                       fetch_lyrics: bool = True,
                       bypass_existing_synced: bool = True,
                       bypass_existing_plain: bool = True,
                       bypass_logged_missing: bool = True,
                       randomized_list: bool = False,
-                      max_lyrics_fetched: int = None):
-    """Recursively process MP3 and FLAC files."""
+                      max_lyrics_fetched: int = None,
+                      max_workers: int = LRCLIB_MAX_WORKERS,
+                      api_url: str = LRCLIB_API_URL,
+                      resume: bool = True,
+                      use_genius: bool = True,
+                      lyrics_store: LyricsStore = None):
+    """
+    Recursively process MP3 and FLAC files as a three-stage pipeline.
+
+    The producer (this thread) reads tags and decides which tracks need a lookup,
+    a pool of fetch workers runs the LRCLib-then-Genius provider chain (the lyrics
+    store answers first; LRCLib shares one rate limiter), and a single writer thread
+    embeds lyrics and writes sidecars. Misses are retried once their TTL expires.
+    Every finished track
+    is appended to a progress journal, so an interrupted or limited run resumes
+    where it stopped; the journal is removed once a full pass completes.
+    """
 
     filepaths = []
     for root, _, files in os.walk(input_dir):
@@ -82,132 +161,171 @@ def process_directory(input_dir: str,
             if file.lower().endswith((".mp3", ".flac")):
                 filepaths.append(os.path.join(root, file))
 
-    logged_missing_set = _load_logged_missing_lyrics() if bypass_logged_missing else None
+    chain = build_provider_chain(lyrics_store or LyricsStore(), api_url, use_genius)
+    completed_set = _load_progress() if resume else set()
+    status_index = LyricStatusIndex(STATUS_INDEX_PATH)
+    if completed_set:
+        print(f"{YELLOW}{BRIGHT}Resuming:{RESET} {len(completed_set):,} tracks already processed in the previous run")
+
+    counts = {"fetched": 0, "synced": 0, "plain": 0, "none": 0}
+    counts_lock = threading.Lock()
+    results_queue = queue.Queue()
+    # Bound tracks in flight so the producer never runs far ahead of the network
+    in_flight = threading.BoundedSemaphore(max_workers * 4)
+    progress_file = open(PROGRESS_PATH, "a", encoding="utf-8")
+
+    def count(key):
+        with counts_lock:
+            counts[key] += 1
+
+    progress_lock = threading.Lock()
+
+    def mark_done(filepath):
+        with progress_lock:
+            progress_file.write(json.dumps(filepath, ensure_ascii=False) + "\n")
+            progress_file.flush()
+
+    def writer():
+        """Writer stage: the only thread that modifies audio files, sidecars and logs."""
+        while True:
+            item = results_queue.get()
+            if item is None:
+                break
+            action, payload = item
+            filepath = payload[0]
+            try:
+                if action == "clear_comments":
+                    # The status is recorded after the write, against the file's new size/mtime
+                    _, status, details = payload
+                    clear_comments(filepath)
+                    status_index.update(filepath, status, **details)
+                    mark_done(filepath)
+                    continue
+                _, title, artist, album, results = payload
+                # Only settled tracks enter the journal; request errors are retried on resume
+                if _write_lyrics_result(filepath, title, results, count, status_index, chain):
+                    mark_done(filepath)
+            except Exception as e:
+                print(f"{RED}Error writing lyrics for {filepath}: {e}{RESET}")
+            finally:
+                in_flight.release()
+
+    def settle(filepath, status, clear_first=False, **details):
+        """Records a settled status; when comments must be cleared first, the writer does both."""
+        if not clear_first:
+            status_index.update(filepath, status, **details)
+            mark_done(filepath)
+            return
+        in_flight.acquire()
+        results_queue.put(("clear_comments", (filepath, status, details)))
+
+    writer_thread = threading.Thread(target=writer, daemon=True)
+    writer_thread.start()
 
-    num_lyrics_fetched = 0
-    num_synced_lyrics = 0
-    num_plaintext_lyrics = 0
-    num_no_lyrics = 0
     if randomized_list:
         random.shuffle(filepaths)
-    for idx, filepath in enumerate(filepaths):
-        if max_lyrics_fetched and num_lyrics_fetched >= max_lyrics_fetched:
-             print(f"{YELLOW}{BRIGHT}\nReached max lyrics fetched limit of {max_lyrics_fetched}, stopping processing.{RESET}")
-             break
-        print(f"\n{BRIGHT}{GREEN}Processing {idx+1:,}:{RESET} {filepath}")
-
-        # --- Metadata Extraction ---
-        try:
-            audio = File(filepath)
-            # Default to filename if title tag is missing
-            filename_stem = pathlib.Path(filepath).stem
-            
-            title = str(audio.get("TIT2", filename_stem))
-            # Mutagen's easy wrapper might return lists; handle raw ID3 vs EasyID3
-            if isinstance(title, list):
-                title = title[0]
-            
-            artist = str(audio.get("TPE1", "Unknown Artist"))
-            if isinstance(artist, list):
-                artist = artist[0]
-
-            album = str(audio.get("TALB", "Unknown Album"))
-            if isinstance(album, list):
-                album = album[0]
-
-            duration = int(audio.info.length) if audio and audio.info else 0
-
-        except Exception as e:
-            print(f"{YELLOW}Metadata read error ({e}), using filename{RESET}")
-            title = pathlib.Path(filepath).stem
-            artist = "Unknown Artist"
-            album = "Unknown Album"
-            duration = 0
-
-        print(f"{BLUE}Track:{RESET} {title} | {BLUE}Artist:{RESET} {artist} | "
-              f"{BLUE}Album:{RESET} {album} | {BLUE}Duration:{RESET} {duration}s")
-
-        # --- Check Existing Lyrics ---
-        
-        # Check for sidecar .lrc file or embedded synced lyrics
-        has_synced = _has_saved_synced_lyrics(filepath) or _has_embedded_synced_lyrics(filepath)
-        has_plain = has_embedded_plain_lyrics(filepath)
-
-        # Excluded titles
-        if is_excluded_title(title):
-            clear_comments(filepath)
-            print(f"{YELLOW}{BRIGHT}Skipping excluded title:{RESET} {title}")
-            num_no_lyrics += 1
-            continue
-
-        # Skip if synced exists (and bypass is on)
-        if bypass_existing_synced and has_synced:
-            print(f"{YELLOW}{BRIGHT}Synced lyrics exist (file or embedded), skipping:{RESET} {filepath}")
-            num_synced_lyrics += 1
-            continue
-        
-        item_tuple = (artist,album,title)
-        if bypass_logged_missing and logged_missing_set and item_tuple in logged_missing_set:
-            clear_comments(filepath)
-            print(f"{YELLOW}{BRIGHT}Previously logged missing lyrics, skipping fetch:{RESET} {title}")
-            num_no_lyrics += 1
-            continue
-
-        # Skip if plain exists (and bypass is on) - ONLY if we don't care about upgrading to synced
-        # Typically, if we want synced, we shouldn't skip just because plain exists.
-        # But per your logic:
-        if bypass_existing_plain and has_plain and not has_synced:
-            #  print(f"{YELLOW}{BRIGHT}Plain lyrics exist, skipping:{RESET} {filepath}")
-             num_plaintext_lyrics += 1
-             continue
-
-        # Duration validation
-        if duration == 0:
-            print(f"{YELLOW}{BRIGHT}Duration is 0, skipping fetch for:{RESET} {filepath}")
-            num_no_lyrics += 1
-            continue
-
-        # --- Fetching ---
-        
-        if fetch_lyrics:
-            results = get_lyrics_LRCLib(title, artist, album, duration)
-        else:
-            print(f"{YELLOW}{BRIGHT}Fetch disabled, skipping API call for:{RESET} {filepath}")
-            continue
-        
-        if not isinstance(results, dict):
-            # Handle error strings or None
-            if results is None:
-                print(f"{RED}No lyrics found.{RESET}")
-            else:
-                print(f"{RED}{results}{RESET}")
-            _log_missing_lyrics(title, artist, album)
-            continue
-
-        lyrics_plain = results.get('plainLyrics')
-        lyrics_synced = results.get('syncedLyrics')
-
-        lyrics_to_embed = lyrics_synced if lyrics_synced else lyrics_plain
-        
-        if lyrics_to_embed:
-            if lyrics_synced:
-                print(f"{GREEN}{BRIGHT}Fetched and embedding {YELLOW}synced{GREEN} lyrics{RESET}")
-                num_synced_lyrics += 1
-            else:
-                num_plaintext_lyrics += 1
-                print(f"{GREEN}{BRIGHT}Fetched and embedding {YELLOW}plain{GREEN} lyrics{RESET}")
-            
-            embed_lyrics(filepath, lyrics_to_embed)
-        else:
-             print(f"{RED}API returned entry but lyrics fields were empty.{RESET}")
-             _log_missing_lyrics(title, artist, album)
-             num_no_lyrics += 1
-             continue
-
-        _save_lyrics_in_target_directory(filepath, lyrics_plain, lyrics_synced)
-
-        time.sleep(random.uniform(1, 5))
-        num_lyrics_fetched += 1
+    # Lookups are counted as they are submitted; counts["fetched"] trails behind the writer
+    lookups_submitted = 0
+    stopped_early = False
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for idx, filepath in enumerate(filepaths):
+                if max_lyrics_fetched and lookups_submitted >= max_lyrics_fetched:
+                     print(f"{YELLOW}{BRIGHT}\nReached max lyrics fetched limit of {max_lyrics_fetched}, stopping processing.{RESET}")
+                     stopped_early = True
+                     break
+                if filepath in completed_set:
+                    continue
+
+                # --- Settled files: one stat, no tag parse ---
+                entry = status_index.lookup(filepath)
+                status = entry["status"] if entry else None
+                if status == "excluded" or (status == "synced" and bypass_existing_synced) \
+                        or (status == "plain" and bypass_existing_plain) \
+                        or (status == "missing" and bypass_logged_missing and chain.covers_missing(entry)):
+                    count("none" if status in ("excluded", "missing") else status)
+                    mark_done(filepath)
+                    continue
+                print(f"\n{BRIGHT}{GREEN}Processing {idx+1:,}:{RESET} {filepath}")
+
+                # --- Metadata Extraction (single tag parse) ---
+                snapshot = TagSnapshot(filepath)
+                if snapshot.error:
+                    print(f"{YELLOW}Metadata read error ({snapshot.error}), using filename{RESET}")
+                title, artist, album, duration = snapshot.title, snapshot.artist, snapshot.album, snapshot.duration
+
+                print(f"{BLUE}Track:{RESET} {title} | {BLUE}Artist:{RESET} {artist} | "
+                      f"{BLUE}Album:{RESET} {album} | {BLUE}Duration:{RESET} {duration}s")
+
+                # --- Check Existing Lyrics ---
+                
+                # Check for sidecar .lrc file or embedded synced lyrics
+                has_synced = _has_saved_synced_lyrics(filepath) or snapshot.has_synced_lyrics
+                has_plain = snapshot.has_plain_lyrics
+
+                # Excluded titles
+                if is_excluded_title(title):
+                    print(f"{YELLOW}{BRIGHT}Skipping excluded title:{RESET} {title}")
+                    count("none")
+                    settle(filepath, "excluded", clear_first=snapshot.has_comments)
+                    continue
+
+                # Skip if synced exists (and bypass is on)
+                if bypass_existing_synced and has_synced:
+                    print(f"{YELLOW}{BRIGHT}Synced lyrics exist (file or embedded), skipping:{RESET} {filepath}")
+                    count("synced")
+                    status_index.update(filepath, "synced")
+                    mark_done(filepath)
+                    continue
+                
+                if bypass_logged_missing and chain.is_settled_miss(title, artist, album, duration):
+                    print(f"{YELLOW}{BRIGHT}Previously logged missing lyrics, skipping fetch:{RESET} {title}")
+                    count("none")
+                    settle(filepath, "missing", clear_first=snapshot.has_comments, **chain.missing_details())
+                    continue
+
+                # Skip if plain exists (and bypass is on) - ONLY if we don't care about upgrading to synced
+                # Typically, if we want synced, we shouldn't skip just because plain exists.
+                # But per your logic:
+                if bypass_existing_plain and has_plain and not has_synced:
+                    #  print(f"{YELLOW}{BRIGHT}Plain lyrics exist, skipping:{RESET} {filepath}")
+                     count("plain")
+                     status_index.update(filepath, "plain")
+                     mark_done(filepath)
+                     continue
+
+                # Duration validation
+                if duration == 0:
+                    print(f"{YELLOW}{BRIGHT}Duration is 0, skipping fetch for:{RESET} {filepath}")
+                    count("none")
+                    mark_done(filepath)
+                    continue
+
+                # --- Fetching ---
+                
+                if not fetch_lyrics:
+                    print(f"{YELLOW}{BRIGHT}Fetch disabled, skipping API call for:{RESET} {filepath}")
+                    continue
+
+                in_flight.acquire()
+                executor.submit(_fetch_worker, filepath, title, artist, album, duration, chain, results_queue)
+                lookups_submitted += 1
+    finally:
+        results_queue.put(None)
+        writer_thread.join()
+        progress_file.close()
+        status_index.save()
+
+    # A full pass finished; the next run starts fresh (a limited run keeps its journal)
+    if not stopped_early and os.path.exists(PROGRESS_PATH):
+        os.remove(PROGRESS_PATH)
+
+    num_lyrics_fetched = counts["fetched"]
+    num_synced_lyrics = counts["synced"]
+    num_plaintext_lyrics = counts["plain"]
+    num_no_lyrics = counts["none"]
+    if not filepaths:
+        return
     print(f"\n{BRIGHT}{GREEN}Processing complete!{RESET}")
     print(f"Lyrics fetched: {num_lyrics_fetched:,}")
     print(f"Synced lyrics: {num_synced_lyrics:,} ({num_synced_lyrics/len(filepaths)*100:.2f}%)")
@@ -216,59 +334,57 @@ def process_directory(input_dir: str,
     _save_lyric_stats(len(filepaths), num_synced_lyrics, num_plaintext_lyrics, num_no_lyrics)
 
 
-# -------------------------------
-# Helper functions
-# -------------------------------
-
-def _has_embedded_synced_lyrics(filepath: str) -> bool:
+def _write_lyrics_result(filepath, title, results, count, status_index, chain):
     """
-    Checks if the file has embedded lyrics that contain LRC timestamps.
+    Writer stage for one track: embed lyrics and save sidecars, or record the miss.
+    Returns True once the track is settled (hit or miss); failed lookups return
+    False so a resumed run retries them.
     """
-    # Regex for LRC timestamp: [mm:ss.xx]
-    timestamp_pattern = re.compile(r'\[\d{2}:\d{2}\.\d{2}\]')
+    if not isinstance(results, dict):
+        # Handle error strings or None (the miss itself is already in the lyrics store)
+        if results is None:
+            print(f"{RED}No lyrics found:{RESET} {title}")
+            status_index.update(filepath, "missing", **chain.missing_details())
+            return True
+        print(f"{RED}{results}{RESET}")
+        return False
+
+    lyrics_plain = results.get('plain')
+    lyrics_synced = results.get('synced')
+
+    lyrics_to_embed = lyrics_synced if lyrics_synced else lyrics_plain
     
-    try:
-        if filepath.lower().endswith(".mp3"):
-            try:
-                audio = MP3(filepath, ID3=ID3)
-            except ID3NoHeaderError:
-                return False
-            
-            if not audio.tags:
-                return False
-
-            # Check USLT frames for timestamps
-            for frame in audio.tags.getall("USLT"):
-                if timestamp_pattern.search(str(frame)):
-                    return True
-
-        elif filepath.lower().endswith(".flac"):
-            audio = FLAC(filepath)
-            if "LYRICS" in audio:
-                for text in audio["LYRICS"]:
-                    if timestamp_pattern.search(text):
-                        return True
-    except Exception:
-        pass
+    if lyrics_to_embed:
+        if lyrics_synced:
+            print(f"{GREEN}{BRIGHT}Fetched and embedding {YELLOW}synced{GREEN} lyrics{RESET} for {title} ({results['provider']})")
+            count("synced")
+        else:
+            count("plain")
+            print(f"{GREEN}{BRIGHT}Fetched and embedding {YELLOW}plain{GREEN} lyrics{RESET} for {title} ({results['provider']})")
         
-    return False
+        embed_lyrics(filepath, lyrics_to_embed)
+    else:
+         print(f"{RED}API returned entry but lyrics fields were empty:{RESET} {title}")
+         count("none")
+         status_index.update(filepath, "missing", **chain.missing_details())
+         return True
+
+    _save_lyrics_in_target_directory(filepath, lyrics_plain, lyrics_synced)
+    status_index.update(filepath, "synced" if lyrics_synced else "plain")
+    count("fetched")
+    return True
 
 
+# -------------------------------
+# Helper functions
+# -------------------------------
+
 def _has_saved_synced_lyrics(filepath: str) -> bool:
     """Check if a corresponding .lrc file exists."""
     lrc_path = os.path.splitext(filepath)[0] + ".lrc"
     return os.path.exists(lrc_path)
 
 
-def _log_missing_lyrics(title: str, artist: str, album: str):
-    """Log missing tracks to a file."""
-    try:
-        with open(MISSING_LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(f"{artist} | {album} | {title}\n")
-    except Exception as e:
-        print(f"{RED}Could not write to log file: {e}{RESET}")
-
-
 def _save_lyrics_in_target_directory(filepath: str, plain_lyrics: str, synced_lyrics: str):
     """Save plain (.txt) and synced (.lrc) lyrics to the file's directory."""
     if not plain_lyrics and not synced_lyrics:
@@ -310,22 +426,17 @@ def _save_lyric_stats(total_music_files, synced_count, plain_count, no_lyrics_co
         print(f"{RED}Could not save lyric stats: {e}{RESET}")
 
 
-def _load_logged_missing_lyrics():
-    """Load previously logged missing lyrics into a set of tuples."""
-    missing_set = set()
-    if os.path.exists(MISSING_LOG_PATH):
-        try:
-            with open(MISSING_LOG_PATH, "r", encoding="utf-8") as f:
-                for line in f:
-                    parts = line.strip().split(" | ")
-                    if len(parts) == 3:
-                        artist = parts[0].strip()
-                        album = parts[1].strip()
-                        title = parts[2].strip()
-                        missing_set.add((artist, album, title))
-        except Exception as e:
-            print(f"{RED}Could not read log file: {e}{RESET}")
-    return missing_set
+def _load_progress():
+    """Load filepaths finished by an interrupted run."""
+    completed_set = set()
+    if os.path.exists(PROGRESS_PATH):
+        with open(PROGRESS_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    completed_set.add(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # Partially written line from a crash
+    return completed_set
 
 
 if __name__ == "__main__":
@@ -2,7 +2,6 @@ import os
 import difflib
 import pathlib
 import lyricsgenius
-from mutagen import File
 from mutagen.mp3 import MP3
 from mutagen.id3 import ID3, USLT, COMM
 from mutagen.flac import FLAC
@@ -14,7 +13,8 @@ import random
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from utilities import read_json
-from utilities_music import embed_lyrics, is_excluded_title, clear_comments, has_embedded_plain_lyrics
+from utilities_music import embed_lyrics, is_excluded_title, clear_comments, LyricStatusIndex, TagSnapshot
+from lyrics_store import LyricsStore, LyricsProviderChain
 
 # -------------------------------
 # Setup colors
@@ -33,6 +33,7 @@ MIN_LYRICS_LENGTH = 50                # Minimum characters for valid lyrics
 RECHECK_EXISTING = False              # True to re-fetch even if lyrics exist
 VOID_LYRIC_STRINGS = ["www.", ".com", "http://", "https://", 
                       "lyrics powered by", "PMEDIA","Downloaded from"]
+STATUS_INDEX_PATH = os.path.join(OUTPUT_DIR, "lyric_status_index.json")
 
 # -------------------------------
 # Genius API setup
@@ -100,7 +101,7 @@ def fetch_official_lyrics(title: str, artist: str, album: str, genius: lyricsgen
             print(f"{YELLOW}{BRIGHT}Rate limit hit, sleeping for {sleep_time:,} {'seconds' if sleep_time != 1 else 'second'}...{RESET}")
             time.sleep(sleep_time)  # Longer sleep on rate limit
             sleep_time *= 2  # Exponential backoff
-            fetch_official_lyrics(title, artist, album, genius, sleep_time)
+            return fetch_official_lyrics(title, artist, album, genius, sleep_time)
 
     except Exception as e:
         print(f"{RED}Error fetching lyrics:{RESET} {e}")
@@ -108,31 +109,12 @@ def fetch_official_lyrics(title: str, artist: str, album: str, genius: lyricsgen
 
     return ""
 
-# -------------------------------
-# Helper functions
-# -------------------------------
-
-
-def load_missing_lyrics_log():
-    """Load previously logged missing lyrics into a set of tuples."""
-    missing_set = set()
-    log_file = os.path.join(OUTPUT_DIR, "no_lyrics.txt")
-    if os.path.exists(log_file):
-        with open(log_file, "r", encoding="utf-8") as f:
-            for line in f:
-                parts = line.strip().split(" | ")
-                if len(parts) == 3:
-                    missing_set.add((parts[0], parts[1], parts[2]))
-    return missing_set
-
-
-def log_missing_lyrics(title: str, artist: str, album: str):
-    """Log songs that do not have official lyrics."""
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    log_file = os.path.join(OUTPUT_DIR, "no_lyrics.txt")
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(f"{title} | {artist} | {album}\n")
-    print(f"{YELLOW}{BRIGHT}Logged missing lyrics for:{RESET} {title}")
+def genius_provider(title: str, artist: str, album: str, duration: int = None):
+    """Genius as a lyrics store provider: plain lyrics, None for a miss, raises on errors."""
+    lyrics = fetch_official_lyrics(title, artist, album, genius)
+    if lyrics is None:
+        raise RuntimeError("Genius request failed")
+    return {"synced": None, "plain": lyrics} if lyrics else None
 
 
 # -------------------------------
@@ -147,8 +129,12 @@ def log_missing_lyrics(title: str, artist: str, album: str):
 def process_directory(input_dir: str,
                       bypass_existing: bool = True, 
                       save_to_file: bool = False,
-                      missing_lyrics_set: set = None):
-    """Recursively process MP3 and FLAC files in randomized order."""
+                      lyrics_store: LyricsStore = None):
+    """
+    Recursively process MP3 and FLAC files in randomized order. Lookups go through
+    the shared lyrics store first, so hits from any provider are reused and Genius
+    misses are only retried after their TTL.
+    """
     
     # Step 1: Gather all filepaths
     filepaths = []
@@ -160,53 +146,64 @@ def process_directory(input_dir: str,
     # Step 2: Randomize the full list
     random.shuffle(filepaths)
 
+    status_index = LyricStatusIndex(STATUS_INDEX_PATH)
+    chain = LyricsProviderChain(lyrics_store or LyricsStore(), [("genius", genius_provider)])
+
     # Step 3: Process in randomized order
     for filepath in filepaths:
         print(f"\n{BRIGHT}{GREEN}Processing:{RESET} {filepath}")
 
-        try:
-            audio = File(filepath)
-            title = str(audio.get("TIT2", pathlib.Path(filepath).stem))
-            artist = str(audio.get("TPE1", "Unknown Artist"))
-            album = str(audio.get("TALB", "Unknown Album"))
-        except Exception as e:
-            print(f"{YELLOW}Metadata read error ({e}), using filename{RESET}")
-            title = pathlib.Path(filepath).stem
-            artist = "Unknown Artist"
-            album = "Unknown Album"
-
-        # Previously logged missing lyrics
-        if not RECHECK_EXISTING and missing_lyrics_set and (title, artist, album) in missing_lyrics_set:
-            clear_comments(filepath)
+        # Settled files (valid lyrics or excluded) are skipped with one stat
+        entry = status_index.lookup(filepath)
+        if entry and (entry["status"] == "excluded" or (bypass_existing and entry["status"] in ("synced", "plain"))
+                      or (not RECHECK_EXISTING and chain.covers_missing(entry))):
+            continue
+
+        # Single tag parse answers metadata, lyric and comment questions
+        snapshot = TagSnapshot(filepath)
+        if snapshot.error:
+            print(f"{YELLOW}Metadata read error ({snapshot.error}), using filename{RESET}")
+        title, artist, album, duration = snapshot.title, snapshot.artist, snapshot.album, snapshot.duration
+
+        # Previously logged missing lyrics (still within the retry TTL)
+        if not RECHECK_EXISTING and chain.is_settled_miss(title, artist, album, duration):
+            if snapshot.has_comments:
+                clear_comments(filepath)
             print(f"{YELLOW}{BRIGHT}Previously logged missing lyrics, cleared comments:{RESET} {title}")
+            status_index.update(filepath, "missing", **chain.missing_details())
             continue
 
         # Excluded titles
         if is_excluded_title(title):
-            clear_comments(filepath)
+            if snapshot.has_comments:
+                clear_comments(filepath)
             print(f"{YELLOW}{BRIGHT}Skipping excluded song title and cleared comments:{RESET} {title}")
+            status_index.update(filepath, "excluded")
             continue
 
         # Check if file has invalid/void lyrics (PMEDIA, etc.)
-        lyrics_invalid = not has_embedded_plain_lyrics(filepath)
+        lyrics_invalid = not snapshot.has_plain_lyrics
         if bypass_existing and not lyrics_invalid:
             print(f"{YELLOW}{BRIGHT}Lyrics already exist and are valid, skipping:{RESET} {filepath}")
+            status_index.update(filepath, "synced" if snapshot.has_synced_lyrics else "plain")
             continue
 
-        if lyrics_invalid:
+        if lyrics_invalid and snapshot.has_comments:
             clear_comments(filepath)
             print(f"{YELLOW}{BRIGHT}Cleared comments/lyrics with void text for:{RESET} {filepath}")
 
-        # Fetch lyrics
-        lyrics = fetch_official_lyrics(title, artist, album, genius)
-        if lyrics is None:
+        # Fetch lyrics (store first; hits from any provider are reused)
+        hit, all_missed = chain.get(title, artist, album, duration)
+        if not hit and not all_missed:
             print(f"{RED}{BRIGHT}Fetch error{RESET} for {title}; {YELLOW}{BRIGHT}skipping without logging.{RESET}")
             continue
 
-        if not lyrics:
-            log_missing_lyrics(title, artist, album)
+        if not hit:
+            print(f"{YELLOW}{BRIGHT}Logged missing lyrics for:{RESET} {title}")
             clear_comments(filepath)
+            status_index.update(filepath, "missing", **chain.missing_details())
             continue
+        lyrics = hit["synced"] or hit["plain"]
 
         # Save to file if requested
         if save_to_file:
@@ -218,6 +215,8 @@ def process_directory(input_dir: str,
 
         # Embed into metadata
         embed_lyrics(filepath, lyrics)
+        status_index.update(filepath, "synced" if hit["synced"] else "plain")
+    status_index.save()
 
 
 # -------------------------------
@@ -228,12 +227,9 @@ def main():
     print(f"{BRIGHT}{GREEN}Starting recursive lyrics fetcher...{RESET}")
     print(f"{BLUE}Scanning directory:{RESET} {input_dir}")
 
-    missing_lyrics_set = load_missing_lyrics_log() if not RECHECK_EXISTING else set()
-    
     process_directory(input_dir, 
                       bypass_existing=not RECHECK_EXISTING, 
-                      save_to_file=False,
-                      missing_lyrics_set=missing_lyrics_set)
+                      save_to_file=False)
 
     print(f"\n{GREEN}{BRIGHT}All done!{RESET} Official lyrics have been saved, embedded, and missing songs logged.\n")
 
@@ -1,13 +1,12 @@
 import os
 import json
 import sys
-from mutagen import File
 from collections import defaultdict
-from tqdm import tqdm
 from colorama import Fore, Style, init
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "utils"))
 from map_media_type_to_drives import map_media_type_to_drives
+from music_tag_index import MusicTagIndex
 
 # Initialize colorama
 init(autoreset=True)
@@ -25,7 +24,8 @@ BRIGHT = Style.BRIGHT
 Description:
 
 This script scans a specified directory for .mp3 and .flac audio files,
-extracts their metadata (artist, album artist, album, title), and generates
+reads their metadata (artist, album artist, album, title) from the cached
+tag index (output/music/music_tag_index.db), and generates
 output files including:
 - A text file listing all unique artists.
 - A text file listing all unique album artists.
@@ -34,70 +34,30 @@ output files including:
 """
 
 
-def extract_metadata(filepath):
-    """Extract metadata from an audio file using mutagen."""
-    try:
-        audio = File(filepath, easy=True)
-        if not audio:
-            return None
-
-        artist = audio.get('artist', ['Unknown Artist'])[0]
-        album_artist = audio.get('albumartist', [artist])[0]
-        album = audio.get('album', ['Unknown Album'])[0]
-        title = audio.get('title', [os.path.basename(filepath)])[0]
-
-        return {
-            'artist': artist.strip(),
-            'album_artist': album_artist.strip(),
-            'album': album.strip(),
-            'title': title.strip()
-        }
-    except Exception as e:
-        print(f"{RED}{BRIGHT}Error reading {filepath}:{RESET} {e}")
-        return None
-
-
-def collect_music_data(base_dir, skip_dirs=None):
-    """Recursively collect artist, album, and track info from .mp3 and .flac files."""
+def collect_music_data(base_dir, skip_dirs=None, tag_index=None):
+    """
+    Collect artist, album, and track info from .mp3 and .flac files. Tags come from
+    the persistent tag index, which only re-reads files added or changed since the
+    last run.
+    """
     if skip_dirs is None:
         skip_dirs = []
+    tag_index = tag_index or MusicTagIndex()
 
     music_data = defaultdict(lambda: defaultdict(list))
     all_artists = set()
     all_album_artists = set()
 
-    print(f"{BLUE}{BRIGHT}Scanning directory:{RESET} {base_dir}")
-
-    # Count total files for progress bar
-    total_files = sum(
-        len([f for f in files if f.lower().endswith((".mp3", ".flac"))])
-        for _, _, files in os.walk(base_dir)
-    )
-
-    with tqdm(total=total_files, desc="Processing Music Files", ncols=90, colour="cyan") as pbar:
-        for root, dirs, files in os.walk(base_dir):
-            # Skip unwanted directories
-            dirs[:] = [d for d in dirs if os.path.join(root, d) not in skip_dirs]
-
-            for file in files:
-                if not file.lower().endswith((".mp3", ".flac")):
-                    continue
-
-                filepath = os.path.join(root, file)
-                metadata = extract_metadata(filepath)
-                pbar.update(1)
-
-                if not metadata:
-                    continue
-
-                artist = metadata['artist']
-                album_artist = metadata['album_artist']
-                album = metadata['album']
-                title = metadata['title']
+    tag_index.refresh(base_dir, skip_dirs=skip_dirs, extensions=(".mp3", ".flac"))
+    for track in tag_index.tracks(base_dir, extensions=(".mp3", ".flac")):
+        artist = track['artist']
+        album_artist = track['album_artist']
+        album = track['album']
+        title = track['title']
 
-                all_artists.add(artist)
-                all_album_artists.add(album_artist)
-                music_data[artist][album].append(title)
+        all_artists.add(artist)
+        all_album_artists.add(album_artist)
+        music_data[artist][album].append(title)
 
     all_artists.discard('Unknown Artist')
     all_artists = sorted(all_artists, key=lambda x: x.lower())
@@ -150,10 +110,12 @@ if __name__ == "__main__":
     music_data = {}
     artists = []
     album_artists = []
+    tag_index = MusicTagIndex()
     for base_directory in base_directories:
         data, artist_list, album_artist_list = collect_music_data(
             base_directory,
-            skip_dirs=skip_directories
+            skip_dirs=skip_directories,
+            tag_index=tag_index
         )
         # Merge collected data
         for artist, albums in data.items():
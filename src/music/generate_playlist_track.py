@@ -1,39 +1,145 @@
 import os
 import random
+import subprocess
 import sys
-import warnings
 
+import numpy as np
 from colorama import Fore, Style, init
 
 # 1. Initialize colorama for auto-resetting colors
 init(autoreset=True)
 
-# 2. Suppress the false-positive pydub warnings BEFORE importing AudioSegment
-warnings.filterwarnings(
-    "ignore", category=RuntimeWarning, message="Couldn't find ffmpeg or avconv"
-)
-warnings.filterwarnings(
-    "ignore", category=RuntimeWarning, message="Couldn't find ffprobe or avprobe"
-)
-
-from pydub import AudioSegment
-
-# 3. Add utils to sys.path and import custom string generator
+# 2. Add utils to sys.path and import custom string generator
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "utils")))
 from generate_audio_file_print_string import generate_audio_file_print_string
 
-# 4. Resolve the absolute path to the bin folder (One level up from this script)
+# 3. Resolve the absolute path to the bin folder (One level up from this script)
 BIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "bin"))
 
-# 5. INJECT INTO WINDOWS PATH
+# 4. INJECT INTO WINDOWS PATH
 os.environ["PATH"] += os.pathsep + BIN_DIR
 
 FFMPEG_PATH = os.path.join(BIN_DIR, "ffmpeg.exe")
 FFPROBE_PATH = os.path.join(BIN_DIR, "ffprobe.exe")
 
-# 6. Point pydub directly to the executables
-AudioSegment.converter = FFMPEG_PATH
-AudioSegment.ffprobe = FFPROBE_PATH
+# 5. The mix is streamed as 32-bit float stereo PCM between decoders and the encoder
+MIX_SAMPLE_RATE = 44100
+MIX_CHANNELS = 2
+MIX_CHUNK_FRAMES = MIX_SAMPLE_RATE  # one second per pipe read
+
+
+def _ffmpeg_binary():
+    return FFMPEG_PATH if os.path.isfile(FFMPEG_PATH) else "ffmpeg"
+
+
+def _decode_pcm(filepath):
+    """Yields a track as float32 (frames, channels) chunks straight from an ffmpeg decoder."""
+    process = subprocess.Popen(
+        [_ffmpeg_binary(), "-nostdin", "-v", "error", "-i", filepath,
+         "-f", "f32le", "-ac", str(MIX_CHANNELS), "-ar", str(MIX_SAMPLE_RATE), "pipe:1"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    frame_bytes = 4 * MIX_CHANNELS
+    try:
+        while True:
+            data = process.stdout.read(MIX_CHUNK_FRAMES * frame_bytes)
+            if not data:
+                break
+            usable = len(data) - len(data) % frame_bytes
+            yield np.frombuffer(data[:usable], dtype=np.float32).reshape(-1, MIX_CHANNELS)
+    finally:
+        process.stdout.close()
+        stderr = process.stderr.read().decode("utf-8", "replace").strip()
+        process.stderr.close()
+        if process.wait() != 0:
+            raise RuntimeError(stderr.splitlines()[-1] if stderr else f"ffmpeg exited with code {process.returncode}")
+
+
+def _encoder_command(output_path, bitrate):
+    return [_ffmpeg_binary(), "-nostdin", "-v", "error", "-y",
+            "-f", "f32le", "-ac", str(MIX_CHANNELS), "-ar", str(MIX_SAMPLE_RATE), "-i", "pipe:0",
+            "-b:a", bitrate, "-f", "mp3", output_path]
+
+
+class StreamingCrossfadeMixer:
+    """
+    Crossfades tracks into one MP3 without ever holding the mix in memory: each
+    track is decoded as a stream, only the last crossfade-length tail of the mix is
+    kept back, overlaps are blended in NumPy, and everything else is piped straight
+    into the MP3 encoder. Memory is bounded by the crossfade and time is linear in
+    the length of the mix.
+    """
+
+    def __init__(self, output_path, crossfade_ms=4000, bitrate="320k"):
+        self.output_path = output_path
+        self.crossfade_frames = int(MIX_SAMPLE_RATE * crossfade_ms / 1000)
+        self.bitrate = bitrate
+        self.encoder = None
+        self.tail = np.zeros((0, MIX_CHANNELS), dtype=np.float32)
+        self.frames_written = 0
+        self.tracks_added = 0
+
+    def _write(self, samples):
+        if not len(samples):
+            return
+        if self.encoder is None:
+            self.encoder = subprocess.Popen(_encoder_command(self.output_path, self.bitrate), stdin=subprocess.PIPE)
+        self.encoder.stdin.write(np.clip(samples, -1.0, 1.0).astype(np.float32).tobytes())
+        self.frames_written += len(samples)
+
+    def _hold_tail(self, samples):
+        """Writes all but the last crossfade-length frames, which become the new tail."""
+        if len(samples) > self.crossfade_frames:
+            split = len(samples) - self.crossfade_frames
+            self._write(samples[:split])
+            samples = samples[split:]
+        self.tail = samples
+
+    def add_track(self, filepath):
+        """Streams one track into the mix, crossfading its head into the current tail."""
+        chunks = _decode_pcm(filepath)
+        # Decode the head first: a track that fails to open leaves the mix untouched
+        head, head_frames = [], 0
+        for chunk in chunks:
+            head.append(chunk)
+            head_frames += len(chunk)
+            if head_frames >= self.crossfade_frames:
+                break
+        head = np.concatenate(head) if head else np.zeros((0, MIX_CHANNELS), dtype=np.float32)
+
+        # Crossfade is limited by the shortest side, as with pydub's append(); the tail
+        # is the end of the whole mix, so a short track never shortens the next fade
+        overlap = min(len(self.tail), len(head), self.crossfade_frames)
+        if overlap:
+            fade_in = np.linspace(0.0, 1.0, overlap, dtype=np.float32)[:, None]
+            blended = self.tail[len(self.tail) - overlap:] * (1.0 - fade_in) + head[:overlap] * fade_in
+            pending = np.concatenate([self.tail[:len(self.tail) - overlap], blended, head[overlap:]])
+        else:
+            pending = np.concatenate([self.tail, head])
+        self.tail = np.zeros((0, MIX_CHANNELS), dtype=np.float32)
+        self.tracks_added += 1
+
+        try:
+            for chunk in chunks:
+                self._hold_tail(np.concatenate([pending, chunk]))
+                pending = self.tail
+        finally:
+            self._hold_tail(pending)
+
+    def close(self):
+        """Flushes the final tail and waits for the encoder to finish the file."""
+        self._write(self.tail)
+        self.tail = np.zeros((0, MIX_CHANNELS), dtype=np.float32)
+        if self.encoder is None:
+            return False
+        self.encoder.stdin.close()
+        if self.encoder.wait() != 0:
+            raise RuntimeError(f"MP3 encoder exited with code {self.encoder.returncode}")
+        return True
+
+    @property
+    def duration_seconds(self):
+        return (self.frames_written + len(self.tail)) / MIX_SAMPLE_RATE
 
 
 def create_continuous_mix(
@@ -85,28 +191,10 @@ def create_continuous_mix(
         print(f"{Fore.WHITE}\nRandomizing playlist order...")
         random.shuffle(filepaths)
 
-    # Load the first track
-    first_track_path = filepaths[0]
-    
-    if not os.path.exists(first_track_path):
-        print(
-            f"{Fore.RED}Error{Style.RESET_ALL}: Cannot find the audio file at: "
-            f"{first_track_path}"
-        )
-        return
-        
-    # Utilize the imported util for metadata printing
-    track_print_string = generate_audio_file_print_string(first_track_path)
-    print(f"\n{Fore.LIGHTBLUE_EX}Base track{Style.RESET_ALL}: {track_print_string}")
-
-    try:
-        combined_audio = AudioSegment.from_file(first_track_path)
-    except Exception as e:
-        print(f"{Fore.RED}Error loading the first track{Style.RESET_ALL}: {e}")
-        return
-
-    # Loop through and crossfade remaining tracks
-    for path in filepaths[1:]:
+    # Stream every track through the mixer; only the crossfade tail stays in memory
+    mixer = StreamingCrossfadeMixer(final_output_path, crossfade_ms=crossfade_ms, bitrate="320k")
+    print(f"\n{Fore.WHITE}Streaming mix to: {Fore.GREEN}{final_output_path}\n")
+    for path in filepaths:
         if not os.path.exists(path):
             print(
                 f"{Fore.YELLOW}Warning: File not found. Skipping{Style.RESET_ALL}: "
@@ -116,35 +204,23 @@ def create_continuous_mix(
             
         # Utilize the imported util for metadata printing during crossfade loop
         track_print_string = generate_audio_file_print_string(path)
-        print(f"{Fore.LIGHTBLUE_EX}Crossfading{Style.RESET_ALL}: {track_print_string}")
+        label = "Base track" if mixer.tracks_added == 0 else "Crossfading"
+        print(f"{Fore.LIGHTBLUE_EX}{label}{Style.RESET_ALL}: {track_print_string}")
         
         try:
-            next_track = AudioSegment.from_file(path)
-            
-            # Ensure crossfade isn't longer than the shortest track
-            current_crossfade = min(crossfade_ms, len(combined_audio), len(next_track))
-            
-            # Append with crossfade
-            combined_audio = combined_audio.append(
-                next_track, crossfade=current_crossfade
-            )
-            
+            mixer.add_track(path)
         except Exception as e:
             print(
                 f"{Fore.RED}Error{Style.RESET_ALL} processing {os.path.basename(path)}: "
                 f"{Fore.RED}{e}"
             )
 
-    # Export
-    print(
-        f"\n{Fore.WHITE}Exporting final mix to: "
-        f"{Fore.GREEN}{final_output_path}\n"
-    )
-    print(f"{Fore.WHITE}This might take a minute depending on playlist length...\n")
-    
     try:
-        combined_audio.export(final_output_path, format="mp3", bitrate="320k")
-        print(f"{Fore.GREEN}{Style.BRIGHT}Export complete! Track saved to{Style.RESET_ALL}: {final_output_path}\n")
+        if mixer.close():
+            print(f"{Fore.GREEN}{Style.BRIGHT}Export complete! Track saved to{Style.RESET_ALL}: {final_output_path} "
+                  f"({mixer.duration_seconds / 60:.1f} min)\n")
+        else:
+            print(f"{Fore.RED}Error{Style.RESET_ALL}: No playable tracks in the playlist.")
     except Exception as e:
         print(f"{Fore.WHITE}Failed to export the mix: {Fore.RED}{e}\n")
 
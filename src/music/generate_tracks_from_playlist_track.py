@@ -1,35 +1,52 @@
+import json
 import os
 import re
-import sys
-import warnings
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from colorama import Fore, Style, init
 
 # 1. Initialize colorama for auto-resetting colors
 init(autoreset=True)
 
-# 2. Suppress the false-positive pydub warnings BEFORE importing AudioSegment
-warnings.filterwarnings(
-    "ignore", category=RuntimeWarning, message="Couldn't find ffmpeg or avconv"
-)
-warnings.filterwarnings(
-    "ignore", category=RuntimeWarning, message="Couldn't find ffprobe or avprobe"
-)
-
-from pydub import AudioSegment
-
-# 3. Resolve the absolute path to the bin folder (One level up from this script)
+# 2. Resolve the absolute path to the bin folder (One level up from this script)
 BIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "bin"))
 
-# 4. INJECT INTO WINDOWS PATH
+# 3. INJECT INTO WINDOWS PATH
 os.environ["PATH"] += os.pathsep + BIN_DIR
 
 FFMPEG_PATH = os.path.join(BIN_DIR, "ffmpeg.exe")
 FFPROBE_PATH = os.path.join(BIN_DIR, "ffprobe.exe")
 
-# 5. Point pydub directly to the executables
-AudioSegment.converter = FFMPEG_PATH
-AudioSegment.ffprobe = FFPROBE_PATH
+# 4. Codecs that can be cut by stream copy: codec -> (extension, muxer, supports cover art)
+STREAM_COPY_FORMATS = {
+    "mp3": (".mp3", "mp3", True),
+    "aac": (".m4a", "ipod", True),
+    "alac": (".m4a", "ipod", True),
+    "flac": (".flac", "flac", True),
+    "opus": (".opus", "opus", False),
+    "vorbis": (".ogg", "ogg", False),
+}
+SPLIT_MAX_WORKERS = os.cpu_count() or 4
+
+
+def _binary(path, name):
+    return path if os.path.isfile(path) else name
+
+
+def probe_audio(input_filepath):
+    """Returns (audio codec, duration in seconds, has attached cover) of the first audio stream."""
+    result = subprocess.run(
+        [_binary(FFPROBE_PATH, "ffprobe"), "-v", "error", "-show_streams", "-show_format", "-of", "json", input_filepath],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+    )
+    info = json.loads(result.stdout)
+    streams = info.get("streams", [])
+    audio = next((stream for stream in streams if stream.get("codec_type") == "audio"), None)
+    if audio is None:
+        raise ValueError("no audio stream")
+    has_cover = any(stream.get("disposition", {}).get("attached_pic") for stream in streams)
+    return audio.get("codec_name"), float(info.get("format", {}).get("duration") or 0), has_cover
 
 
 def time_to_ms(time_str):
@@ -49,9 +66,47 @@ def sanitize_filename(name):
     return re.sub(r'[\\/*?:"<>|]', "", name)
 
 
-def split_playlist(input_filepath, output_dir, breakpoints):
+def _split_command(input_filepath, output_filepath, start_ms, end_ms, tags, copy_format, cover_path, has_cover):
+    """One ffmpeg cut: input seek to the start, stream copy (or MP3 encode), tags and cover in the same pass."""
+    cmd = [_binary(FFMPEG_PATH, "ffmpeg"), "-nostdin", "-v", "error", "-y", "-ss", f"{start_ms / 1000:.3f}", "-i", input_filepath]
+    if end_ms is not None:
+        cmd = cmd[:-2] + ["-t", f"{(end_ms - start_ms) / 1000:.3f}"] + cmd[-2:]
+    if cover_path:
+        cmd += ["-i", cover_path]
+    supports_cover = copy_format[2] if copy_format else True
+    cmd += ["-map", "0:a:0"]
+    if supports_cover and cover_path:
+        cmd += ["-map", "1:v:0", "-c:v", "copy", "-disposition:v", "attached_pic"]
+    elif supports_cover and has_cover:
+        cmd += ["-map", "0:v:0", "-c:v", "copy", "-disposition:v", "attached_pic"]
+    if copy_format:
+        cmd += ["-c:a", "copy", "-f", copy_format[1]]
+    else:
+        cmd += ["-c:a", "libmp3lame", "-b:a", "320k", "-f", "mp3"]
+    if output_filepath.endswith(".mp3"):
+        cmd += ["-id3v2_version", "3"]
+    cmd += ["-map_metadata", "-1"]
+    for key, value in tags.items():
+        cmd += ["-metadata", f"{key}={value}"]
+    return cmd + [output_filepath]
+
+
+def _run_split(cmd):
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", "replace").strip()
+        raise RuntimeError(stderr.splitlines()[-1] if stderr else f"ffmpeg exited with code {result.returncode}")
+
+
+def split_playlist(input_filepath, output_dir, breakpoints, lossless=True, cover_path=None,
+                   album=None, max_workers=SPLIT_MAX_WORKERS):
     """
     Splits a single audio file into multiple tracks based on provided breakpoints.
+
+    When the source codec allows it, segments are cut by stream copy at frame
+    boundaries (no decode or re-encode, original quality, source container), all
+    segments run in parallel, and tags and cover art are written in the same
+    ffmpeg pass. Other codecs, or lossless=False, fall back to 320k MP3.
     """
     print(f"{Fore.WHITE}=== Starting Playlist Splitter ===\n")
     
@@ -63,51 +118,47 @@ def split_playlist(input_filepath, output_dir, breakpoints):
     # Prepare output directory
     os.makedirs(output_dir, exist_ok=True)
     
-    print(f"{Fore.CYAN}Loading audio file... this might take a moment depending on size.{Style.RESET_ALL}")
-    
     try:
-        # Load the large audio file
-        full_audio = AudioSegment.from_file(input_filepath)
-        total_length_ms = len(full_audio)
-        print(f"{Fore.GREEN}Audio loaded successfully! Total length: {total_length_ms / 1000:.2f} seconds.\n")
+        codec, total_length_s, has_cover = probe_audio(input_filepath)
     except Exception as e:
-        print(f"{Fore.RED}Error loading audio{Style.RESET_ALL}: {e}")
+        print(f"{Fore.RED}Error reading audio{Style.RESET_ALL}: {e}")
         return
+    copy_format = STREAM_COPY_FORMATS.get(codec) if lossless else None
+    extension = copy_format[0] if copy_format else ".mp3"
+    mode = f"stream copy ({codec})" if copy_format else "re-encoding to 320k MP3"
+    print(f"{Fore.GREEN}Total length: {total_length_s:.2f} seconds{Style.RESET_ALL}, {mode}.\n")
 
-    # Process each breakpoint
+    # Build every cut up front, then run them in parallel
+    jobs = {}
     for i, (start_time, track_name) in enumerate(breakpoints):
         safe_track_name = sanitize_filename(track_name)
         track_number = i + 1
-        output_filename = f"{track_number:02d} - {safe_track_name}.mp3"
+        output_filename = f"{track_number:02d} - {safe_track_name}{extension}"
         output_filepath = os.path.join(output_dir, output_filename)
         
         start_ms = time_to_ms(start_time)
         
         # Determine end time (either the start of the next track, or the end of the file)
-        if i + 1 < len(breakpoints):
-            next_start_time = breakpoints[i + 1][0]
-            end_ms = time_to_ms(next_start_time)
-        else:
-            end_ms = total_length_ms
-            
-        print(f"{Fore.LIGHTBLUE_EX}Cutting Track {track_number}{Style.RESET_ALL}: {track_name} ({start_time} -> {end_ms/1000:.2f}s)")
-        
-        try:
-            # Slice the audio array
-            track_audio = full_audio[start_ms:end_ms]
-            
-            # Export the individual track with metadata tags
-            track_audio.export(
-                output_filepath, 
-                format="mp3", 
-                bitrate="320k",
-                tags={
-                    "title": track_name
-                }
-            )
-            print(f"  {Fore.GREEN}Saved{Style.RESET_ALL}: {output_filename}")
-        except Exception as e:
-            print(f"  {Fore.RED}Error exporting {track_name}{Style.RESET_ALL}: {e}")
+        end_ms = time_to_ms(breakpoints[i + 1][0]) if i + 1 < len(breakpoints) else None
+        end_label = f"{end_ms / 1000:.2f}s" if end_ms is not None else f"{total_length_s:.2f}s"
+        print(f"{Fore.LIGHTBLUE_EX}Cutting Track {track_number}{Style.RESET_ALL}: {track_name} ({start_time} -> {end_label})")
+
+        tags = {"title": track_name, "track": f"{track_number}/{len(breakpoints)}"}
+        if album:
+            tags["album"] = album
+        cmd = _split_command(input_filepath, output_filepath, start_ms, end_ms, tags, copy_format, cover_path, has_cover)
+        jobs[output_filename] = (track_name, cmd)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_run_split, cmd): (output_filename, track_name)
+                   for output_filename, (track_name, cmd) in jobs.items()}
+        for future in as_completed(futures):
+            output_filename, track_name = futures[future]
+            try:
+                future.result()
+                print(f"  {Fore.GREEN}Saved{Style.RESET_ALL}: {output_filename}")
+            except Exception as e:
+                print(f"  {Fore.RED}Error exporting {track_name}{Style.RESET_ALL}: {e}")
 
     print(f"\n{Fore.GREEN}{Style.BRIGHT}Splitting complete! All tracks saved to:{Style.RESET_ALL} {output_dir}\n")
 
@@ -0,0 +1,220 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Callable, Dict, List, Optional, Tuple
+
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+RED = Fore.RED
+YELLOW = Fore.YELLOW
+GREEN = Fore.GREEN
+RESET = Style.RESET_ALL
+BRIGHT = Style.BRIGHT
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "..", "output", "music"))
+LYRICS_STORE_PATH = os.path.join(OUTPUT_DIR, "lyrics_store.db")
+LEGACY_MISSING_LOGS = [
+    # (provider, path, field order)
+    ("lrclib", os.path.join(OUTPUT_DIR, "missing_LRCLib_lyrics.txt"), ("artist", "album", "title")),
+    ("genius", os.path.join(OUTPUT_DIR, "no_lyrics.txt"), ("title", "artist", "album")),
+]
+
+DAY = 24 * 3600
+# How long a miss is trusted before the provider is asked again
+MISS_RETRY_TTL = {"lrclib": 30 * DAY, "genius": 90 * DAY}
+ERROR_RETRY_TTL = 3600
+# LRCLib matches durations within ±2 seconds
+DURATION_TOLERANCE = 2
+
+
+def normalize_field(text: str) -> str:
+    """Lowercase, accent-free, punctuation-free text with bracketed extras and 'feat.' credits removed."""
+    text = unicodedata.normalize("NFKD", str(text or "")).encode("ascii", "ignore").decode("ascii").lower()
+    text = re.sub(r"\s*[\(\[][^\)\]]*(remaster|deluxe|edition|version|feat\.?|ft\.)[^\)\]]*[\)\]]", "", text)
+    text = re.sub(r"\s+(feat\.?|ft\.)\s+.*$", "", text)
+    text = re.sub(r"&", " and ", text)
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+class LyricsStore:
+    """
+    One record per (track, provider), keyed by normalized artist/album/title and
+    duration: found lyrics (synced and/or plain), misses and errors with the time
+    they were checked. Hits are shared across providers; misses are retried only
+    after the provider's TTL.
+    """
+
+    def __init__(self, db_filepath: str = LYRICS_STORE_PATH, miss_ttl: Dict[str, int] = None,
+                 error_ttl: int = ERROR_RETRY_TTL, import_legacy_logs: bool = True):
+        self.miss_ttl = {**MISS_RETRY_TTL, **(miss_ttl or {})}
+        self.error_ttl = error_ttl
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_filepath), exist_ok=True)
+        self.connection = sqlite3.connect(db_filepath, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS lyrics (
+                    artist TEXT NOT NULL,
+                    album TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    duration INTEGER,
+                    provider TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    synced TEXT,
+                    plain TEXT,
+                    checked_at REAL NOT NULL
+                )""")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS lyrics_track ON lyrics (artist, album, title, provider)")
+        if import_legacy_logs and not self._count():
+            self._import_legacy_logs()
+
+    def _count(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM lyrics").fetchone()[0]
+
+    def _import_legacy_logs(self) -> None:
+        """Seeds misses from the old per-provider text logs, dated by the log's mtime."""
+        for provider, log_path, field_order in LEGACY_MISSING_LOGS:
+            if not os.path.exists(log_path):
+                continue
+            checked_at = os.path.getmtime(log_path)
+            with open(log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = [part.strip() for part in line.strip().split(" | ")]
+                    if len(parts) != 3:
+                        continue
+                    fields = dict(zip(field_order, parts))
+                    self.record(provider, fields["artist"], fields["album"], fields["title"], None, "missing",
+                                checked_at=checked_at)
+
+    def lookup(self, artist: str, album: str, title: str, duration: Optional[int]) -> Dict[str, dict]:
+        """Latest record per provider for a track; records without a duration match any duration."""
+        key = (normalize_field(artist), normalize_field(album), normalize_field(title))
+        with self.lock:
+            records = self.connection.execute(
+                "SELECT * FROM lyrics WHERE artist = ? AND album = ? AND title = ? "
+                "AND (duration IS NULL OR ? IS NULL OR ABS(duration - ?) <= ?) ORDER BY checked_at",
+                key + (duration, duration, DURATION_TOLERANCE)
+            ).fetchall()
+        return {record["provider"]: dict(record) for record in records}
+
+    def record(self, provider: str, artist: str, album: str, title: str, duration: Optional[int],
+               status: str, synced: str = None, plain: str = None, checked_at: float = None) -> None:
+        """Replaces the provider's record for the track. status: 'found', 'missing' or 'error'."""
+        key = (normalize_field(artist), normalize_field(album), normalize_field(title))
+        with self.lock, self.connection:
+            self.connection.execute(
+                "DELETE FROM lyrics WHERE artist = ? AND album = ? AND title = ? AND provider = ? "
+                "AND (duration IS NULL OR ? IS NULL OR ABS(duration - ?) <= ?)",
+                key + (provider, duration, duration, DURATION_TOLERANCE)
+            )
+            self.connection.execute(
+                "INSERT INTO lyrics VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                key + (duration, provider, status, synced, plain, checked_at or time.time())
+            )
+
+    def should_query(self, provider: str, record: Optional[dict], now: float = None) -> bool:
+        """True when the provider has never been asked, or its miss/error has expired."""
+        if record is None:
+            return True
+        if record["status"] == "found":
+            return False
+        ttl = self.error_ttl if record["status"] == "error" else self.miss_ttl.get(provider, 30 * DAY)
+        return (now or time.time()) - record["checked_at"] > ttl
+
+    @staticmethod
+    def best_hit(records: Dict[str, dict]) -> Optional[dict]:
+        """Best stored lyrics across providers: synced beats plain."""
+        hits = [record for record in records.values() if record["status"] == "found"]
+        hits.sort(key=lambda record: (bool(record["synced"]), bool(record["plain"])), reverse=True)
+        return hits[0] if hits else None
+
+
+class LyricsProviderChain:
+    """
+    Asks providers in order (LRCLib, then Genius) and stops at the first hit.
+    Every answer is recorded in the store, and the store is consulted first, so a
+    track is never sent to a provider whose hit or unexpired miss is on record.
+
+    A provider is (name, fetch) where fetch(title, artist, album, duration) returns
+    {"synced": ..., "plain": ...} for a hit, None for a miss, or raises on error.
+    """
+
+    def __init__(self, store: LyricsStore, providers: List[Tuple[str, Callable]]):
+        self.store = store
+        self.providers = providers
+
+    @staticmethod
+    def _hit(record: dict) -> dict:
+        return {"synced": record["synced"], "plain": record["plain"], "provider": record["provider"]}
+
+    def get(self, title: str, artist: str, album: str, duration: Optional[int]) -> Tuple[Optional[dict], bool]:
+        """
+        Returns (hit, all_missed): hit is {"synced", "plain", "provider"} or None, and
+        all_missed is True when every provider has a current miss for the track.
+        """
+        records = self.store.lookup(artist, album, title, duration)
+        names = [name for name, _ in self.providers]
+
+        # Synced hits, or hits from providers outside this chain, need no network
+        best = self.store.best_hit(records)
+        if best and (best["synced"] or best["provider"] not in names):
+            return self._hit(best), False
+
+        had_error = False
+        for name, fetch in self.providers:
+            record = records.get(name)
+            if record and record["status"] == "found":
+                return self._hit(record), False
+            if not self.store.should_query(name, record):
+                continue
+            try:
+                result = fetch(title, artist, album, duration)
+            except Exception as e:
+                print(f"{RED}{name} error for {title}: {e}{RESET}")
+                self.store.record(name, artist, album, title, duration, "error")
+                had_error = True
+                continue
+            if result and (result.get("synced") or result.get("plain")):
+                self.store.record(name, artist, album, title, duration, "found",
+                                  synced=result.get("synced"), plain=result.get("plain"))
+                return {"synced": result.get("synced"), "plain": result.get("plain"), "provider": name}, False
+            self.store.record(name, artist, album, title, duration, "missing")
+            records[name] = {"status": "missing"}
+
+        all_missed = not had_error and all(records.get(name, {}).get("status") == "missing" for name in names)
+        return None, all_missed
+
+    def is_settled_miss(self, title: str, artist: str, album: str, duration: Optional[int]) -> bool:
+        """True when no provider has lyrics and none is due for a retry (no network needed)."""
+        records = self.store.lookup(artist, album, title, duration)
+        if self.store.best_hit(records):
+            return False
+        return all(
+            records.get(name) is not None and not self.store.should_query(name, records[name])
+            for name, _ in self.providers
+        )
+
+    def retry_after(self) -> float:
+        """Earliest time a settled miss may be retried by any provider in the chain."""
+        return time.time() + min(self.store.miss_ttl.get(name, 30 * DAY) for name, _ in self.providers)
+
+    def missing_details(self) -> dict:
+        """Status-index details for a settled miss: when to retry and which providers missed."""
+        return {"retry_after": self.retry_after(), "providers": sorted(name for name, _ in self.providers)}
+
+    def covers_missing(self, entry: dict) -> bool:
+        """
+        True when a file-level "missing" status is unexpired and was recorded by a chain
+        with every provider of this one, so a Genius-only miss never hides a file from LRCLib.
+        """
+        return (entry["status"] == "missing" and entry.get("retry_after", 0) > time.time()
+                and {name for name, _ in self.providers} <= set(entry.get("providers", ())))
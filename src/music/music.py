@@ -5,21 +5,20 @@ import subprocess
 import shutil
 
 from PIL import Image
-from alive_progress import alive_bar
 from colorama import Fore, Style
 from mutagen import File
 from mutagen.flac import FLAC, Picture
 from mutagen.id3 import (
     ID3, TIT2, TPE1, TPE2, TALB, TRCK, TCON, COMM, APIC, error
 )
-from mutagen.mp3 import MP3
 from mutagen.mp4 import MP4, MP4Cover
 from mutagen.easymp4 import EasyMP4
 
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from utilities import read_alexandria, remove_empty_folders
+from utilities import remove_empty_folders
+from music_tag_index import MusicTagIndex
 
 # Define terminal color shortcuts
 RED = Fore.RED
@@ -34,39 +33,24 @@ BRIGHT = Style.BRIGHT
 IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
 AUDIO_EXTENSIONS = ('.mp3', '.flac', '.m4a')
 
-def identify_popular_artists_without_albums(music_dir):
-    files, paths = read_alexandria([music_dir],extensions=['.mp3'])
-    artists_with_albums = []
-    for path in paths:
-        path_split = path.split('/')
-        if len(path_split) == 4:
-            continue
-        if len(path_split) > 4:
-            album_artist = path_split[3]
-            artists_with_albums.append(album_artist.lower())
-    
-    artists_with_albums = list(set(artists_with_albums))
-    
+def identify_popular_artists_without_albums(music_dir, tag_index=None):
+    """Counts tracks by artists who have no album folder, using the cached tag index."""
+    tag_index = tag_index or MusicTagIndex()
+    tag_index.refresh(music_dir, extensions=('.mp3',))
+    tracks = tag_index.tracks(music_dir, extensions=('.mp3',))
+
+    # <music_dir>/<Album Artist>/<Album>/track.mp3 marks an artist with albums
+    artists_with_albums = set()
+    for track in tracks:
+        relative_dirs = os.path.relpath(os.path.dirname(track['path']), music_dir).split(os.sep)
+        if len(relative_dirs) > 1:
+            artists_with_albums.add(relative_dirs[0].lower())
+
     artists_without_albums = {}
-    with alive_bar(len(files),ctrl_c=False,dual_line=True,title='Progress',bar='classic',spinner='classic') as bar:
-        for index,file in enumerate(files):
-            filename = file.strip()
-            path = paths[index]
-            filepath = f'{path}/{filename}'
-            audiofile = MP3(filepath)
-            title = str(audiofile.get('TIT2','Unknown'))
-            artist = str(audiofile.get('TPE1','Unknown'))
-            album = str(audiofile.get('TALB','Unknown'))
-            duration = audiofile.info.length
-            bps = audiofile.info.bitrate_mode
-            sample_rate_hz = audiofile.info.sample_rate
-            channels = audiofile.info.channels
-            if artist.lower() not in artists_with_albums:
-                try:
-                    artists_without_albums[artist] += 1
-                except KeyError:
-                    artists_without_albums.update({artist:1})
-            bar()
+    for track in tracks:
+        artist = track['artist']
+        if artist.lower() not in artists_with_albums:
+            artists_without_albums[artist] = artists_without_albums.get(artist, 0) + 1
     
     artists_without_albums = dict(sorted(artists_without_albums.items(),key=lambda x: x[1],reverse=True))
     with open('music_artists_without_albums.json','w') as json_file:
@@ -0,0 +1,210 @@
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from mutagen import File
+from tqdm import tqdm
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+RED = Fore.RED
+YELLOW = Fore.YELLOW
+GREEN = Fore.GREEN
+BLUE = Fore.BLUE
+RESET = Style.RESET_ALL
+BRIGHT = Style.BRIGHT
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MUSIC_TAG_INDEX_PATH = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "..", "output", "music", "music_tag_index.db"))
+AUDIO_EXTENSIONS = (".mp3", ".flac", ".m4a")
+# Tag reads are dominated by file I/O (often on network drives), so threads scale well
+TAG_INDEX_MAX_WORKERS = 16
+
+TAG_COLUMNS = ["artist", "album_artist", "album", "title", "track", "disc", "duration", "has_cover"]
+
+
+def _first(value, default=None):
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if value is None:
+        return default
+    return str(value).strip() or default
+
+
+def _number(value) -> Optional[int]:
+    """Track/disc numbers from '3', '3/12' or MP4 (3, 12) tuples."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, tuple):
+        value = value[0]
+    try:
+        return int(str(value).split("/")[0])
+    except (TypeError, ValueError):
+        return None
+
+
+def read_track_tags(filepath: str) -> Optional[dict]:
+    """One mutagen parse per file: artist, album artist, album, title, track, disc, duration, cover presence."""
+    audio = File(filepath)
+    if audio is None:
+        return None
+    tags = audio.tags or {}
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension == ".mp3":
+        fields = {
+            "artist": _first(tags.get("TPE1")),
+            "album_artist": _first(tags.get("TPE2")),
+            "album": _first(tags.get("TALB")),
+            "title": _first(tags.get("TIT2")),
+            "track": _number(_first(tags.get("TRCK"))),
+            "disc": _number(_first(tags.get("TPOS"))),
+            "has_cover": bool(tags.getall("APIC")) if tags else False,
+        }
+    elif extension == ".m4a":
+        fields = {
+            "artist": _first(tags.get("\xa9ART")),
+            "album_artist": _first(tags.get("aART")),
+            "album": _first(tags.get("\xa9alb")),
+            "title": _first(tags.get("\xa9nam")),
+            "track": _number(tags.get("trkn")),
+            "disc": _number(tags.get("disk")),
+            "has_cover": bool(tags.get("covr")),
+        }
+    else:
+        fields = {
+            "artist": _first(tags.get("artist")),
+            "album_artist": _first(tags.get("albumartist")),
+            "album": _first(tags.get("album")),
+            "title": _first(tags.get("title")),
+            "track": _number(tags.get("tracknumber")),
+            "disc": _number(tags.get("discnumber")),
+            "has_cover": bool(getattr(audio, "pictures", None)),
+        }
+    fields["artist"] = fields["artist"] or "Unknown Artist"
+    fields["album_artist"] = fields["album_artist"] or fields["artist"]
+    fields["album"] = fields["album"] or "Unknown Album"
+    fields["title"] = fields["title"] or os.path.basename(filepath)
+    fields["duration"] = round(audio.info.length, 3) if audio.info else 0
+    return fields
+
+
+def _read_entry(entry):
+    filepath, size, mtime = entry
+    try:
+        return filepath, size, mtime, read_track_tags(filepath), None
+    except Exception as e:
+        return filepath, size, mtime, None, e
+
+
+class MusicTagIndex:
+    """
+    Persistent tags per audio file, valid while the file's size and mtime are
+    unchanged. A refresh walks the tree once and only re-reads new or modified
+    files, in parallel; every reader then queries the index instead of mutagen.
+    """
+
+    def __init__(self, db_filepath: str = MUSIC_TAG_INDEX_PATH):
+        os.makedirs(os.path.dirname(db_filepath), exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_filepath, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS tracks (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    artist TEXT,
+                    album_artist TEXT,
+                    album TEXT,
+                    title TEXT,
+                    track INTEGER,
+                    disc INTEGER,
+                    duration REAL,
+                    has_cover INTEGER,
+                    readable INTEGER NOT NULL
+                )""")
+
+    @staticmethod
+    def _scan(base_dir: str, skip_dirs: Iterable[str], extensions) -> Dict[str, tuple]:
+        """One walk of the tree: path -> (size, mtime) for every audio file."""
+        skip_dirs = {os.path.normcase(os.path.abspath(d)) for d in skip_dirs}
+        found, stack = {}, [base_dir]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                print(f"{RED}Could not read {directory}: {e}{RESET}")
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if os.path.normcase(os.path.abspath(entry.path)) not in skip_dirs:
+                        stack.append(entry.path)
+                elif entry.name.lower().endswith(extensions):
+                    file_stat = entry.stat()
+                    found[entry.path] = (file_stat.st_size, file_stat.st_mtime)
+        return found
+
+    def _rows_under(self, base_dir: str) -> List[sqlite3.Row]:
+        prefix = os.path.join(base_dir, "")
+        with self.lock:
+            rows = self.connection.execute("SELECT * FROM tracks").fetchall()
+        return [row for row in rows if row["path"].startswith(prefix)]
+
+    def refresh(self, base_dir: str, skip_dirs: Iterable[str] = (), extensions=AUDIO_EXTENSIONS,
+                max_workers: int = TAG_INDEX_MAX_WORKERS) -> dict:
+        """Brings the index up to date for one tree; returns counts of read, unchanged and removed files."""
+        print(f"{BLUE}{BRIGHT}Scanning directory:{RESET} {base_dir}")
+        found = self._scan(base_dir, skip_dirs, tuple(extensions))
+        indexed = {row["path"]: (row["size"], row["mtime"]) for row in self._rows_under(base_dir)
+                   if row["path"].lower().endswith(tuple(extensions))}
+        stale = [(path, *signature) for path, signature in found.items() if indexed.get(path) != signature]
+        removed = [path for path in indexed if path not in found]
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor, \
+                    tqdm(total=len(stale), desc="Reading Music Tags", ncols=90, colour="cyan") as pbar:
+                batch = []
+                for filepath, size, mtime, fields, error in executor.map(_read_entry, stale):
+                    pbar.update(1)
+                    if error:
+                        print(f"{RED}{BRIGHT}Error reading {filepath}:{RESET} {error}")
+                    fields = fields or {}
+                    batch.append((filepath, size, mtime, *[fields.get(column) for column in TAG_COLUMNS], bool(fields)))
+                    if len(batch) >= 1000:
+                        self._upsert(batch)
+                        batch = []
+                self._upsert(batch)
+        if removed:
+            with self.lock, self.connection:
+                self.connection.executemany("DELETE FROM tracks WHERE path = ?", [(path,) for path in removed])
+
+        counts = {"read": len(stale), "unchanged": len(found) - len(stale), "removed": len(removed)}
+        print(f"{GREEN}{BRIGHT}Tag index up to date:{RESET} {counts['read']:,} read, "
+              f"{counts['unchanged']:,} unchanged, {counts['removed']:,} removed")
+        return counts
+
+    def _upsert(self, batch: list) -> None:
+        if not batch:
+            return
+        with self.lock, self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO tracks VALUES ({', '.join('?' * (len(TAG_COLUMNS) + 4))})", batch)
+
+    def tracks(self, base_dir: str = None, extensions=AUDIO_EXTENSIONS) -> List[dict]:
+        """Readable tracks (optionally under one tree) as dicts of path plus the tag columns."""
+        if base_dir:
+            rows = self._rows_under(base_dir)
+        else:
+            with self.lock:
+                rows = self.connection.execute("SELECT * FROM tracks").fetchall()
+        return [dict(row) for row in rows if row["readable"] and row["path"].lower().endswith(tuple(extensions))]
+
+    def album_artists(self) -> List[str]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT DISTINCT album_artist FROM tracks WHERE readable AND album_artist != 'Unknown Artist'").fetchall()
+        return sorted((row[0] for row in rows), key=lambda artist: artist.lower())
@@ -1,5 +1,9 @@
+import json
 import os
+import re
 import sys
+import threading
+from mutagen import File
 from mutagen.mp3 import MP3
 from mutagen.flac import FLAC
 from mutagen.id3 import ID3, USLT, COMM, ID3NoHeaderError
@@ -27,6 +31,8 @@ VOID_LYRIC_STRINGS = [
     "www.", ".com", "http://", "https://",
     "lyrics powered by", "PMEDIA", "Downloaded from"
 ]
+# LRC timestamp: [mm:ss.xx]
+LRC_TIMESTAMP_PATTERN = re.compile(r'\[\d{2}:\d{2}\.\d{2}\]')
 
 
 def embed_lyrics(filepath: str, lyrics: str):
@@ -168,4 +174,119 @@ def has_embedded_plain_lyrics(filepath: str) -> bool:
     except Exception as e:
         print(f"{YELLOW}Error checking lyrics for {filepath}: {e}{RESET}")
 
-    return False
\ No newline at end of file
+    return False
+
+
+class TagSnapshot:
+    """
+    Parses a file's tags once and answers every metadata, lyric and comment
+    question from that single parse.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.title = os.path.splitext(os.path.basename(filepath))[0]
+        self.artist = "Unknown Artist"
+        self.album = "Unknown Album"
+        self.duration = 0
+        self.lyric_texts = []
+        self.comment_texts = []
+        self.has_comments = False
+        self.error = None
+
+        try:
+            audio = File(filepath)
+        except Exception as e:
+            self.error = e
+            return
+        if audio is None:
+            return
+        self.duration = int(audio.info.length) if audio.info else 0
+        tags = audio.tags
+        if not tags:
+            return
+
+        if filepath.lower().endswith(".mp3"):
+            self.title = str(tags.get("TIT2", self.title))
+            self.artist = str(tags.get("TPE1", self.artist))
+            self.album = str(tags.get("TALB", self.album))
+            for frame in tags.getall("USLT"):
+                self.lyric_texts.append(str(frame))
+            for frame in tags.getall("COMM"):
+                self.comment_texts.extend(frame.text if isinstance(frame.text, list) else [frame.text])
+            self.has_comments = bool(self.lyric_texts or self.comment_texts)
+        elif filepath.lower().endswith(".flac"):
+            self.title = tags.get("title", [self.title])[0]
+            self.artist = tags.get("artist", [self.artist])[0]
+            self.album = tags.get("album", [self.album])[0]
+            self.lyric_texts = list(tags.get("lyrics", []))
+            self.comment_texts = list(tags.get("comment", []))
+            self.has_comments = bool(self.lyric_texts or self.comment_texts or tags.get("subtitle"))
+
+    @property
+    def has_synced_lyrics(self) -> bool:
+        return any(LRC_TIMESTAMP_PATTERN.search(text) for text in self.lyric_texts)
+
+    @property
+    def has_plain_lyrics(self) -> bool:
+        return any(_is_valid_lyric_text(text) for text in self.lyric_texts + self.comment_texts)
+
+
+class LyricStatusIndex:
+    """
+    Persisted lyric status per file ("synced", "plain", "excluded", "missing"),
+    valid only while the file's size and mtime are unchanged, so re-runs can skip
+    settled files with a single stat and without opening them.
+    """
+
+    def __init__(self, filepath: str, save_every: int = 200):
+        self.filepath = filepath
+        self.save_every = save_every
+        self.lock = threading.Lock()
+        self.pending = 0
+        try:
+            with open(filepath, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.entries = {}
+
+    def lookup(self, filepath: str, file_stat: os.stat_result = None):
+        """Returns the recorded entry if the file is unchanged since it was recorded."""
+        entry = self.entries.get(filepath)
+        if not entry:
+            return None
+        try:
+            file_stat = file_stat or os.stat(filepath)
+        except OSError:
+            return None
+        if entry["size"] != file_stat.st_size or entry["mtime"] != file_stat.st_mtime:
+            return None
+        return entry
+
+    def update(self, filepath: str, status: str, **details) -> None:
+        """Records a status against the file's current size and mtime (call after any writes)."""
+        try:
+            file_stat = os.stat(filepath)
+        except OSError:
+            return
+        with self.lock:
+            self.entries[filepath] = {"size": file_stat.st_size, "mtime": file_stat.st_mtime, "status": status, **details}
+            self.pending += 1
+            if self.pending >= self.save_every:
+                self._save_locked()
+
+    def save(self) -> None:
+        with self.lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        tmp_filepath = f"{self.filepath}.tmp"
+        try:
+            with open(tmp_filepath, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_filepath, self.filepath)
+            self.pending = 0
+        except OSError as e:
+            print(f"{RED}Could not save lyric status index: {e}{RESET}")
+
@@ -23,6 +23,7 @@ from utilities import (
     read_alexandria,
     read_alexandria_config,
     read_json,
+    write_json,
     human_readable_size,
     validate_json_file
 )
@@ -253,6 +254,57 @@ class Restore:
                     print(f"{RED}Error:{RESET} Failed to restore {file_title}: {e}")
                     self._log_event(f"FAILED  | {action} | SRC: '{src_file}' | DEST: '{dest_file}' | ERROR: {e}")
 
+    def repair_corrupted_files(self) -> None:
+        """Repairs files reported by the scrubber from another copy that still matches the stored digest."""
+        from scrub import compute_file_digest
+
+        filepath_report = os.path.join(self.output_directory, "scrub", "scrub_corrupted_files.json")
+        corrupted = read_json(filepath_report, default=[]) if os.path.exists(filepath_report) else []
+        if not corrupted:
+            print(f'\t{BLUE}No corrupted files reported by the scrubber.{RESET}')
+            return
+
+        print(f'\n### {GREEN}{BRIGHT}Repairing {len(corrupted):,} corrupted file(s){RESET} ###')
+        unresolved = []
+        for item in corrupted:
+            media_type = item["Media Type"]
+            damaged_fp = item["Filepath"]
+            expected_digest = item.get("Expected Digest")
+
+            candidate_roots = self.primary_drives_root_dict.get(media_type, []) + self.backup_drives_root_dict.get(media_type, [])
+            candidates = [
+                os.path.join(root, media_type, item["Relative Path"]) for root in dict.fromkeys(candidate_roots)
+            ]
+            candidates = [fp for fp in candidates if os.path.normpath(fp) != os.path.normpath(damaged_fp) and os.path.isfile(fp)]
+
+            source_fp = None
+            for candidate in candidates:
+                try:
+                    if expected_digest is None or compute_file_digest(candidate) == expected_digest:
+                        source_fp = candidate
+                        break
+                except OSError:
+                    continue
+
+            if not source_fp:
+                print(f"\t{RED}{BRIGHT}[ALERT]{RESET} No intact copy found for: {damaged_fp}")
+                self._log_event(f"FAILED  | Repair Corrupted | DEST: '{damaged_fp}' | ERROR: no intact copy")
+                unresolved.append(item)
+                continue
+
+            print(f"{YELLOW}{BRIGHT}\tRepairing:{RESET} {os.path.basename(damaged_fp)} "
+                  f"{RED}|{RESET} {Fore.BLUE}{self._get_name_from_path(source_fp)}{RESET} "
+                  f"-> {GREEN}{item['Drive']}{RESET}")
+            try:
+                shutil.copy2(source_fp, damaged_fp)
+                self._log_event(f"SUCCESS | Repair Corrupted | SRC: '{source_fp}' | DEST: '{damaged_fp}'")
+            except Exception as e:
+                print(f"{RED}Error:{RESET} Failed to repair {damaged_fp}: {e}")
+                self._log_event(f"FAILED  | Repair Corrupted | SRC: '{source_fp}' | DEST: '{damaged_fp}' | ERROR: {e}")
+                unresolved.append(item)
+
+        write_json(filepath_report, unresolved)
+
     def main(self) -> None:
         """Main function to initiate the Alexandria Restore process."""
         print(f'\n{"#" * 10}\n\n{MAGENTA}{BRIGHT}Initiating Alexandria Restore...{RESET}\n\n{"#" * 10}\n')
@@ -292,6 +344,7 @@ if __name__ == '__main__':
     
     # Initialize Argparse using identical logic to backup.py
     parser = argparse.ArgumentParser(description="Alexandria Restore Utility")
+    parser.add_argument('--repair-corrupted', action='store_true', help="Only repair files reported corrupted by scrub.py")
     
     # Dynamically generate arguments based on the media types
     for m_type in restorer.media_types:
@@ -313,5 +366,8 @@ if __name__ == '__main__':
     if selected_media_types:
         restorer.media_types = selected_media_types
         print(f"{Fore.CYAN}{Style.BRIGHT}Filtering restore to specific media types: {', '.join(restorer.media_types)}{Style.RESET_ALL}")
-        
-    restorer.main()
\ No newline at end of file
+
+    if args.repair_corrupted:
+        restorer.repair_corrupted_files()
+    else:
+        restorer.main()
\ No newline at end of file
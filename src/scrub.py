@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+
+import argparse
+import datetime
+import hashlib
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set, Tuple
+
+from colorama import Fore, Style
+
+# Add custom module paths
+sys.path.append(os.path.join(os.path.dirname(__file__), "analysis"))
+sys.path.append(os.path.join(os.path.dirname(__file__), "utils"))
+
+from utilities import (
+    get_volume_root,
+    read_alexandria,
+    read_alexandria_config,
+    read_json,
+    write_json,
+    validate_json_file
+)
+
+# Colors
+RED = Fore.RED
+YELLOW = Fore.YELLOW
+GREEN = Fore.GREEN
+BLUE = Fore.BLUE
+MAGENTA = Fore.MAGENTA
+RESET = Style.RESET_ALL
+BRIGHT = Style.BRIGHT
+
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def compute_file_digest(filepath: str) -> str:
+    """Returns the SHA-256 hex digest of a file, read in large sequential chunks."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Scrubber:
+    def __init__(self, budget_tb: float = 2.0) -> None:
+        """Initialize the Scrubber class and set up essential attributes."""
+        self.src_directory = os.path.dirname(os.path.abspath(__file__))
+        self.output_directory = os.path.join(os.path.dirname(self.src_directory), "output")
+        self.scrub_directory = os.path.join(self.output_directory, "scrub")
+        self.filepath_drive_hierarchy = os.path.join(self.src_directory, "..", "config", "alexandria_drives.config")
+        self.filepath_scrub_log = os.path.join(self.output_directory, "scrub.log")
+        self.filepath_corrupted_report = os.path.join(self.scrub_directory, "scrub_corrupted_files.json")
+        self.budget_bytes = int(budget_tb * 10**12)
+
+        os.makedirs(self.scrub_directory, exist_ok=True)
+
+        # Read configuration and initialize dictionaries
+        self.drive_config = read_json(self.filepath_drive_hierarchy)
+        if not validate_json_file(self.filepath_drive_hierarchy):
+            raise ValueError("Invalid drive hierarchy JSON file.")
+        self.primary_drives_name_dict, self.backup_drives_name_dict, self.extensions_dict = read_alexandria_config(self.drive_config)
+
+        # Map each available drive to its root and the media types it holds
+        self.drive_roots = {}
+        self.drive_media_types = {}
+        for names_dict in (self.primary_drives_name_dict, self.backup_drives_name_dict):
+            for media_type, names in names_dict.items():
+                for name in names:
+                    if name not in self.drive_roots:
+                        self.drive_roots[name] = get_volume_root(name)
+                    self.drive_media_types.setdefault(name, [])
+                    if media_type not in self.drive_media_types[name]:
+                        self.drive_media_types[name].append(media_type)
+        self.drive_roots = {name: root for name, root in self.drive_roots.items() if root}
+
+    def _log_event(self, message: str) -> None:
+        """Appends a timestamped message to the scrub log."""
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with open(self.filepath_scrub_log, 'a', encoding='utf-8') as log_file:
+                log_file.write(f"[{timestamp}] {message}\n")
+        except Exception as e:
+            print(f"{RED}Error writing to log file: {e}{RESET}")
+
+    def _digest_db_filepath(self, drive_name: str) -> str:
+        """Returns the digest database path for a drive."""
+        return os.path.join(self.scrub_directory, f"{drive_name.replace(' ', '_')}_digests.json")
+
+    def _list_drive_files(self, drive_name: str) -> Dict[str, Tuple[str, str]]:
+        """Maps every media file on a drive to (media_type, relative path)."""
+        volume_root = self.drive_roots[drive_name]
+        files = {}
+        for media_type in self.drive_media_types.get(drive_name, []):
+            media_base = os.path.join(volume_root, media_type)
+            if not os.path.isdir(media_base):
+                continue
+            for filepath in read_alexandria([media_base], self.extensions_dict[media_type]):
+                files[filepath] = (media_type, os.path.relpath(filepath, media_base))
+        return files
+
+    def scrub_drive(self, drive_name: str) -> Tuple[List[dict], Set[str]]:
+        """
+        Verifies up to the nightly byte budget on one drive, oldest-verified files first.
+
+        Files whose size and mtime are unchanged but whose digest no longer matches
+        are reported as corrupted. New or legitimately updated files are re-baselined.
+        Returns the corrupted files and the set of files verified clean (or
+        re-baselined) this run.
+        """
+        db_filepath = self._digest_db_filepath(drive_name)
+        digest_db = read_json(db_filepath) if os.path.exists(db_filepath) else {}
+        drive_files = self._list_drive_files(drive_name)
+
+        # Drop entries for files that no longer exist on the drive
+        digest_db = {fp: entry for fp, entry in digest_db.items() if fp in drive_files}
+
+        # Never-verified files first, then the least recently verified
+        queue = sorted(drive_files, key=lambda fp: digest_db.get(fp, {}).get("last_verified") or "")
+
+        corrupted = []
+        verified_clean = set()
+        bytes_verified = 0
+        files_verified = 0
+        for filepath in queue:
+            if bytes_verified >= self.budget_bytes:
+                break
+            media_type, rel_path = drive_files[filepath]
+            try:
+                file_stat = os.stat(filepath)
+                digest = compute_file_digest(filepath)
+            except OSError as e:
+                print(f"\t{RED}{BRIGHT}[ALERT]{RESET} Unreadable file on {drive_name}: {filepath} ({e})")
+                self._log_event(f"UNREADABLE | DRIVE: {drive_name} | FILE: {filepath} | ERROR: {e}")
+                corrupted.append({"Drive": drive_name, "Media Type": media_type, "Relative Path": rel_path,
+                                  "Filepath": filepath, "Expected Digest": digest_db.get(filepath, {}).get("sha256"),
+                                  "Actual Digest": None})
+                continue
+
+            bytes_verified += file_stat.st_size
+            files_verified += 1
+            now = datetime.datetime.now().isoformat(timespec="seconds")
+            entry = digest_db.get(filepath)
+            is_unchanged = entry and entry["size"] == file_stat.st_size and entry["mtime"] == file_stat.st_mtime
+
+            if is_unchanged and entry["sha256"] != digest:
+                print(f"\t{RED}{BRIGHT}[ALERT]{RESET} Corrupted file on {drive_name}: {filepath}")
+                self._log_event(f"CORRUPTED | DRIVE: {drive_name} | FILE: {filepath}")
+                corrupted.append({"Drive": drive_name, "Media Type": media_type, "Relative Path": rel_path,
+                                  "Filepath": filepath, "Expected Digest": entry["sha256"], "Actual Digest": digest})
+                # Keep the known-good digest so a repaired copy verifies against it
+                entry["last_verified"] = now
+                continue
+
+            digest_db[filepath] = {
+                "size": file_stat.st_size,
+                "mtime": file_stat.st_mtime,
+                "sha256": digest,
+                "last_verified": now
+            }
+            verified_clean.add(filepath)
+
+        write_json(db_filepath, digest_db)
+
+        oldest = min((e.get("last_verified") or "never" for e in digest_db.values()), default="never")
+        print(f"{GREEN}{BRIGHT}{drive_name}:{RESET} verified {files_verified:,} files "
+              f"({bytes_verified / 10**12:,.2f} TB), {len(corrupted):,} corrupted, "
+              f"{len(drive_files) - len(digest_db):,} never verified, oldest verification: {oldest}")
+        self._log_event(f"SCRUBBED | DRIVE: {drive_name} | FILES: {files_verified} | BYTES: {bytes_verified} | CORRUPTED: {len(corrupted)}")
+        return corrupted, verified_clean
+
+    def main(self, drive_names: List[str] = None) -> List[dict]:
+        """Scrubs each drive in parallel (one thread per physical drive) and writes the corruption report."""
+        print(f'\n{"#" * 10}\n\n{MAGENTA}{BRIGHT}Initiating Alexandria Scrub...{RESET}\n\n{"#" * 10}\n')
+        drive_names = [name for name in (drive_names or sorted(self.drive_roots)) if name in self.drive_roots]
+        if not drive_names:
+            print(f"{YELLOW}No configured drives are currently mounted.{RESET}")
+            return []
+
+        with ThreadPoolExecutor(max_workers=len(drive_names)) as executor:
+            results = list(executor.map(self.scrub_drive, drive_names))
+
+        # Previously reported files stay in the report until a scrub verifies them clean
+        # (repaired, or re-baselined after a legitimate update); the rotating queue may not
+        # reach an already reported file again for many runs
+        previous = read_json(self.filepath_corrupted_report, default=[]) if os.path.exists(self.filepath_corrupted_report) else []
+        verified_clean = set()
+        corrupted = []
+        for drive_corrupted, drive_verified_clean in results:
+            verified_clean |= drive_verified_clean
+            corrupted += drive_corrupted
+        reported_now = {item["Filepath"] for item in corrupted}
+        corrupted = [
+            item for item in previous
+            if item["Filepath"] not in verified_clean and item["Filepath"] not in reported_now
+        ] + corrupted
+        write_json(self.filepath_corrupted_report, corrupted)
+
+        if corrupted:
+            print(f"\n{RED}{BRIGHT}{len(corrupted):,} corrupted file(s) reported{RESET}: {self.filepath_corrupted_report}")
+            print(f"Run {BLUE}restore.py --repair-corrupted{RESET} to repair them from another copy.")
+        print(f'\n{"#" * 10}\n\n{GREEN}{BRIGHT}Alexandria Scrub Complete{RESET}\n\n{"#" * 10}\n')
+        return corrupted
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Alexandria Bitrot Scrubber")
+    parser.add_argument('--budget-tb', type=float, default=2.0, help="Maximum TB to verify per drive per run")
+    parser.add_argument('--drive', action='append', dest='drives', help="Only scrub the named drive (repeatable)")
+    args = parser.parse_args()
+
+    scrubber = Scrubber(budget_tb=args.budget_tb)
+    scrubber.main(args.drives)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+
+import glob
+import gzip
+import json
+import os
+import re
+import unicodedata
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# TMDb daily ID export, e.g. movie_ids_05_15_2025.json.gz
+TMDB_EXPORT_PATTERN = "movie_ids_*.json.gz"
+
+
+def normalize_title(title: str) -> str:
+    """Lowercases, strips accents, a trailing (YYYY) and punctuation."""
+    title = unicodedata.normalize('NFKD', title).encode('ascii', 'ignore').decode('ascii')
+    title = re.sub(r'\s*\(\d{4}\)\s*$', '', title)
+    title = re.sub(r'&', ' and ', title)
+    title = re.sub(r'[^\w\s]', ' ', title)
+    return ' '.join(title.lower().split())
+
+
+def trigrams(title: str) -> set:
+    """Padded character trigrams of a normalized title."""
+    padded = f"  {normalize_title(title)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def title_similarity(title_a: str, title_b: str) -> float:
+    """Dice coefficient of the two titles' trigram sets, from 0.0 (disjoint) to 1.0 (identical)."""
+    grams_a, grams_b = trigrams(title_a), trigrams(title_b)
+    if not grams_a or not grams_b:
+        return 0.0
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+class TitleIndex(object):
+    """
+    Trigram inverted index over normalized titles. A query only touches the posting
+    lists of its own trigrams and scores every candidate at once with NumPy, so
+    top-k lookups stay in the millisecond range even over the full TMDb export.
+    """
+
+    def __init__(self):
+        self.titles: List[str] = []
+        self.years: List[Optional[str]] = []
+        self.tmdb_ids: List[Optional[int]] = []
+        self._gram_counts = array('I')
+        self._postings: Dict[str, array] = {}
+        self._frozen = None
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def add(self, title: str, year: Optional[str] = None, tmdb_id: Optional[int] = None) -> None:
+        doc_id = len(self.titles)
+        grams = trigrams(title)
+        self.titles.append(title)
+        self.years.append(str(year) if year else None)
+        self.tmdb_ids.append(tmdb_id)
+        self._gram_counts.append(len(grams))
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array('I')
+            postings.append(doc_id)
+        self._frozen = None
+
+    def _freeze(self):
+        if self._frozen is None:
+            self._frozen = (
+                {gram: np.frombuffer(postings, dtype=np.uint32) for gram, postings in self._postings.items()},
+                np.frombuffer(self._gram_counts, dtype=np.uint32).astype(np.float32)
+            )
+        return self._frozen
+
+    def search(self, title: str, k: int = 5, year: Optional[str] = None, min_score: float = 0.3) -> List[Tuple[float, str, Optional[str], Optional[int]]]:
+        """
+        Returns up to k (score, title, year, tmdb_id) candidates, best first. A matching
+        year adds a small bonus so remakes rank behind the right release.
+        """
+        query_grams = trigrams(title)
+        if not query_grams or not self.titles:
+            return []
+        postings, gram_counts = self._freeze()
+        hits = [postings[gram] for gram in query_grams if gram in postings]
+        if not hits:
+            return []
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.titles)).astype(np.float32)
+        candidates = np.nonzero(shared)[0]
+        scores = 2 * shared[candidates] / (len(query_grams) + gram_counts[candidates])
+        if year:
+            scores += 0.05 * np.array([self.years[i] == str(year) for i in candidates], dtype=np.float32)
+        order = np.argpartition(-scores, k)[:k] if len(scores) > k else np.arange(len(scores))
+        order = order[np.argsort(-scores[order])]
+        return [
+            (round(min(float(scores[i]), 1.0), 4), self.titles[doc_id], self.years[doc_id], self.tmdb_ids[doc_id])
+            for i, doc_id in zip(order.tolist(), candidates[order].tolist()) if scores[i] >= min_score
+        ]
+
+
+def read_tmdb_id_export(export_filepath: str) -> Iterable[Tuple[str, int]]:
+    """Yields (original_title, tmdb_id) from a TMDb daily ID export, skipping adult titles."""
+    opener = gzip.open if export_filepath.endswith('.gz') else open
+    with opener(export_filepath, 'rt', encoding='utf-8') as export_file:
+        for line in export_file:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get('adult') or entry.get('video'):
+                continue
+            yield entry['original_title'], entry['id']
+
+
+def find_tmdb_id_export(directory: str) -> Optional[str]:
+    """Returns the newest TMDb ID export in a directory, if any."""
+    exports = glob.glob(os.path.join(directory, TMDB_EXPORT_PATTERN))
+    return max(exports, key=os.path.getmtime) if exports else None
+
+
+def build_title_index(tmdb_rows: Iterable[dict], export_filepath: Optional[str] = None) -> TitleIndex:
+    """Index titles from the local TMDb store rows, plus an optional offline TMDb ID export."""
+    index = TitleIndex()
+    seen_ids = set()
+    for row in tmdb_rows:
+        index.add(row['Title_TMDb'] or row['Title_Alexandria'], row['Release_Year'], row['TMDb_ID'])
+        seen_ids.add(row['TMDb_ID'])
+    if export_filepath and os.path.exists(export_filepath):
+        for title, tmdb_id in read_tmdb_id_export(export_filepath):
+            if tmdb_id not in seen_ids:
+                index.add(title, None, tmdb_id)
+    return index
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+from typing import Optional
+
+import requests
+
+from http_client import RateLimitedClient
+
+# TMDb allows roughly 50 requests/second per IP; stay comfortably under it
+TMDB_REQUESTS_PER_SECOND = 40
+TMDB_MAX_WORKERS = 8
+
+
+class TMDbClient(RateLimitedClient):
+    """Thread-safe TMDb client. Base URLs come from api.config so it can point at a local stub server."""
+
+    def __init__(self,
+                 api_key: str,
+                 url_base_search: str,
+                 url_base_query: str,
+                 url_base_discover: str,
+                 requests_per_second: float = TMDB_REQUESTS_PER_SECOND,
+                 max_workers: int = TMDB_MAX_WORKERS,
+                 cache=None
+                 ):
+        super().__init__(
+            headers={"accept": "application/json", "Authorization": f"Bearer {api_key}"},
+            requests_per_second=requests_per_second,
+            pool_size=max_workers,
+            cache=cache
+        )
+        self.url_base_search = url_base_search
+        self.url_base_query = url_base_query
+        self.url_base_discover = url_base_discover
+        self.max_workers = max_workers
+
+    def search_movie(self, title: str, year: str) -> requests.Response:
+        params = {
+            'query': title,
+            'include_adult': 'false',
+            'language': 'en-US',
+            'page': '1',
+            'primary_release_year': year
+        }
+        return self.get(self.url_base_search, params=params)
+
+    def movie_details(self, tmdb_id, append_to_response: Optional[str] = None) -> requests.Response:
+        params = {'language': 'en-US'}
+        if append_to_response:
+            params['append_to_response'] = append_to_response
+        return self.get(f"{self.url_base_query}{tmdb_id}", params=params)
+
+    def movie_release_dates(self, tmdb_id) -> requests.Response:
+        return self.get(f"{self.url_base_query}{tmdb_id}/release_dates")
+
+    def discover_movies(self, params: dict) -> requests.Response:
+        return self.get(self.url_base_discover, params=params)
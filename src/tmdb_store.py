@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+
+import ast
+import datetime
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from utilities import read_csv, write_to_csv
+
+# (tmdb.csv header, column, SQLite type), in tmdb.csv column order
+TMDB_COLUMNS = [
+    ('Title_Alexandria', 'title_alexandria', 'TEXT PRIMARY KEY'),
+    ('Title_TMDb', 'title_tmdb', 'TEXT'),
+    ('Release_Date', 'release_date', 'TEXT'),
+    ('Release_Year', 'release_year', 'INTEGER'),
+    ('Parental Rating', 'parental_rating', 'TEXT'),
+    ('Runtime_Min', 'runtime_min', 'INTEGER'),
+    ('Runtime_Hrs', 'runtime_hrs', 'REAL'),
+    ('Rating', 'rating', 'REAL'),
+    ('Budget', 'budget', 'INTEGER'),
+    ('Revenue', 'revenue', 'INTEGER'),
+    ('Genres', 'genres', 'TEXT'),
+    ('Production_Companies', 'production_companies', 'TEXT'),
+    ('Overview', 'overview', 'TEXT'),
+    ('TMDb_ID', 'tmdb_id', 'INTEGER'),
+    ('IMDb_ID', 'imdb_id', 'TEXT'),
+]
+TMDB_CSV_HEADERS = [header for header, _, _ in TMDB_COLUMNS]
+LIST_COLUMNS = {'genres', 'production_companies'}
+
+
+def _to_number(value, cast):
+    try:
+        return cast(float(value)) if cast is int else cast(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_list(value) -> list:
+    if isinstance(value, list):
+        return value
+    try:
+        parsed = ast.literal_eval(value) if isinstance(value, str) and value else []
+    except (ValueError, SyntaxError):
+        return []
+    return list(parsed) if isinstance(parsed, (list, tuple)) else []
+
+
+class TMDbStore(object):
+    """
+    SQLite store of TMDb movie metadata keyed by Alexandria title, with typed columns,
+    upserts and a tmdb.csv export for older readers. Rows go in and come out in
+    tmdb.csv order / header form, so callers do not need to know the schema.
+    """
+
+    def __init__(self, db_filepath: str, csv_filepath: Optional[str] = None):
+        self.db_filepath = db_filepath
+        self.csv_filepath = csv_filepath
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_filepath), exist_ok=True)
+        self.connection = sqlite3.connect(db_filepath, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        columns = ", ".join(f"{column} {sql_type}" for _, column, sql_type in TMDB_COLUMNS)
+        with self.connection:
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS movies ({columns}, updated_at TEXT)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS movies_tmdb_id ON movies (tmdb_id)")
+
+        # First run: seed the store from the existing tmdb.csv
+        if csv_filepath and not self.titles():
+            csv_rows = [list(row.values()) for row in read_csv(csv_filepath)]
+            if csv_rows:
+                self.upsert_rows(csv_rows)
+
+    @staticmethod
+    def _to_record(csv_row: list) -> tuple:
+        """Converts a tmdb.csv-ordered row into typed column values."""
+        record = {column: value for (_, column, _), value in zip(TMDB_COLUMNS, csv_row)}
+        for column in ('release_year', 'runtime_min', 'budget', 'revenue', 'tmdb_id'):
+            record[column] = _to_number(record.get(column), int)
+        for column in ('runtime_hrs', 'rating'):
+            record[column] = _to_number(record.get(column), float)
+        for column in LIST_COLUMNS:
+            record[column] = json.dumps(_to_list(record.get(column)), ensure_ascii=False)
+        return tuple(record.get(column) for _, column, _ in TMDB_COLUMNS)
+
+    @staticmethod
+    def _to_row(record: sqlite3.Row) -> Dict[str, object]:
+        """Converts a stored record to a dict keyed by tmdb.csv headers."""
+        row = {}
+        for header, column, _ in TMDB_COLUMNS:
+            value = record[column]
+            row[header] = json.loads(value) if column in LIST_COLUMNS and value else value
+        return row
+
+    def titles(self) -> set:
+        """Returns every Alexandria title in the store."""
+        with self.lock:
+            return {record[0] for record in self.connection.execute("SELECT title_alexandria FROM movies")}
+
+    def get(self, title_alexandria: str) -> Optional[Dict[str, object]]:
+        """Indexed lookup of one movie by its Alexandria title."""
+        with self.lock:
+            record = self.connection.execute(
+                "SELECT * FROM movies WHERE title_alexandria = ?", (title_alexandria,)).fetchone()
+        return self._to_row(record) if record else None
+
+    def rows(self) -> List[Dict[str, object]]:
+        """Returns every movie, sorted by Alexandria title."""
+        with self.lock:
+            records = self.connection.execute("SELECT * FROM movies ORDER BY title_alexandria").fetchall()
+        return [self._to_row(record) for record in records]
+
+    def tmdb_ids(self) -> Dict[str, str]:
+        """Maps Alexandria titles to TMDb IDs."""
+        with self.lock:
+            return {
+                title: str(tmdb_id) for title, tmdb_id in
+                self.connection.execute("SELECT title_alexandria, tmdb_id FROM movies WHERE tmdb_id IS NOT NULL")
+            }
+
+    def upsert_rows(self, csv_rows: Iterable[list]) -> int:
+        """Inserts or updates tmdb.csv-ordered rows; returns how many rows actually changed."""
+        columns = [column for _, column, _ in TMDB_COLUMNS]
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        changed = 0
+        with self.lock, self.connection:
+            for csv_row in csv_rows:
+                record = self._to_record(csv_row)
+                existing = self.connection.execute(
+                    f"SELECT {', '.join(columns)} FROM movies WHERE title_alexandria = ?", (record[0],)).fetchone()
+                if existing and tuple(existing) == record:
+                    continue
+                self.connection.execute(
+                    f"INSERT INTO movies ({', '.join(columns)}, updated_at) VALUES ({placeholders}, ?) "
+                    f"ON CONFLICT(title_alexandria) DO UPDATE SET {updates}, updated_at = excluded.updated_at",
+                    record + (now,)
+                )
+                changed += 1
+        return changed
+
+    def delete(self, titles: Iterable[str]) -> int:
+        """Removes movies by Alexandria title; returns how many were removed."""
+        with self.lock, self.connection:
+            cursor = self.connection.executemany(
+                "DELETE FROM movies WHERE title_alexandria = ?", [(title,) for title in titles])
+        return cursor.rowcount
+
+    def export_csv(self, csv_filepath: Optional[str] = None) -> None:
+        """Writes the store out in the tmdb.csv layout."""
+        csv_rows = []
+        for row in self.rows():
+            if row['Runtime_Hrs'] is not None:
+                row['Runtime_Hrs'] = f"{row['Runtime_Hrs']:.2f}"
+            csv_rows.append([row[header] for header in TMDB_CSV_HEADERS])
+        write_to_csv(csv_filepath or self.csv_filepath, csv_rows, TMDB_CSV_HEADERS)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+import threading
+import time
+
+import tvdb_v4_official
+
+from http_client import RateLimitedClient
+
+# TVDB v4 tokens are valid for one month; refresh a little early
+TVDB_TOKEN_LIFETIME = 25 * 24 * 3600
+TVDB_REQUESTS_PER_SECOND = 20
+TVDB_MAX_WORKERS = 8
+
+
+class TVDBAuthError(Exception):
+    pass
+
+
+class _SessionRequest(tvdb_v4_official.Request):
+    """tvdb_v4_official request handler that goes through a pooled, rate-limited session instead of urllib."""
+
+    def __init__(self, auth_token, http_client):
+        super().__init__(auth_token)
+        self.http_client = http_client
+
+    def make_request(self, url, if_modified_since=None):
+        headers = {"Authorization": f"Bearer {self.auth_token}"}
+        if if_modified_since:
+            headers["If-Modified-Since"] = str(if_modified_since)
+        response = self.http_client.get(url, headers=headers)
+        if response.status_code == 304:
+            return {"code": 304, "message": "Not-Modified"}
+        if response.status_code == 401:
+            raise TVDBAuthError(f"TVDB token rejected for {url}")
+        try:
+            res = response.json()
+        except ValueError:
+            res = {}
+        data = res.get("data", None)
+        if data is not None and res.get('status', 'failure') != 'failure':
+            self.links = res.get("links", None)
+            return data
+        msg = res.get('message', None) or 'UNKNOWN FAILURE'
+        raise ValueError("failed to get " + url + "\n  " + str(msg))
+
+
+class TVDBClient(object):
+    """
+    Shared TVDB v4 client. Logs in lazily on first use, reuses one token and one
+    pooled session across calls and threads, and logs in again when the token
+    expires or is rejected. Exposes the same methods as tvdb_v4_official.TVDB.
+    """
+
+    def __init__(self, api_key: str, pin: str = "", requests_per_second: float = TVDB_REQUESTS_PER_SECOND):
+        self.api_key = api_key
+        self.pin = pin
+        self.http_client = RateLimitedClient(
+            headers={"accept": "application/json"},
+            requests_per_second=requests_per_second
+        )
+        self.url = tvdb_v4_official.Url()
+        self._tvdb = None
+        self._token_time = 0.0
+        self._lock = threading.Lock()
+
+    def _login(self) -> None:
+        login_info = {"apikey": self.api_key}
+        if self.pin:
+            login_info["pin"] = self.pin
+        response = self.http_client.request("POST", self.url.construct('login'), json=login_info)
+        try:
+            token = response.json()["data"]["token"]
+        except (ValueError, KeyError, TypeError):
+            raise Exception(f"Code:{response.status_code}, TVDB login failed")
+
+        # Build the library client around our session without its urllib login
+        tvdb = tvdb_v4_official.TVDB.__new__(tvdb_v4_official.TVDB)
+        tvdb.url = self.url
+        tvdb.request = _SessionRequest(token, self.http_client)
+        self._tvdb = tvdb
+        self._token_time = time.time()
+
+    def _client(self, force_login: bool = False):
+        with self._lock:
+            expired = time.time() - self._token_time > TVDB_TOKEN_LIFETIME
+            if force_login or self._tvdb is None or expired:
+                self._login()
+            return self._tvdb
+
+    def __getattr__(self, name):
+        method = getattr(tvdb_v4_official.TVDB, name)
+        if not callable(method):
+            return method
+
+        def call(*args, **kwargs):
+            try:
+                return getattr(self._client(), name)(*args, **kwargs)
+            except TVDBAuthError:
+                return getattr(self._client(force_login=True), name)(*args, **kwargs)
+        return call
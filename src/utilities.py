@@ -104,13 +104,23 @@ def read_json(filepath: str | Path, default: dict = None) -> dict:
         return default if default is not None else {}
 
 
-def write_json(filepath: str | Path, data: dict) -> None:
-    """Write dictionary to JSON file with proper formatting and UTF-8."""
+def write_json(filepath: str | Path, data: dict) -> bool:
+    """Write dictionary to JSON file with proper formatting and UTF-8.
+
+    The file is written to a temporary path and moved into place, so a failed
+    write never leaves a truncated file. Returns True on success.
+    """
+    tmp_filepath = f"{filepath}.tmp"
     try:
-        with open(filepath, "w", encoding="utf-8") as file:
+        with open(tmp_filepath, "w", encoding="utf-8") as file:
             json.dump(data, file, indent=4, ensure_ascii=False)
+        os.replace(tmp_filepath, filepath)
+        return True
     except Exception as e:
         print(f"Error writing to {filepath}: {e}")
+        if os.path.exists(tmp_filepath):
+            os.remove(tmp_filepath)
+        return False
 
 
 def get_json_file_list(directory: str) -> List[str]:
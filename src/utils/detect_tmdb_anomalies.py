@@ -1,25 +1,19 @@
 import csv
-import re
-import difflib
+import os
+import sys
 from pathlib import Path
 from colorama import init, Fore, Style
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from tmdb_store import TMDbStore
+from title_index import build_title_index, find_tmdb_id_export, title_similarity
+
 # Initialize colorama to auto-reset colors after each print statement
 init(autoreset=True)
 
-def normalize_title(title):
-    """Cleans the title for a more accurate comparison."""
-    title = re.sub(r'\s*\(\d{4}\)', '', title)
-    title = re.sub(r'[^\w\s]', '', title)
-    return title.strip().lower()
-
 def calculate_difference(title_a, title_b):
     """Returns a difference score from 0.0 (identical) to 1.0 (completely different)."""
-    norm_a = normalize_title(title_a)
-    norm_b = normalize_title(title_b)
-    
-    similarity = difflib.SequenceMatcher(None, norm_a, norm_b).ratio()
-    return round(1.0 - similarity, 4)
+    return round(1.0 - title_similarity(title_a, title_b), 4)
 
 def load_whitelist(filepath):
     """Loads attested titles into a set for fast lookup."""
@@ -36,44 +30,47 @@ def main():
     script_dir = Path(__file__).parent.resolve()
     
     input_file = (script_dir / "../../output/movies/tmdb.csv").resolve()
+    db_file = input_file.parent / "tmdb.db"
     output_file = input_file.parent / "tmdb_differences.csv"
     whitelist_file = input_file.parent / "tmdb_known_name_whitelist.txt"
 
     results = []
 
-    print(f"{Style.BRIGHT}Reading from: {Fore.CYAN}{input_file}")
+    print(f"{Style.BRIGHT}Reading from: {Fore.CYAN}{db_file}")
     
-    if not input_file.exists():
-        print(f"{Fore.RED}{Style.BRIGHT}Error: Could not find the file at {input_file}")
+    if not db_file.exists() and not input_file.exists():
+        print(f"{Fore.RED}{Style.BRIGHT}Error: Could not find {db_file} or {input_file}")
         return
 
     attested_titles = load_whitelist(whitelist_file)
 
-    with input_file.open(mode='r', encoding='utf-8-sig') as infile:
-        reader = csv.DictReader(infile)
-        
-        required_cols = {'Title_Alexandria', 'Title_TMDb', 'Release_Year'}
-        if not required_cols.issubset(reader.fieldnames):
-            missing = required_cols - set(reader.fieldnames)
-            print(f"{Fore.RED}{Style.BRIGHT}Error: The input file is missing required columns: {missing}")
-            return
-
-        for row in reader:
-            t_alex = row.get('Title_Alexandria', '').strip()
-            t_tmdb = row.get('Title_TMDb', '').strip()
-            r_year = row.get('Release_Year', '').strip()
-
-            if t_alex in attested_titles:
-                diff_score = 0.0
-            else:
-                diff_score = calculate_difference(t_alex, t_tmdb)
-
-            results.append({
-                'Difference_Score': diff_score,
-                'Title_Alexandria': t_alex,
-                'Title_TMDb': t_tmdb,
-                'Release_Year': r_year
-            })
+    tmdb_rows = TMDbStore(str(db_file), str(input_file)).rows()
+    export_file = find_tmdb_id_export(str(input_file.parent))
+    title_index = build_title_index(tmdb_rows, export_file) if export_file else None
+
+    for row in tmdb_rows:
+        t_alex = (row.get('Title_Alexandria') or '').strip()
+        t_tmdb = (row.get('Title_TMDb') or '').strip()
+        r_year = str(row.get('Release_Year') or '').strip()
+
+        if t_alex in attested_titles:
+            diff_score = 0.0
+        else:
+            diff_score = calculate_difference(t_alex, t_tmdb)
+
+        # For likely mismatches, suggest the closest title in the offline TMDb export
+        suggestion = None
+        if title_index is not None and diff_score >= 0.5:
+            suggestion = next((c for c in title_index.search(t_alex, k=3, year=r_year) if c[3] != row.get('TMDb_ID')), None)
+
+        results.append({
+            'Difference_Score': diff_score,
+            'Title_Alexandria': t_alex,
+            'Title_TMDb': t_tmdb,
+            'Release_Year': r_year,
+            'Suggested_TMDb_Title': suggestion[1] if suggestion else '',
+            'Suggested_TMDb_ID': suggestion[3] if suggestion else ''
+        })
 
     # Sort descending by Difference_Score
     results.sort(key=lambda x: x['Difference_Score'], reverse=True)
@@ -81,7 +78,8 @@ def main():
     print(f"{Style.BRIGHT}Writing sorted results to: {Fore.CYAN}{output_file}")
     
     with output_file.open(mode='w', encoding='utf-8', newline='') as outfile:
-        output_fields = ['Difference_Score', 'Title_Alexandria', 'Title_TMDb', 'Release_Year']
+        output_fields = ['Difference_Score', 'Title_Alexandria', 'Title_TMDb', 'Release_Year',
+                         'Suggested_TMDb_Title', 'Suggested_TMDb_ID']
         writer = csv.DictWriter(outfile, fieldnames=output_fields)
         
         writer.writeheader()
@@ -118,6 +116,8 @@ def main():
                 score_color = Fore.GREEN
                 
             print(f"{Fore.WHITE}{i:2}. {score_color}[{score:.4f}] {Fore.CYAN}{r['Title_Alexandria']} {Fore.WHITE}vs {Fore.CYAN}{r['Title_TMDb']}")
+            if r['Suggested_TMDb_Title']:
+                print(f"    {Fore.WHITE}suggested: {Fore.GREEN}{r['Suggested_TMDb_Title']} [{r['Suggested_TMDb_ID']}]")
             
         print(f"\n{Fore.GREEN}{Style.BRIGHT}Done! Results saved successfully.\n")
 
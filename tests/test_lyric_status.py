@@ -0,0 +1,56 @@
+import os
+import sys
+
+from mutagen.id3 import ID3, TIT2, TPE1, TALB
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "music")))
+
+import fetch_lyrics_LRCLib
+from lyrics_store import LyricsStore, LyricsProviderChain
+from utilities_music import LyricStatusIndex
+
+MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0x64]) + bytes(413)
+
+
+def _make_mp3(filepath):
+    with open(filepath, "wb") as f:
+        f.write(MP3_FRAME * 383)
+    tags = ID3()
+    tags.add(TIT2(encoding=3, text="Song"))
+    tags.add(TPE1(encoding=3, text="Artist"))
+    tags.add(TALB(encoding=3, text="Album"))
+    tags.save(filepath)
+
+
+def test_genius_miss_does_not_hide_file_from_lrclib(tmp_path, monkeypatch):
+    music_dir = tmp_path / "music"
+    music_dir.mkdir()
+    filepath = str(music_dir / "Track.mp3")
+    _make_mp3(filepath)
+    status_path = str(tmp_path / "lyric_status_index.json")
+    store = LyricsStore(str(tmp_path / "lyrics.db"), import_legacy_logs=False)
+
+    # A Genius run settles the file as missing
+    genius_chain = LyricsProviderChain(store, [("genius", lambda *args: None)])
+    genius_index = LyricStatusIndex(status_path)
+    genius_index.update(filepath, "missing", **genius_chain.missing_details())
+    genius_index.save()
+    assert genius_chain.covers_missing(LyricStatusIndex(status_path).lookup(filepath))
+
+    # The LRCLib run must still query LRCLib for it
+    lrclib_calls = []
+
+    def fetch_lrclib(title, artist, album, duration):
+        lrclib_calls.append(title)
+        return {"synced": "[00:01.00] la la", "plain": "la la"}
+
+    monkeypatch.setattr(fetch_lyrics_LRCLib, "STATUS_INDEX_PATH", status_path)
+    monkeypatch.setattr(fetch_lyrics_LRCLib, "PROGRESS_PATH", str(tmp_path / "progress.jsonl"))
+    monkeypatch.setattr(fetch_lyrics_LRCLib, "_save_lyric_stats", lambda *args: None)
+    monkeypatch.setattr(fetch_lyrics_LRCLib, "build_provider_chain",
+                        lambda store, api_url, use_genius: LyricsProviderChain(store, [("lrclib", fetch_lrclib)]))
+    fetch_lyrics_LRCLib.process_directory(str(music_dir), max_workers=1, use_genius=False, lyrics_store=store)
+
+    assert lrclib_calls == ["Song"]
+    assert LyricStatusIndex(status_path).lookup(filepath)["status"] == "synced"
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "music")))
+
+import generate_playlist_track
+from generate_playlist_track import MIX_CHANNELS, StreamingCrossfadeMixer
+
+
+def test_track_shorter_than_crossfade_keeps_mix_tail(monkeypatch):
+    track_frames = {"a": 100000, "b": 3000, "c": 250000}
+
+    def decode_pcm(filepath):
+        remaining = track_frames[filepath]
+        while remaining:
+            chunk = min(remaining, 44100)
+            remaining -= chunk
+            yield np.full((chunk, MIX_CHANNELS), 0.1, dtype=np.float32)
+
+    monkeypatch.setattr(generate_playlist_track, "_decode_pcm", decode_pcm)
+    monkeypatch.setattr(generate_playlist_track, "_encoder_command",
+                        lambda output_path, bitrate: [sys.executable, "-c", "import sys; sys.stdin.buffer.read()"])
+
+    mixer = StreamingCrossfadeMixer(os.devnull, crossfade_ms=100)
+    assert mixer.crossfade_frames == 4410
+    for filepath in ("a", "b", "c"):
+        mixer.add_track(filepath)
+    assert mixer.close()
+
+    # pydub clamps each crossfade against the whole mix: 100000 + (3000 - 3000) + (250000 - 4410)
+    assert mixer.frames_written == 345590